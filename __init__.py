@@ -1,3 +0,0 @@
-from .protofunc import Monad, Functor, functor, staticfunctor, MonadWithLogs, extract_logs
-
-print("Welcome to the wonderful world of Protonads")
\ No newline at end of file
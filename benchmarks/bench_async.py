@@ -0,0 +1,57 @@
+"""
+Sequential AsyncMonad runs vs. amap, with a sleeping stage standing in for network latency.
+
+Run from the repository root:
+    python -m benchmarks.bench_async [values] [latency_ms]
+"""
+import asyncio
+import sys
+import time
+
+from pyrofunc import AsyncMonad, amap, functor
+
+
+@functor
+class Add:
+    def __init__(self, y: int):
+        self.y = y
+
+    def __exec__(self, x: int) -> int:
+        return x + self.y
+
+
+@functor
+class Lookup:
+    def __init__(self, latency: float):
+        self.latency = latency
+
+    async def __exec__(self, x: int) -> int:
+        await asyncio.sleep(self.latency)
+        return x
+
+
+async def sequential(pipeline, values):
+    return [(await (AsyncMonad(value) | pipeline)).__value__ for value in values]
+
+
+def timed(coroutine) -> float:
+    start = time.perf_counter()
+    asyncio.run(coroutine)
+    return time.perf_counter() - start
+
+
+def main(count: int, latency_ms: float):
+    pipeline = (Add(1) >> Lookup(latency_ms / 1e3) >> Add(2)).compile()
+    values = range(count)
+    print(f"{count} values, {latency_ms:g} ms per lookup")
+    print(f"{'mode':<24} {'time (s)':>9} {'values/s':>10}")
+    elapsed = timed(sequential(pipeline, values))
+    print(f"{'sequential':<24} {elapsed:>9.3f} {count / elapsed:>10.0f}")
+    for concurrency in (1, 10, 100):
+        elapsed = timed(amap(pipeline, values, concurrency=concurrency))
+        print(f"{f'amap, concurrency={concurrency}':<24} {elapsed:>9.3f} {count / elapsed:>10.0f}")
+
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    main(int(args[0]) if args else 500, float(args[1]) if len(args) > 1 else 5)
@@ -0,0 +1,90 @@
+"""
+Per-element Monad pipelines vs. BatchMonad, with and without vectorized __exec_batch__.
+
+Run from the repository root:
+    python -m benchmarks.bench_batch [records]
+"""
+import sys
+import time
+
+from pyrofunc import Monad, BatchMonad, functor
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+
+@functor
+class Add:
+    def __init__(self, y: int):
+        self.y = y
+
+    def __exec__(self, x: int) -> int:
+        return x + self.y
+
+
+@functor
+class Multiply:
+    def __init__(self, factor: int):
+        self.factor = factor
+
+    def __exec__(self, x: int) -> int:
+        return x * self.factor
+
+
+@functor
+class AddBatch:
+    def __init__(self, y: int):
+        self.y = y
+
+    def __exec__(self, x: int) -> int:
+        return x + self.y
+
+    def __exec_batch__(self, xs):
+        if numpy is not None and isinstance(xs, numpy.ndarray):
+            return xs + self.y
+        return [x + self.y for x in xs]
+
+
+@functor
+class MultiplyBatch:
+    def __init__(self, factor: int):
+        self.factor = factor
+
+    def __exec__(self, x: int) -> int:
+        return x * self.factor
+
+    def __exec_batch__(self, xs):
+        if numpy is not None and isinstance(xs, numpy.ndarray):
+            return xs * self.factor
+        return [x * self.factor for x in xs]
+
+
+def timed(run) -> float:
+    start = time.perf_counter()
+    run()
+    return time.perf_counter() - start
+
+
+def main(records: int):
+    values = list(range(records))
+    pipeline = (Add(3) >> Multiply(2) >> Add(1)).compile()
+    vectorized = (AddBatch(3) >> MultiplyBatch(2) >> AddBatch(1)).compile()
+    cases = [
+        ("per element Monad", lambda: [(Monad(x) | pipeline).__value__ for x in values]),
+        ("BatchMonad, element-wise fallback", lambda: BatchMonad(values) | pipeline),
+        ("BatchMonad, __exec_batch__ on list", lambda: BatchMonad(values) | vectorized),
+    ]
+    if numpy is not None:
+        array = numpy.arange(records)
+        cases.append(("BatchMonad, __exec_batch__ on NumPy", lambda: BatchMonad(array) | vectorized))
+    print(f"{records} records through 3 stages")
+    print(f"{'mode':<36} {'time (ms)':>10} {'records/s':>12}")
+    for name, run in cases:
+        elapsed = min(timed(run) for _ in range(3))
+        print(f"{name:<36} {elapsed * 1e3:>10.1f} {records / elapsed:>12,.0f}")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000)
@@ -0,0 +1,47 @@
+"""
+Cost of checkpointing a Stream: without checkpoint, then saving every 5 000 and
+25 000 values, and every second. Each save costs one write and one rename of the checkpoint file.
+
+Run from the repository root:
+    python -m benchmarks.bench_checkpoint
+"""
+import os
+import tempfile
+import timeit
+
+from pyrofunc import Checkpoint, Stream, functor
+
+
+@functor
+class Work:
+    def __init__(self, rounds: int):
+        self.rounds = rounds
+
+    def __exec__(self, x: int) -> int:
+        for _ in range(self.rounds):
+            x = (x * 31 + 7) % 1_000_003
+        return x
+
+
+def best(stmt, number: int) -> float:
+    return min(timeit.repeat(stmt, number=number, repeat=3)) / number
+
+
+def main(count: int = 50_000, chunksize: int = 500):
+    pipeline = Work(20) >> Work(20)
+    path = os.path.join(tempfile.mkdtemp(), "run.ckpt")
+    print(f"{count} values, chunks of {chunksize}")
+    runs = [("no checkpoint", lambda: None),
+            ("every 5 000 values", lambda: Checkpoint(path, interval=3600, every=5_000)),
+            ("every 25 000 values", lambda: Checkpoint(path, interval=3600, every=25_000)),
+            ("every second", lambda: Checkpoint(path, interval=1.0))]
+    baseline = None
+    for name, checkpoint in runs:
+        elapsed = best(lambda: list(Stream(range(count), chunksize=chunksize, checkpoint=checkpoint()) | pipeline),
+                       number=1)
+        baseline = baseline or elapsed
+        print(f"{name:<22} {elapsed * 1e3:>8.1f} ms  {elapsed / baseline - 1:>+7.1%}")
+
+
+if __name__ == "__main__":
+    main()
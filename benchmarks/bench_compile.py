@@ -0,0 +1,49 @@
+"""
+Nested CompositeFunctor dispatch vs. CompiledFunctor for long chains.
+
+Run from the repository root:
+    python -m benchmarks.bench_compile [lengths...]
+"""
+import contextlib
+import io
+import sys
+import timeit
+
+from pyrofunc import Monad, staticfunctor
+
+
+@staticfunctor
+class Inc:
+    @staticmethod
+    def __exec__(x: int) -> int:
+        return x + 1
+
+
+def chain(length: int):
+    pipeline = Inc
+    for _ in range(length - 1):
+        pipeline = pipeline >> Inc
+    return pipeline
+
+
+def best(stmt, number: int) -> float:
+    """Best per-run time in seconds, with the pipeline's stdout output discarded."""
+    with contextlib.redirect_stdout(io.StringIO()):
+        return min(timeit.repeat(stmt, number=number, repeat=3)) / number
+
+
+def main(lengths):
+    sys.setrecursionlimit(max(sys.getrecursionlimit(), 10 * max(lengths) + 1000))
+    print(f"{'stages':>8} {'nested (ms)':>12} {'compiled (ms)':>14} {'speedup':>8}")
+    for length in lengths:
+        with contextlib.redirect_stdout(io.StringIO()):
+            pipeline = chain(length)
+        compiled = pipeline.compile()
+        compiled_time = best(lambda: Monad(0) | compiled, number=200)
+        nested_time = best(lambda: Monad(0) | pipeline, number=20)
+        print(f"{length:>8} {nested_time * 1e3:>12.3f} {compiled_time * 1e3:>14.4f} "
+              f"{nested_time / compiled_time:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main([int(arg) for arg in sys.argv[1:]] or [10, 100, 1000])
@@ -0,0 +1,67 @@
+"""
+Two branches sharing an expensive 10 stage prefix, run as two linear pipelines recomputing the prefix,
+and as a DAG computing it once. Then four branches waiting on I/O, run in order and on threads.
+
+Run from the repository root:
+    python -m benchmarks.bench_dag
+"""
+import time
+import timeit
+
+from pyrofunc import Monad, DAG, functor
+
+
+@functor
+class Work:
+    def __init__(self, rounds: int):
+        self.rounds = rounds
+
+    def __exec__(self, x: int) -> int:
+        for _ in range(self.rounds):
+            x = (x * 31 + 7) % 1_000_003
+        return x
+
+
+@functor
+class Wait:
+    def __init__(self, seconds: float):
+        self.seconds = seconds
+
+    def __exec__(self, x: int) -> int:
+        time.sleep(self.seconds)
+        return x
+
+
+def add(x: int, y: int) -> int:
+    return x + y
+
+
+def best(stmt, number: int) -> float:
+    return min(timeit.repeat(stmt, number=number, repeat=5)) / number
+
+
+def main(number: int = 200):
+    prefix = Work(100)
+    for index in range(1, 10):
+        prefix = prefix >> Work(100 + index)
+    left, right = (prefix >> Work(1)).compile(), (prefix >> Work(2)).compile()
+    dag = DAG(int)
+    shared = dag.input >> prefix
+    pipeline = dag.build(dag.merge(add, shared >> Work(1), shared >> Work(2)))
+    assert (Monad(1) | pipeline).__value__ == (Monad(1) | left).__value__ + (Monad(1) | right).__value__
+    print(f"{'mode':<28} {'time (us)':>10}")
+    runs = [("linear, prefix twice", lambda: add((Monad(1) | left).__value__, (Monad(1) | right).__value__)),
+            ("DAG, prefix once", lambda: Monad(1) | pipeline)]
+    for name, run in runs:
+        print(f"{name:<28} {best(run, number) * 1e6:>10.2f}")
+
+    for executor in (None, "thread"):
+        dag = DAG(int)
+        waits = dag.build(dag.merge(add, *dag.input.fan(*(Work(index) >> Wait(0.01) for index in range(4)))),
+                          executor=executor, workers=4)
+        name = f"4 waiting branches, {executor or 'in order'}"
+        print(f"{name:<28} {best(lambda: Monad(1) | waits, 5) * 1e6:>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
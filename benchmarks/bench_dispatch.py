@@ -0,0 +1,83 @@
+"""
+Cost of each kind of | and >> dispatch, against the previous isinstance and match based dispatch.
+
+Run from the repository root:
+    python -m benchmarks.bench_dispatch
+"""
+import timeit
+
+from pyrofunc import Monad, MonadWithLogs, Functor, CompositeFunctor, core, functor, staticfunctor
+
+
+@staticfunctor
+class Identity:
+    @staticmethod
+    def __exec__(x: int) -> int:
+        return x
+
+
+def to_text(value: int) -> str:
+    return str(value)
+
+
+def previous_cast_type(domain, target):
+    def cast_type(value: domain) -> target:
+        return target(value)
+    cast = functor(cast_type)
+    cast.__cast__ = (domain, target)
+    return cast
+
+
+def previous_or(self, other):
+    if core.TRACING:
+        pass
+    if type(other) == type and issubclass(other, Functor):
+        return other(self)
+    elif isinstance(other, Functor):
+        return other(self)
+    else:
+        if hasattr(self.__value__, '__value__'):
+            return previous_or(self.__value__, other)
+        return other(self.__value__)
+
+
+def previous_compose(first, second):
+    match second:
+        case Functor():
+            return CompositeFunctor(first, second)
+        case _ if isinstance(second, type):
+            return CompositeFunctor(first, previous_cast_type(first.__codomain__, second))
+        case _ if callable(second) or isinstance(second, type):
+            members = {"__exec__": staticmethod(second), "__name__": second.__name__, "__wrapped__": second}
+            return CompositeFunctor(first, type(second.__name__, (Functor,), members)())
+    return CompositeFunctor(first, second)
+
+
+def best(stmt, number: int) -> float:
+    return min(timeit.repeat(stmt, number=number, repeat=5)) / number
+
+
+def main(number: int = 100_000):
+    monad = Monad(5)
+    nested = Monad(MonadWithLogs(MonadWithLogs(Monad(5))))
+    pipes = [
+        ("| functor", monad, Identity),
+        ("| int", monad, int),
+        ("| float", monad, float),
+        ("| callable", monad, to_text),
+        ("nested | int", nested, int),
+    ]
+    print(f"{'dispatch':<20} {'previous (ns)':>14} {'table (ns)':>11}")
+    for name, m, other in pipes:
+        previous = best(lambda: previous_or(m, other), number)
+        table = best(lambda: Monad.__or__(m, other), number)
+        print(f"{name:<20} {previous * 1e9:>14.1f} {table * 1e9:>11.1f}")
+    composes = [(">> functor", Identity), (">> int", int), (">> callable", to_text)]
+    for name, other in composes:
+        previous = best(lambda: previous_compose(Identity, other), number // 10)
+        table = best(lambda: Functor.__compose__(Identity, other), number // 10)
+        print(f"{name:<20} {previous * 1e9:>14.1f} {table * 1e9:>11.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+"""
+A text file and a .npy file processed by reading them whole into a list of values, each wrapped in a Monad,
+and by streaming them from memory-mapped sources to sinks. Reports the time and the peak Python memory of each.
+
+Run from the repository root:
+    python -m benchmarks.bench_files [lines]
+"""
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+from pyrofunc import LineSink, LineSource, Monad, NpySink, NpySource, Stream, functor
+
+
+@functor
+class Parse:
+    def __exec__(self, line: str) -> int:
+        return int(line.rsplit(" ", 1)[1])
+
+
+@functor
+class Scale:
+    def __exec__(self, x: float) -> float:
+        return x * 1.5
+
+    def __exec_batch__(self, values):
+        return values * 1.5
+
+
+def measure(run) -> tuple[float, int]:
+    start = time.perf_counter()
+    run()
+    elapsed = time.perf_counter() - start
+    # Run again to trace the memory, tracing slows down every allocation
+    tracemalloc.start()
+    try:
+        run()
+        return elapsed, tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def report(name: str, elapsed: float, peak: int):
+    print(f"{name:<36} {elapsed * 1e3:>8.1f} ms {peak / 2 ** 20:>8.1f} MB")
+
+
+def main(count: int = 500_000):
+    folder = tempfile.mkdtemp()
+    text, out = os.path.join(folder, "in.txt"), os.path.join(folder, "out.txt")
+    with open(text, "w") as file:
+        file.writelines(f"record {index}\n" for index in range(count))
+    print(f"{count} lines, {os.path.getsize(text) / 2 ** 20:.1f} MB")
+    print(f"{'':<36} {'time':>11} {'peak':>11}")
+
+    def whole_text():
+        with open(text) as file:
+            lines = file.read().splitlines()
+        results = [(Monad(line) | Parse()).__value__ for line in lines]
+        with open(out, "w") as file:
+            file.writelines(f"{result}\n" for result in results)
+
+    report("read whole, Monad per line", *measure(whole_text))
+    report("LineSource >> LineSink", *measure(
+        lambda: Stream(LineSource(text, encoding="ascii"), chunksize=4096) | Parse() | LineSink(out)))
+
+    try:
+        import numpy
+    except ImportError:
+        return
+    array, doubled = os.path.join(folder, "in.npy"), os.path.join(folder, "out.npy")
+    numpy.save(array, numpy.arange(count * 8, dtype=numpy.float64))
+    print(f"\n{count * 8} floats, {os.path.getsize(array) / 2 ** 20:.1f} MB")
+    report("numpy.load whole, save", *measure(lambda: numpy.save(doubled, numpy.load(array) * 1.5)))
+    report("NpySource >> NpySink", *measure(
+        lambda: Stream(NpySource(array), chunksize=65_536) | Scale() | NpySink(doubled)))
+
+
+if __name__ == "__main__":
+    main(*[int(arg) for arg in sys.argv[1:]])
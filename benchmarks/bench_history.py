@@ -0,0 +1,52 @@
+"""
+Time and peak memory of a long pipeline over a large list, for each history strategy.
+
+Run from the repository root:
+    python -m benchmarks.bench_history [stages] [payload]
+"""
+import contextlib
+import io
+import sys
+import time
+import tracemalloc
+
+from pyrofunc import Monad, functor
+
+
+@functor
+class Touch:
+    def __init__(self, index: int):
+        self.index = index
+
+    def __exec__(self, x: list) -> list:
+        x[self.index % len(x)] += 1
+        return x
+
+
+def run(pipeline, payload: int, history: str, depth: int) -> tuple[float, int]:
+    value = list(range(payload))
+    tracemalloc.start()
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        Monad(value, history=history, depth=depth) | pipeline
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak
+
+
+def main(stages: int, payload: int):
+    with contextlib.redirect_stdout(io.StringIO()):
+        pipeline = Touch(0)
+        for index in range(1, stages):
+            pipeline = pipeline >> Touch(index)
+    print(f"{stages} stages over a list of {payload} items")
+    print(f"{'history':>10} {'depth':>6} {'time (ms)':>10} {'peak (MiB)':>11}")
+    for history, depth in [("none", 0), ("ref", 16), ("cow", 4), ("cow", 16), ("deepcopy", 4), ("deepcopy", 16)]:
+        elapsed, peak = run(pipeline, payload, history, depth)
+        print(f"{history:>10} {depth:>6} {elapsed * 1e3:>10.1f} {peak / 2 ** 20:>11.2f}")
+
+
+if __name__ == "__main__":
+    args = [int(arg) for arg in sys.argv[1:]]
+    main(*(args + [200, 10_000][len(args):]))
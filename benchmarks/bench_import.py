@@ -0,0 +1,34 @@
+"""
+Start-up cost of the package: time of `import pyrofunc` in a fresh interpreter, and of loading each feature on top.
+
+Run from the repository root:
+    python -m benchmarks.bench_import
+"""
+import subprocess
+import sys
+
+FEATURES = ["Monad", "MonadWithLogs", "Add", "Profiler", "LazyMonad", "Maybe", "parallel_map", "amap"]
+
+
+def import_time(code: str) -> float:
+    """Best wall time of a fresh interpreter running code, in seconds, minus that of an empty one."""
+    def best(source: str) -> float:
+        timings = []
+        for _ in range(5):
+            result = subprocess.run([sys.executable, "-c", f"import time; start = time.perf_counter(); {source}; "
+                                     f"print(time.perf_counter() - start)"], capture_output=True, text=True, check=True)
+            timings.append(float(result.stdout))
+        return min(timings)
+    return best(code) - best("pass")
+
+
+def main():
+    print(f"{'import':<40} {'time (ms)':>10}")
+    print(f"{'import pyrofunc':<40} {import_time('import pyrofunc') * 1e3:>10.2f}")
+    for name in FEATURES:
+        code = f"from pyrofunc import {name}"
+        print(f"{code:<40} {import_time(code) * 1e3:>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,50 @@
+"""
+Time of a 20 stage pipeline of Add, Multiply and casts run through nested dispatch, compile(), optimize() and jit(),
+and the time to build the JIT function with and without its code cache.
+
+Run from the repository root:
+    python -m benchmarks.bench_jit
+"""
+import timeit
+
+from pyrofunc import Monad, JITFunctor, Add, Multiply
+
+
+def chain(stages: int):
+    pipeline = Add(1)
+    for index in range(1, stages):
+        stage = Add(index) if index % 3 else Multiply(2) >> float >> int
+        pipeline = pipeline >> stage
+    return pipeline
+
+
+def best(stmt, number: int) -> float:
+    return min(timeit.repeat(stmt, number=number, repeat=5)) / number
+
+
+def main(stages: int = 20, number: int = 20_000):
+    pipeline = chain(stages)
+    compiled, optimized, jitted = pipeline.compile(), pipeline.optimize(), pipeline.jit()
+    expected = (Monad(0) | pipeline).__value__
+    runs = [
+        ("nested dispatch", lambda: Monad(0) | pipeline),
+        ("compile()", lambda: Monad(0) | compiled),
+        ("optimize()", lambda: Monad(0) | optimized),
+        ("jit()", lambda: Monad(0) | jitted),
+        ("jit() __exec__ only", lambda: jitted.__exec__(0)),
+    ]
+    print(f"{'mode':<24} {'time (us)':>10}")
+    for name, run in runs:
+        result = run()
+        assert (result.__value__ if isinstance(result, Monad) else result) == expected
+        print(f"{name:<24} {best(run, number) * 1e6:>10.2f}")
+
+    def cold():
+        JITFunctor.__cache__.clear()
+        return pipeline.jit()
+    print(f"{'build, code cached':<24} {best(pipeline.jit, 200) * 1e6:>10.2f}")
+    print(f"{'build, code generated':<24} {best(cold, 200) * 1e6:>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
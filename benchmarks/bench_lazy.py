@@ -0,0 +1,56 @@
+"""
+Cost of running a 20 stage pipeline piped stage by stage on many values: eagerly with Monad,
+deferred with LazyMonad, and reusing the compiled plan of one LazyMonad with run(value).
+
+Run from the repository root:
+    python -m benchmarks.bench_lazy
+"""
+import timeit
+
+from pyrofunc import Monad, LazyMonad, staticfunctor
+
+
+@staticfunctor
+class Inc:
+    @staticmethod
+    def __exec__(x: int) -> int:
+        return x + 1
+
+
+def eager(value: int, stages: int) -> int:
+    monad = Monad(value)
+    for _ in range(stages):
+        monad = monad | Inc
+    return monad.__value__
+
+
+def lazy(value: int, stages: int, optimize: bool = False) -> int:
+    monad = LazyMonad(value, optimize=optimize)
+    for _ in range(stages):
+        monad = monad | Inc
+    return monad.run()
+
+
+def best(stmt, number: int) -> float:
+    return min(timeit.repeat(stmt, number=number, repeat=5)) / number
+
+
+def main(stages: int = 20, number: int = 2_000):
+    plan = LazyMonad(0)
+    for _ in range(stages):
+        plan = plan | Inc
+    plan.plan()
+    runs = [
+        ("Monad, eager", lambda: eager(0, stages)),
+        ("LazyMonad", lambda: lazy(0, stages)),
+        ("LazyMonad, optimize", lambda: lazy(0, stages, optimize=True)),
+        ("LazyMonad, plan reuse", lambda: plan.run(0)),
+    ]
+    print(f"{'mode':<24} {'time (us)':>10}")
+    for name, run in runs:
+        assert run() == stages
+        print(f"{name:<24} {best(run, number) * 1e6:>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
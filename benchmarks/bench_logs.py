@@ -0,0 +1,62 @@
+"""
+Cost of MonadWithLogs records on a 20 stage pipeline, against a plain Monad and eager f-string logs,
+for small (int) and large (100 element list) values.
+
+Run from the repository root:
+    python -m benchmarks.bench_logs
+"""
+import timeit
+
+from pyrofunc import Monad, MonadWithLogs, extract_logs, staticfunctor
+
+
+@staticfunctor
+class Inc:
+    @staticmethod
+    def __exec__(x: int) -> int:
+        return x + 1
+
+
+@staticfunctor
+class Touch:
+    @staticmethod
+    def __exec__(x: list) -> list:
+        return x
+
+
+class EagerLogs(MonadWithLogs):
+    """The previous behaviour, formatting every entry when it is recorded."""
+    def __exec__(self, func):
+        self = Monad.__exec__(self, func)
+        self.__logs__.append(f"{func.__name__}({self.__value__})")
+        return self
+
+
+def best(stmt, number: int) -> float:
+    return min(timeit.repeat(stmt, number=number, repeat=5)) / number
+
+
+def chain(stage, stages: int):
+    pipeline = stage
+    for _ in range(stages - 1):
+        pipeline = pipeline >> stage
+    return pipeline
+
+
+def main(stages: int = 20, number: int = 1000):
+    cases = [("int", chain(Inc, stages), lambda: 0), ("list[100]", chain(Touch, stages), lambda: list(range(100)))]
+    print(f"{'value':<10} {'mode':<28} {'per run (us)':>12}")
+    for value, pipeline, make in cases:
+        runs = [
+            ("Monad", lambda: Monad(make()) | pipeline),
+            ("eager f-string logs", lambda: EagerLogs(make()) | pipeline),
+            ("records, never read", lambda: MonadWithLogs(make()) | pipeline),
+            ("records, maxlogs=4", lambda: MonadWithLogs(make(), maxlogs=4) | pipeline),
+            ("records + extract_logs", lambda: extract_logs(MonadWithLogs(make()) | pipeline)),
+        ]
+        for name, run in runs:
+            print(f"{value:<10} {name:<28} {best(run, number) * 1e6:>12.1f}")
+
+
+if __name__ == "__main__":
+    main()
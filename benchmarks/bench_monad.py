@@ -0,0 +1,62 @@
+"""
+Construction cost, per-stage cost and size of Monad instances, against the previous dict based layout.
+
+Run from the repository root:
+    python -m benchmarks.bench_monad
+"""
+import time
+import tracemalloc
+
+from pyrofunc import Monad, functor
+
+
+class DictMonad:
+    """The previous layout: a __dict__ per instance and the dtype computed eagerly."""
+    def __init__(self, value, **kwargs):
+        self.__dtype__ = type(value).__name__
+        self.__value__ = value
+        self.__kwargs__ = kwargs
+        self.__pre__ = ()
+
+
+@functor
+class Inc:
+    def __exec__(self, x: int) -> int:
+        return x + 1
+
+
+def per_instance(cls, count: int) -> tuple[float, float]:
+    """Seconds and bytes per instance, building count instances kept alive together."""
+    start = time.perf_counter()
+    instances = [cls(i) for i in range(count)]
+    elapsed = time.perf_counter() - start
+    del instances
+    tracemalloc.start()
+    instances = [cls(i) for i in range(count // 10)]
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del instances
+    return elapsed / count, size / (count // 10)
+
+
+def per_stage(count: int, stages: int = 10) -> float:
+    """Seconds per stage, applying a functor repeatedly to fresh monads."""
+    inc = Inc()
+    start = time.perf_counter()
+    for i in range(count // stages):
+        m = Monad(i)
+        for _ in range(stages):
+            m = inc(m)
+    return (time.perf_counter() - start) / count
+
+
+def main(count: int = 1_000_000):
+    print(f"{'layout':<24} {'construct (ns)':>15} {'size (B)':>10}")
+    for name, cls in (("dict (previous)", DictMonad), ("slots", Monad)):
+        elapsed, size = per_instance(cls, count)
+        print(f"{name:<24} {elapsed * 1e9:>15.1f} {size:>10.1f}")
+    print(f"per stage: {per_stage(count) * 1e9:.1f} ns")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,31 @@
+"""
+Run time of a pipeline with redundant stages, composed, compiled and optimized.
+
+Run from the repository root:
+    python -m benchmarks.bench_optimize
+"""
+import timeit
+
+from pyrofunc import Monad, Add, Multiply, AddOne, functor, to_string, to_float
+
+
+def best(stmt, number: int) -> float:
+    return min(timeit.repeat(stmt, number=number, repeat=5)) / number
+
+
+def main(number: int = 20_000):
+    pipeline = Add(3) >> Add(4) >> Multiply(20) >> Multiply(2) >> float >> functor(to_string) \
+        >> functor(to_float) >> float >> int >> AddOne >> AddOne
+    compiled = pipeline.compile()
+    optimized = pipeline.optimize()
+    for rewrite in optimized.__rewrites__:
+        print(f"  {rewrite}")
+    print(f"{'pipeline':<12} {'stages':>7} {'per value (us)':>15}")
+    for name, functor_ in (("composed", pipeline), ("compiled", compiled), ("optimized", optimized)):
+        stages = len(functor_.__flatten__()) if name != "optimized" else len(optimized.stages)
+        elapsed = best(lambda: Monad(5) | functor_, number)
+        print(f"{name:<12} {stages:>7} {elapsed * 1e6:>15.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+"""
+Serial vs. thread and process parallel_map over a CPU-bound pipeline.
+
+Run from the repository root:
+    python -m benchmarks.bench_parallel [values] [work]
+"""
+import os
+import sys
+import time
+
+from pyrofunc import Monad, functor, parallel_map
+
+
+@functor
+class Spin:
+    def __init__(self, work: int):
+        self.work = work
+
+    def __exec__(self, x: int) -> int:
+        # Pure Python busy loop, holds the GIL for its whole duration
+        total = x
+        for i in range(self.work):
+            total = (total * 31 + i) % 1_000_003
+        return total
+
+
+@functor
+class Add:
+    def __init__(self, y: int):
+        self.y = y
+
+    def __exec__(self, x: int) -> int:
+        return x + self.y
+
+
+def timed(run) -> float:
+    start = time.perf_counter()
+    run()
+    return time.perf_counter() - start
+
+
+def main(count: int, work: int):
+    pipeline = (Add(1) >> Spin(work) >> Add(2)).compile()
+    values = list(range(count))
+    cpus = os.cpu_count() or 1
+    print(f"{count} values, {work} iterations per value, {cpus} CPUs")
+    print(f"{'mode':<22} {'time (s)':>9} {'speedup':>8}")
+    serial = timed(lambda: [(Monad(value) | pipeline).__value__ for value in values])
+    print(f"{'serial':<22} {serial:>9.3f} {'1.0x':>8}")
+    for executor in ("thread", "process"):
+        for workers in sorted({1, 2, cpus}):
+            elapsed = timed(lambda: parallel_map(pipeline, values, executor=executor, workers=workers, chunksize=16))
+            print(f"{f'{executor}, {workers} workers':<22} {elapsed:>9.3f} {serial / elapsed:>7.1f}x")
+
+
+if __name__ == "__main__":
+    args = [int(arg) for arg in sys.argv[1:]]
+    main(*(args + [2000, 20_000][len(args):]))
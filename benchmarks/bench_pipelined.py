@@ -0,0 +1,67 @@
+"""
+A stream of values through stages waiting on I/O, run value by value and with one thread per stage.
+Then a CPU-bound pipeline with one process per stage, and the metrics of a pipeline with one slow stage.
+
+Run from the repository root:
+    python -m benchmarks.bench_pipelined
+"""
+import os
+import time
+import timeit
+
+from pyrofunc import Monad, PipelinedExecutor, functor, pipelined_map
+
+
+@functor
+class Work:
+    def __init__(self, rounds: int):
+        self.rounds = rounds
+
+    def __exec__(self, x: int) -> int:
+        for _ in range(self.rounds):
+            x = (x * 31 + 7) % 1_000_003
+        return x
+
+
+@functor
+class Wait:
+    def __init__(self, seconds: float):
+        self.seconds = seconds
+
+    def __exec__(self, x: int) -> int:
+        time.sleep(self.seconds)
+        return x
+
+
+def best(stmt, number: int) -> float:
+    return min(timeit.repeat(stmt, number=number, repeat=3)) / number
+
+
+def main(count: int = 200):
+    values = list(range(count))
+    waiting = (Wait(0.0005) >> Wait(0.0005) >> Wait(0.0005) >> Wait(0.0005)).compile()
+    serial = best(lambda: [(Monad(value) | waiting).__value__ for value in values], number=1)
+    threads = best(lambda: pipelined_map(waiting, values, chunksize=8), number=1)
+    print(f"{count} values through 4 stages waiting 0.5 ms")
+    print(f"{'value by value':<28} {serial * 1e3:>8.1f} ms")
+    print(f"{'one thread per stage':<28} {threads * 1e3:>8.1f} ms  {serial / threads:.1f}x")
+
+    working = (Work(20_000) >> Work(20_000) >> Work(20_000) >> Work(20_000)).compile()
+    serial = best(lambda: [(Monad(value) | working).__value__ for value in values], number=1)
+    processes = best(lambda: pipelined_map(working, values, executor="process", chunksize=8), number=1)
+    print(f"{count} values through 4 CPU-bound stages, {os.cpu_count()} CPUs")
+    print(f"{'value by value':<28} {serial * 1e3:>8.1f} ms")
+    print(f"{'one process per stage':<28} {processes * 1e3:>8.1f} ms  {serial / processes:.1f}x")
+
+    executor = PipelinedExecutor(Work(1_000) >> Wait(0.001) >> Work(1_000), maxsize=2, chunksize=4)
+    for _ in executor.map(values):
+        pass
+    print(f"\n{'stage':<8} {'values/s':>10} {'busy':>7} {'blocked':>8} {'starved':>8} {'max depth':>10}")
+    for row in executor.metrics():
+        print(f"{row['stage']:<8} {row['throughput']:>10.0f} {row['busy']:>6.3f}s {row['blocked']:>7.3f}s "
+              f"{row['starved']:>7.3f}s {row['max_depth']:>10}")
+    print(f"bottleneck: {executor.bottleneck()}")
+
+
+if __name__ == "__main__":
+    main()
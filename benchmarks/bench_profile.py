@@ -0,0 +1,41 @@
+"""
+Cost of the per-stage profiler on a 20 stage pipeline, compiled and run through nested dispatch.
+
+Run from the repository root:
+    python -m benchmarks.bench_profile
+"""
+import timeit
+
+from pyrofunc import Monad, Profiler, staticfunctor
+
+
+@staticfunctor
+class Inc:
+    @staticmethod
+    def __exec__(x: int) -> int:
+        return x + 1
+
+
+def best(stmt, number: int) -> float:
+    return min(timeit.repeat(stmt, number=number, repeat=5)) / number
+
+
+def main(stages: int = 20, number: int = 2000):
+    pipeline = Inc
+    for _ in range(stages - 1):
+        pipeline = pipeline >> Inc
+    compiled = pipeline.compile()
+    runs = [("nested dispatch", lambda: Monad(0) | pipeline), ("compiled", lambda: Monad(0) | compiled)]
+
+    print(f"{'pipeline':<20} {'mode':<20} {'per run (us)':>12} {'overhead':>9}")
+    for name, run in runs:
+        off = best(run, number)
+        print(f"{name:<20} {'profiler off':<20} {off * 1e6:>12.1f} {'-':>9}")
+        for mode, memory in (("profiler on", False), ("profiler + memory", True)):
+            with Profiler(memory=memory):
+                elapsed = best(run, number // 10 if memory else number)
+            print(f"{name:<20} {mode:<20} {elapsed * 1e6:>12.1f} {elapsed / off - 1:>8.0%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+"""
+Throughput of a 10 stage pipeline over values of which half fail at the second stage:
+raising and catching an exception per failure, against Maybe, Either and Result.partition.
+
+Run from the repository root:
+    python -m benchmarks.bench_short_circuit
+"""
+import time
+
+from pyrofunc import Monad, Maybe, Either, Result, Left, functor, staticfunctor
+
+
+@staticfunctor
+class Inc:
+    @staticmethod
+    def __exec__(x: int) -> int:
+        return x + 1
+
+
+@functor
+class RaiseOdd:
+    def __exec__(self, x: int) -> int:
+        if x % 2:
+            raise ValueError(x)
+        return x
+
+
+@functor
+class NoneOdd:
+    def __exec__(self, x: int) -> int:
+        return None if x % 2 else x
+
+
+@functor
+class LeftOdd:
+    def __exec__(self, x: int) -> int:
+        return Left(x) if x % 2 else x
+
+
+def chain(check, stages: int):
+    pipeline = Inc >> check
+    for _ in range(stages - 2):
+        pipeline = pipeline >> Inc
+    return pipeline.compile()
+
+
+def exceptions(pipeline, values):
+    successes, failures = [], []
+    for index, value in enumerate(values):
+        try:
+            successes.append(Monad(value) | pipeline | int)
+        except ValueError as error:
+            failures.append((index, error))
+    return successes, failures
+
+
+def main(count: int = 100_000, stages: int = 10):
+    values = range(count)
+    runs = [
+        ("exceptions", lambda: exceptions(chain(RaiseOdd(), stages), values)),
+        ("Result.partition", lambda: Result.partition(chain(RaiseOdd(), stages), values)),
+        ("Maybe.partition", lambda: Maybe.partition(chain(NoneOdd(), stages), values)),
+        ("Either.partition", lambda: Either.partition(chain(LeftOdd(), stages), values)),
+    ]
+    print(f"{'mode':<20} {'values/s':>12}")
+    for name, run in runs:
+        start = time.perf_counter()
+        successes, failures = run()
+        elapsed = time.perf_counter() - start
+        assert len(successes) == len(failures) == count // 2
+        print(f"{name:<20} {count / elapsed:>12,.0f}")
+
+
+if __name__ == "__main__":
+    main()
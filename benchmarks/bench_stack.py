@@ -0,0 +1,60 @@
+"""
+Cost of a 10 stage pipeline on monad stacks of increasing depth, against the previous recursive Monad.__exec__.
+
+Run from the repository root:
+    python -m benchmarks.bench_stack
+"""
+import timeit
+
+from pyrofunc import Monad, staticfunctor
+
+
+@staticfunctor
+class Inc:
+    @staticmethod
+    def __exec__(x: int) -> int:
+        return x + 1
+
+
+class RecursiveMonad(Monad):
+    """The previous Monad.__exec__ and | on functors, recursing once per layer for every stage."""
+    __slots__ = ()
+
+    def __exec__(self, func):
+        if self.__strategy__ is not None:
+            self.__pre__.append(self.__snapshot__(func))
+        if hasattr(self.__value__, '__value__'):
+            self.__value__ = self.__value__.__exec__(func)
+        else:
+            self = func(self)
+        return self
+
+    def __or__(self, func):
+        return func(self)
+
+
+def nest(cls, depth: int):
+    monad = Monad(0)
+    for _ in range(depth):
+        monad = cls(monad)
+    return monad
+
+
+def best(stmt, number: int) -> float:
+    return min(timeit.repeat(stmt, number=number, repeat=5)) / number
+
+
+def main(stages: int = 10, number: int = 500):
+    pipeline = Inc
+    for _ in range(stages - 1):
+        pipeline = pipeline >> Inc
+    print(f"{'depth':>6} {'recursive (us)':>15} {'iterative (us)':>15}")
+    for depth in (0, 1, 4, 16, 64, 256):
+        recursive_stack, stack = nest(RecursiveMonad, depth), nest(Monad, depth)
+        recursive = best(lambda: recursive_stack | pipeline, number)
+        iterative = best(lambda: stack | pipeline, number)
+        print(f"{depth:>6} {recursive * 1e6:>15.1f} {iterative * 1e6:>15.1f}")
+
+
+if __name__ == "__main__":
+    main()
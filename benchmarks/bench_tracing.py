@@ -0,0 +1,64 @@
+"""
+Cost of the tracing layer on a 20 stage pipeline run through nested dispatch.
+
+Run from the repository root:
+    python -m benchmarks.bench_tracing
+"""
+import contextlib
+import io
+import logging
+import timeit
+
+from pyrofunc import Monad, core, staticfunctor, set_tracing
+
+
+@staticfunctor
+class Inc:
+    @staticmethod
+    def __exec__(x: int) -> int:
+        return x + 1
+
+
+def guarded():
+    if core.TRACING:
+        core._trace("%s", 0)
+
+
+def unguarded():
+    pass
+
+
+def best(stmt, number: int) -> float:
+    return min(timeit.repeat(stmt, number=number, repeat=5)) / number
+
+
+def main(stages: int = 20, number: int = 2000):
+    pipeline = Inc
+    for _ in range(stages - 1):
+        pipeline = pipeline >> Inc
+    run = lambda: Monad(0) | pipeline
+
+    guard = best(guarded, 1_000_000) - best(unguarded, 1_000_000)
+    print(f"trace point guard: {guard * 1e9:.1f} ns")
+
+    set_tracing(False)
+    off = best(run, number)
+    print(f"{'mode':<36} {'per run (us)':>12} {'overhead':>9}")
+    print(f"{'tracing off':<36} {off * 1e6:>12.1f} {'-':>9}")
+
+    logging.getLogger("pyrofunc").setLevel(logging.WARNING)
+    modes = [
+        ("tracing on, no-op sink", lambda msg, *args: None),
+        ("tracing on, logger below DEBUG", None),
+        ("tracing on, print() to memory", lambda msg, *args: print(msg % args, flush=True)),
+    ]
+    for name, sink in modes:
+        set_tracing(True, sink)
+        with contextlib.redirect_stdout(io.StringIO()):
+            elapsed = best(run, number)
+        print(f"{name:<36} {elapsed * 1e6:>12.1f} {elapsed / off - 1:>8.0%}")
+    set_tracing(False)
+
+
+if __name__ == "__main__":
+    main()
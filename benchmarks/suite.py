@@ -0,0 +1,182 @@
+"""
+Benchmark suite of the pipeline core, with machine-readable results and regression tracking against a baseline.
+
+Run from the repository root:
+    python -m benchmarks.suite                       # print the results
+    python -m benchmarks.suite --json results.json   # also write them as JSON
+    python -m benchmarks.suite --compare             # exit with status 1 when slower than benchmarks/baseline.json
+    python -m benchmarks.suite --update-baseline     # store the results as the new baseline
+
+Times are divided by the time of a fixed pure Python loop measured in the same run,
+so a baseline recorded on one machine stays meaningful on another.
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import sys
+import timeit
+
+from pyrofunc import Monad, MonadWithLogs, extract_logs, functor, staticfunctor
+
+BASELINE = os.path.join(os.path.dirname(__file__), "baseline.json")
+
+
+@staticfunctor
+class Inc:
+    @staticmethod
+    def __exec__(x: int) -> int:
+        return x + 1
+
+
+@functor
+class Touch:
+    def __init__(self, index: int):
+        self.index = index
+
+    def __exec__(self, x: list) -> list:
+        x[self.index % len(x)] += 1
+        return x
+
+
+def chain(stage, stages: int):
+    pipeline = stage(0) if isinstance(stage, type) else stage
+    for index in range(1, stages):
+        pipeline = pipeline >> (stage(index) if isinstance(stage, type) else stage)
+    return pipeline
+
+
+def nest(depth: int) -> Monad:
+    monad = Monad(0)
+    for _ in range(depth):
+        monad = Monad(monad)
+    return monad
+
+
+def calibration():
+    total = 0
+    for index in range(1000):
+        total += index
+    return total
+
+
+def cases() -> list[tuple[str, callable, int]]:
+    """The (name, statement, number of runs) of every benchmark of the suite."""
+    suite = []
+    # Functor.__call__ alone
+    monad = Monad(0)
+    suite.append(("call/functor", lambda: Inc(monad), 100_000))
+    # Chain length scaling, through nested dispatch and compiled
+    for stages in (1, 10, 100):
+        pipeline = chain(Inc, stages)
+        compiled = pipeline.compile()
+        suite.append((f"chain/composite/{stages}", lambda pipeline=pipeline: Monad(0) | pipeline, 50_000 // stages))
+        suite.append((f"chain/compiled/{stages}", lambda compiled=compiled: Monad(0) | compiled, 100_000 // stages))
+    # Payload size scaling for each history strategy, the copies dominate with large payloads
+    pipeline = chain(Touch, 10)
+    for size in (10, 1_000, 100_000):
+        value = list(range(size))
+        for history in ("none", "cow", "deepcopy"):
+            number = max(1, 20_000 // size) if history == "deepcopy" else max(10, 200_000 // size)
+            suite.append((f"payload/{history}/{size}",
+                          lambda value=value, history=history, pipeline=pipeline:
+                          Monad(value, history=history) | pipeline, number))
+    # Logging on and off
+    logged = chain(Inc, 20)
+    suite.append(("logs/off/20", lambda: Monad(0) | logged, 5_000))
+    suite.append(("logs/on/20", lambda: MonadWithLogs(0) | logged, 5_000))
+    suite.append(("logs/extract/20", lambda: extract_logs(MonadWithLogs(0) | logged), 5_000))
+    # Nested monad depth
+    nested = chain(Inc, 10)
+    for depth in (0, 4, 16, 64):
+        stack = nest(depth)
+        suite.append((f"nesting/{depth}", lambda stack=stack: stack | nested, 5_000))
+    # Composition time of >>
+    for stages in (10, 100):
+        suite.append((f"compose/{stages}", lambda stages=stages: chain(Inc, stages), 20_000 // stages))
+    suite.append(("compose/casts/10", lambda: Inc >> float >> int >> float >> int >> float >> int >> float >> int
+                  >> float >> int, 2_000))
+    return suite
+
+
+def measure(stmt, number: int, repeat: int = 5) -> float:
+    """Best time of one run of stmt, in seconds."""
+    with contextlib.redirect_stdout(io.StringIO()):
+        return min(timeit.repeat(stmt, number=number, repeat=repeat)) / number
+
+
+def run(pattern: str = "", scale: float = 1.0) -> dict:
+    """
+    Run the benchmarks whose name contains pattern.
+    :param scale: Factor applied to the number of runs of every benchmark, e.g. 0.1 for a quick run.
+    """
+    reference = measure(calibration, 2_000, repeat=20)
+    results = {}
+    for name, stmt, number in cases():
+        if pattern in name:
+            seconds = measure(stmt, max(1, int(number * scale)))
+            results[name] = {"seconds": seconds, "normalized": seconds / reference}
+    return {"python": platform.python_version(), "platform": platform.platform(),
+            "calibration": reference, "results": results}
+
+
+def compare(results: dict, baseline: dict, tolerance: float = 0.25) -> list[tuple[str, float | None, str]]:
+    """
+    Compare normalized times against a baseline.
+    :return: The (name, ratio to the baseline, status) of every benchmark, where status is
+             "ok", "faster", "regression" (slower by more than tolerance) or "new".
+    """
+    rows = []
+    for name, result in results["results"].items():
+        reference = baseline["results"].get(name)
+        if reference is None:
+            rows.append((name, None, "new"))
+            continue
+        ratio = result["normalized"] / reference["normalized"]
+        status = "regression" if ratio > 1 + tolerance else "faster" if ratio < 1 / (1 + tolerance) else "ok"
+        rows.append((name, ratio, status))
+    return rows
+
+
+def main(argv: list[str] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--filter", default="", help="only run the benchmarks whose name contains this text")
+    parser.add_argument("--scale", type=float, default=1.0, help="factor applied to the number of runs")
+    parser.add_argument("--json", help="write the results to this file")
+    parser.add_argument("--compare", nargs="?", const=BASELINE, help="baseline file to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="slowdown reported as a regression")
+    parser.add_argument("--update-baseline", action="store_true", help="store the results as the baseline")
+    args = parser.parse_args(argv)
+
+    results = run(args.filter, args.scale)
+    if args.json:
+        with open(args.json, "w") as file:
+            json.dump(results, file, indent=2)
+    if args.update_baseline:
+        with open(BASELINE, "w") as file:
+            json.dump(results, file, indent=2)
+
+    if not args.compare:
+        print(f"{'benchmark':<28} {'time (us)':>12} {'normalized':>11}")
+        for name, result in results["results"].items():
+            print(f"{name:<28} {result['seconds'] * 1e6:>12.2f} {result['normalized']:>11.3f}")
+        return 0
+    with open(args.compare) as file:
+        baseline = json.load(file)
+    rows = compare(results, baseline, args.tolerance)
+    print(f"{'benchmark':<28} {'time (us)':>12} {'vs baseline':>12} {'status':>11}")
+    for name, ratio, status in rows:
+        seconds = results["results"][name]["seconds"]
+        shown = "-" if ratio is None else f"{ratio:.2f}x"
+        print(f"{name:<28} {seconds * 1e6:>12.2f} {shown:>12} {status:>11}")
+    regressions = [name for name, _, status in rows if status == "regression"]
+    if regressions:
+        print(f"{len(regressions)} regression(s) above {args.tolerance:.0%}: {', '.join(regressions)}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
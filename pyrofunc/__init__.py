@@ -0,0 +1,53 @@
+"""
+Pyrofunc: composable and type-safe pipelines of Monads and Functors.
+
+Importing the package only loads the core types. The other names are loaded from their module on first use,
+so short-lived processes only pay for the features they use.
+"""
+import importlib
+
+from . import core
+from .core import (Monad, Functor, CompositeFunctor, CompiledFunctor, functor, staticfunctor, set_tracing,
+                   VALIDATION_MODES, HISTORY_STRATEGIES, IMMUTABLE_TYPES)
+
+# Module of each name loaded on first use
+_LAZY = {
+    "StageProfile": "profiler", "Profiler": "profiler",
+    "LRUCache": "cache", "CachedFunctor": "cache", "memoized_functor": "cache",
+    "LOSSLESS_ROUND_TRIPS": "optimize", "register_fusion": "optimize", "FusedFunctor": "optimize",
+    "JITFunctor": "jit",
+    "DAG": "dag", "DAGFunctor": "dag", "JoinFunctor": "dag", "MergeFunctor": "dag", "fan": "dag", "join": "dag",
+    "merge": "dag",
+    "LogRecord": "logs", "MonadWithLogs": "logs", "extract_logs": "logs",
+    "BatchMonad": "batch", "Stream": "batch",
+    "Checkpoint": "checkpoint",
+    "LineSource": "files", "RecordSource": "files", "NpySource": "files", "LineSink": "files", "RecordSink": "files",
+    "NpySink": "files",
+    "RUN_MODES": "lazy", "LazyMonad": "lazy",
+    "AsyncMonad": "asynchronous", "amap": "asynchronous",
+    "NothingType": "shortcircuit", "Nothing": "shortcircuit", "Left": "shortcircuit",
+    "ShortCircuitMonad": "shortcircuit", "Maybe": "shortcircuit", "Either": "shortcircuit", "Result": "shortcircuit",
+    "StageError": "parallel", "parallel_map": "parallel",
+    "PipelinedExecutor": "pipelined", "pipelined_map": "pipelined",
+    "Add": "examples", "Multiply": "examples", "AddOne": "examples", "to_string": "examples", "to_float": "examples",
+}
+
+__all__ = ["Monad", "Functor", "CompositeFunctor", "CompiledFunctor", "functor", "staticfunctor", "set_tracing",
+           "VALIDATION_MODES", "HISTORY_STRATEGIES", "IMMUTABLE_TYPES", *_LAZY]
+
+
+def __getattr__(name: str):
+    module = _LAZY.get(name)
+    if module is not None:
+        value = getattr(importlib.import_module(f".{module}", __name__), name)
+        # Bind the name, later lookups no longer go through this function
+        globals()[name] = value
+        return value
+    # The globals of the core, such as TRACING or PROFILER, are rebound at run time and read from it on each access
+    if hasattr(core, name):
+        return getattr(core, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__() -> list[str]:
+    return sorted(set(globals()) | set(__all__))
@@ -0,0 +1,90 @@
+"""Monad awaiting asynchronous functors."""
+import itertools
+from typing import Iterable
+
+from . import core
+from .core import CompiledFunctor, Functor, Monad, R, T, _validate_sample
+
+
+class AsyncMonad(Monad):
+    """
+    Monad running pipelines that mix synchronous and asynchronous functors.
+    Piping only records the stages, awaiting the monad runs them in order:
+        m = await (AsyncMonad(5) | Add(3) >> FetchUser())
+    """
+    __slots__ = ("__stages__",)
+
+    def __init__(self, value: T, **kwargs):
+        super().__init__(value, **kwargs)
+        self.__stages__ = []
+
+    def __exec__(self, func: 'Functor[T, R]') -> 'AsyncMonad[R]':
+        assert isinstance(func, Functor), f"{self.__class__.__name__}.__exec__({func}):" \
+                                          f"Expected Functor, got {type(func)}"
+        self.__stages__.extend(func.__flatten__())
+        return self
+
+    def __or__(self, other):
+        if isinstance(other, Functor):
+            return self.__exec__(other)
+        assert not self.__stages__, f"{self.__class__.__name__}.__or__({other}): \n" \
+                                    f"    Await the monad before casting its value"
+        return super().__or__(other)
+
+    def __await__(self):
+        return self.__run__().__await__()
+
+    async def __run__(self) -> 'AsyncMonad[R]':
+        stages, self.__stages__ = self.__stages__, []
+        if not stages:
+            return self
+        if core.TRACING:
+            core._trace("%s.__run__(%s)(value=%r)", self.__class__.__name__, len(stages), self.__value__)
+        _validate_sample(CompiledFunctor(stages), self.__value__, self.__dtype__)
+        value = self.__value__
+        for stage in stages:
+            value = stage.__exec__(value)
+            if stage.__async__:
+                value = await value
+        self.__value__ = value
+        return self
+
+
+async def amap(pipeline: 'Functor[T, R]', values: Iterable[T], concurrency: int = 16) -> list[R]:
+    """
+    Run a pipeline over many values concurrently, with at most `concurrency` values in flight.
+    :return: The results, in the order of the input values.
+    """
+    # asyncio is only needed here, keep it out of the import of the module
+    import asyncio
+    assert concurrency >= 1, f"amap({pipeline.__name__}, {concurrency}): Expected a positive concurrency"
+    compiled = pipeline.compile()
+    # Compiled and type checked once, the workers only run the stages
+    stages = [(stage.__exec__, stage.__async__) for stage in compiled.stages]
+    source = iter(values)
+    for first in source:
+        _validate_sample(compiled, first, type(values).__name__)
+        source = itertools.chain([first], source)
+        break
+    if core.TRACING:
+        core._trace("amap(%s, %d)", compiled.__name__, concurrency)
+    source = enumerate(source)
+    results = {}
+
+    async def worker():
+        # Workers share the input iterator, each pulls the next value once it is done with the previous one
+        for index, value in source:
+            for execute, awaited in stages:
+                value = execute(value)
+                if awaited:
+                    value = await value
+            results[index] = value
+
+    workers = [asyncio.ensure_future(worker()) for _ in range(concurrency)]
+    try:
+        await asyncio.gather(*workers)
+    except BaseException:
+        for task in workers:
+            task.cancel()
+        raise
+    return [results[index] for index in range(len(results))]
@@ -0,0 +1,165 @@
+"""Monads running pipelines over a batch of values or a stream."""
+import functools
+import itertools
+import os
+import sys
+from typing import Iterable, Iterator
+
+from . import core
+from .core import CompiledFunctor, Functor, Monad, R, T, _validate_sample
+
+
+class BatchMonad(Monad):
+    """
+    Monad applying pipelines to a whole batch of values (a list or a NumPy array) at once.
+    The input type is checked once per batch. Functors declaring __exec_batch__ run on the whole batch,
+    the others are applied to each element in turn.
+    """
+    __slots__ = ()
+
+    def __init__(self, values: list[T], **kwargs):
+        super().__init__(values, **kwargs)
+
+    def __exec__(self, func: 'Functor[T, R]') -> 'BatchMonad[R]':
+        assert isinstance(func, Functor), f"{self.__class__.__name__}.__exec__({func}):" \
+                                          f"Expected Functor, got {type(func)}"
+        if self.__strategy__ is not None:
+            self.__pre__.append(self.__snapshot__(func))
+        if core.TRACING:
+            core._trace("%s.__exec__(%s)(%d values)", self.__class__.__name__, func.__name__, len(self.__value__))
+        stages = func.__flatten__()
+        self.__validate_batch__(stages[0], self.__value__)
+        values = _run_batch(stages, self.__value__)
+        self.__value__ = values
+        return self
+
+    def __validate_batch__(self, func: 'Functor', values) -> bool:
+        """Check the first value of the batch against the input type of the pipeline."""
+        if len(values) > 0:
+            _validate_sample(func, values[0], self.__dtype__)
+        return True
+
+    def __or__(self, other):
+        if isinstance(other, Functor):
+            return self.__exec__(other)
+        return super().__or__(other)
+
+
+def _run_batch(stages: list['Functor'], values):
+    """Run the stages over a batch, on the whole batch where a stage declares __exec_batch__."""
+    for stage in stages:
+        if core.PROFILER is not None:
+            values = core.PROFILER.record(stage.__name__, functools.partial(_run_stage, stage), values)
+        else:
+            values = _run_stage(stage, values)
+    return values
+
+
+def _run_stage(stage: 'Functor', values):
+    batch = getattr(stage, "__exec_batch__", None)
+    if batch is not None:
+        return batch(values)
+    return _like(values, [stage.__exec__(value) for value in values])
+
+
+
+def _like(values, result: list):
+    """Convert the list produced by an element-wise stage back to the container type of values."""
+    numpy = sys.modules.get("numpy")
+    if numpy is not None and isinstance(values, numpy.ndarray):
+        return numpy.asarray(result)
+    return result
+
+
+# Monad over an unbounded iterable
+class Stream(Monad):
+    """
+    Monad applying pipelines lazily to the items of an iterable.
+    Items are pulled and processed one chunk at a time, so memory use does not depend on the stream length.
+    With chunksize > 1 each chunk goes through the batch path, where functors can use __exec_batch__.
+    With a checkpoint, the progress is saved to disk as chunks are consumed and a restarted stream skips the work done.
+    Sources with a __chunks__ method (see pyrofunc.files) hand their own chunks to the stages, without copying them,
+    and sinks with a __consume__ method write the processed chunks as they come.
+    """
+    __slots__ = ("__chunksize__", "__stages__", "__checkpoint__", "__source__")
+
+    def __init__(self, iterable: Iterable[T], chunksize: int = 1, checkpoint: 'Checkpoint | str' = None, **kwargs):
+        """
+        :param checkpoint: Checkpoint, or path of one with the default frequency, see pyrofunc.checkpoint.
+        """
+        assert chunksize >= 1, f"{self.__class__.__name__}.__init__({iterable}, {chunksize}): \n" \
+                               f"    Expected a positive chunk size"
+        super().__init__(iter(iterable), **kwargs)
+        self.__source__ = iterable if hasattr(type(iterable), "__chunks__") else None
+        self.__chunksize__ = chunksize
+        self.__stages__ = []
+        if isinstance(checkpoint, (str, os.PathLike)):
+            from .checkpoint import Checkpoint
+            checkpoint = Checkpoint(checkpoint)
+        self.__checkpoint__ = checkpoint
+
+    def __exec__(self, func: 'Functor[T, R]') -> 'Stream[R]':
+        assert isinstance(func, Functor), f"{self.__class__.__name__}.__exec__({func}):" \
+                                          f"Expected Functor, got {type(func)}"
+        if core.TRACING:
+            core._trace("%s.__exec__(%s)", self.__class__.__name__, func.__name__)
+        # Only record the stages, they run when the stream is consumed
+        self.__stages__.extend(func.__flatten__())
+        return self
+
+    def __start__(self) -> tuple[Iterator[T], 'CompiledFunctor | None']:
+        """Type check the recorded stages and the first item once, when the stream starts."""
+        source = self.__value__
+        if not self.__stages__:
+            return source, None
+        compiled = CompiledFunctor(self.__stages__)
+        for first in source:
+            _validate_sample(compiled, first, self.__dtype__)
+            return itertools.chain([first], source), compiled
+        return source, compiled
+
+    def chunks(self) -> Iterator[list]:
+        """Yield the processed items one chunk at a time."""
+        if self.__source__ is not None and self.__checkpoint__ is None:
+            yield from self.__source_chunks__()
+            return
+        source, compiled = self.__start__()
+        stages = compiled.stages if compiled is not None else []
+        if self.__checkpoint__ is not None:
+            yield from self.__checkpoint__.run(stages, source, self.__chunksize__)
+            return
+        while chunk := list(itertools.islice(source, self.__chunksize__)):
+            yield _run_batch(stages, chunk)
+
+    def __source_chunks__(self) -> Iterator:
+        """Run the stages over the chunks of the source as they are, e.g. slices of a memory-mapped array."""
+        compiled = CompiledFunctor(self.__stages__) if self.__stages__ else None
+        stages = compiled.stages if compiled is not None else []
+        for index, chunk in enumerate(self.__source__.__chunks__(self.__chunksize__)):
+            if index == 0 and compiled is not None:
+                _validate_sample(compiled, chunk[0], type(self.__source__).__name__)
+            yield _run_batch(stages, chunk)
+
+    def __iter__(self) -> Iterator[R]:
+        if self.__chunksize__ > 1 or self.__checkpoint__ is not None:
+            for chunk in self.chunks():
+                yield from chunk
+            return
+        source, compiled = self.__start__()
+        if compiled is None:
+            yield from source
+            return
+        execute = compiled.__exec__
+        for item in source:
+            yield execute(item)
+
+    def __or__(self, other):
+        if isinstance(other, Functor):
+            return self.__exec__(other)
+        consume = getattr(other, "__consume__", None)
+        if consume is not None:
+            # Sinks write the processed chunks as they come, e.g. Stream(source) | Parse() | LineSink(path)
+            return consume(self.chunks())
+        # Anything else consumes the processed stream, e.g. Stream(lines) | Parse() | list
+        return other(iter(self))
+
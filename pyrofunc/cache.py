@@ -0,0 +1,135 @@
+"""Memoization of pure functors and pipelines."""
+import copy
+import functools
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable
+
+from .core import Functor, CompositeFunctor, IMMUTABLE_TYPES, R, T, _MISSING, functor
+
+
+class LRUCache:
+    """Bounded cache evicting the least recently used entries, and the entries older than ttl seconds."""
+    def __init__(self, maxsize: int = 128, ttl: float = None):
+        assert maxsize is None or maxsize > 0, f"{self.__class__.__name__}.__init__({maxsize}, {ttl}): \n" \
+                                               f"    Expected a positive maxsize"
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.entries = OrderedDict()
+        self.hits = self.misses = self.evictions = 0
+        self.lock = threading.Lock()
+
+    def get(self, key, default=None):
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is not None:
+                value, expires = entry
+                if expires is None or expires > time.monotonic():
+                    self.entries.move_to_end(key)
+                    self.hits += 1
+                    return value
+                del self.entries[key]
+                self.evictions += 1
+            self.misses += 1
+            return default
+
+    def put(self, key, value):
+        with self.lock:
+            self.entries[key] = (value, None if self.ttl is None else time.monotonic() + self.ttl)
+            self.entries.move_to_end(key)
+            if self.maxsize is not None and len(self.entries) > self.maxsize:
+                self.entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+            self.hits = self.misses = self.evictions = 0
+
+    def stats(self) -> dict:
+        return {"hits": self.hits, "misses": self.misses, "evictions": self.evictions,
+                "size": len(self.entries), "maxsize": self.maxsize, "ttl": self.ttl}
+
+
+
+def _typed(value) -> tuple:
+    """Key of a value that tells apart equal values of different types, e.g. 1, 1.0 and True."""
+    if type(value) is tuple or type(value) is frozenset:
+        return type(value), type(value)(_typed(item) for item in value)
+    return type(value), value
+
+
+def _params(func: Functor) -> tuple:
+    """Constructor parameters of a functor instance, e.g. (("y", int, 3),) for Add(3)."""
+    return tuple(sorted(((name, *_typed(value)) for name, value in vars(func).items() if not name.startswith("__")),
+                        key=lambda param: param[0]))
+
+
+def _detach(result):
+    # A result mutated in place by a later stage must not change the cached one
+    return result if type(result) in IMMUTABLE_TYPES else copy.deepcopy(result)
+
+
+def _memoize(cache: LRUCache, key, compute: Callable, value):
+    """
+    Look key up in the cache, computing and storing compute(value) on a miss.
+    Mutable results are cached and returned as copies.
+    """
+    try:
+        result = cache.get(key, _MISSING)
+    except TypeError:
+        # Unhashable inputs or parameters are not cached
+        return compute(value)
+    if result is _MISSING:
+        result = compute(value)
+        cache.put(key, _detach(result))
+        return result
+    return _detach(result)
+
+
+class CachedFunctor(Functor):
+    """Functor memoizing the results of a pure functor or pipeline, keyed on the input value and its type."""
+    def __init__(self, inner: Functor, maxsize: int = 128, ttl: float = None):
+        assert not inner.__async__, f"{self.__class__.__name__}.__init__({inner.__name__}): \n" \
+                                    f"    Asynchronous functors cannot be cached"
+        self.inner = inner.compile() if isinstance(inner, CompositeFunctor) else inner
+        self.__cache__ = LRUCache(maxsize, ttl)
+        self.__name__ = inner.__name__
+        self.__domain__, self.__codomain__ = inner.__domain__, inner.__codomain__
+        self.__check__ = inner.__check__
+        self.__pure__ = True
+
+    def __exec__(self, value: T) -> R:
+        return _memoize(self.__cache__, _typed(value), self.inner.__exec__, value)
+
+    def __reduce__(self):
+        # The cache is not shipped along, e.g. to worker processes
+        return self.__class__, (self.inner, self.__cache__.maxsize, self.__cache__.ttl)
+
+
+def memoized_functor(maxsize: int = 128, ttl: float = None):
+    """
+    Decorator memoizing the results of a pure functor class, in one cache shared by all its instances.
+    Results are keyed on the input value and the constructor parameters, with their types, so Add(3) and Add(4)
+    never collide, nor do the inputs 1, 1.0 and True.
+    The cache and its hit/miss/eviction stats are available as Cls.__cache__.
+    """
+    def decorate(cls):
+        if isinstance(cls, Functor):
+            # Static functors and functors made from functions are already instances
+            return cls.cached(maxsize, ttl)
+        if not (isinstance(cls, type) and issubclass(cls, Functor)):
+            cls = functor(cls)
+        assert not cls.__async__, f"memoized_functor({cls.__name__}): Asynchronous functors cannot be cached"
+        cache = LRUCache(maxsize, ttl)
+        compute = cls.__exec__
+
+        @functools.wraps(compute)
+        def __exec__(self, value):
+            return _memoize(cache, (_params(self), _typed(value)), super(memoized, self).__exec__, value)
+
+        memoized = type(cls.__name__, (cls,), {"__exec__": __exec__, "__cache__": cache, "__pure__": True,
+                                                "__module__": cls.__module__, "__qualname__": cls.__qualname__})
+        return memoized
+    return decorate
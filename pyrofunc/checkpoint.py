@@ -0,0 +1,164 @@
+"""Progress of long runs over a stream persisted to disk, see Checkpoint."""
+import collections
+import itertools
+import os
+import pickle
+import time
+import types
+from typing import Any, Iterator
+
+from . import core
+from .batch import _run_batch
+from .core import Functor
+
+# Format of the checkpoint files, a file of another version is not resumed
+VERSION = 2
+# Values fingerprinted by their repr
+_LITERAL_TYPES = (int, float, complex, bool, str, bytes, type(None))
+
+
+def _fingerprint(value, memo: dict = None) -> Any:
+    """
+    Structure of a stage, or of one of its parameters, the same in every process: the qualified names of the
+    classes and functions, the repr of literal values, the nested functors as they are pickled, and no address.
+    Like pickle, an object met again is replaced by its number, e.g. the DAG shared by all its nodes.
+    """
+    memo = {} if memo is None else memo
+    if type(value) in _LITERAL_TYPES:
+        # The repr tells apart 1, 1.0 and True
+        return repr(value)
+    if isinstance(value, (type, types.FunctionType, types.BuiltinFunctionType)):
+        name = f"{value.__module__}.{value.__qualname__}"
+        closure = getattr(value, "__closure__", None)
+        return (name, tuple(_fingerprint(cell.cell_contents, memo) for cell in closure)) if closure else name
+    if isinstance(value, types.MethodType):
+        return _fingerprint(value.__func__, memo), _fingerprint(value.__self__, memo)
+    if type(value) in (list, tuple):
+        return type(value).__name__, tuple(_fingerprint(item, memo) for item in value)
+    if type(value) in (set, frozenset):
+        return type(value).__name__, tuple(sorted(repr(_fingerprint(item, memo)) for item in value))
+    if type(value) is dict:
+        return "dict", tuple((_fingerprint(key, memo), _fingerprint(item, memo)) for key, item in value.items())
+    if id(value) in memo:
+        return "memo", memo[id(value)][0]
+    # The object is kept so that its id is not reused while fingerprinting
+    memo[id(value)] = (len(memo), value)
+    try:
+        # Functors pickle their structure without their runtime state, such as a cache or a thread pool
+        reduced = value.__reduce_ex__(4)
+    except TypeError:
+        return f"{type(value).__module__}.{type(value).__qualname__}"
+    if isinstance(reduced, str):
+        return f"{type(value).__module__}.{reduced}"
+    return _fingerprint(tuple(reduced[:3]), memo)
+
+
+class Checkpoint:
+    """
+    File where a Stream periodically saves its progress, so that a restarted run skips the work already done:
+    the number of input values whose results were consumed, and for the chunk in progress the index of the next stage
+    and the values it takes. The file is written atomically with pickle, and removed once the stream is exhausted.
+    Progress is also saved when a stage raises, the run then resumes at the failing stage. The input must yield the
+    same values in the same order on each run, the values already done are read and skipped:
+        for result in Stream(open("data.csv"), chunksize=1000, checkpoint=Checkpoint("run.ckpt", interval=30)) | Parse():
+            ...
+    """
+    def __init__(self, path: str | os.PathLike, interval: float = 60.0, every: int = None):
+        """
+        :param interval: Minimum number of seconds between two saves, bounding the I/O cost of checkpointing.
+        :param every: Save once this many values were consumed since the last save, even before interval.
+        """
+        assert interval >= 0 and (every is None or every >= 1), \
+            f"{self.__class__.__name__}.__init__({path}, {interval}, {every}): \n" \
+            f"    Expected a non-negative interval and a positive number of values"
+        self.path = os.fspath(path)
+        self.interval = interval
+        self.every = every
+        self.saves = 0
+        self.saved = time.monotonic()
+        self.pending = 0
+
+    def __repr__(self):
+        return f"{self.__class__.__name__}({self.path!r}, interval={self.interval}, every={self.every})"
+
+    def load(self, stages: list[Functor]) -> dict | None:
+        """State saved by a previous run of the same stages, None when there is none."""
+        try:
+            with open(self.path, "rb") as file:
+                state = pickle.load(file)
+        except FileNotFoundError:
+            return None
+        names = [stage.__name__ for stage in stages]
+        fingerprint = [_fingerprint(stage) for stage in stages]
+        assert state.get("version") == VERSION and state["fingerprint"] == fingerprint, \
+            f"{self.__class__.__name__}.load({self.path}): \n" \
+            f"    Checkpoint of {state.get('stages')} cannot resume {names}, the stages or their parameters differ"
+        return state
+
+    def save(self, stages: list[Functor], offset: int, consumed: int, stage: int = None, values: list = None):
+        """
+        Write the progress of a run, replacing the previous checkpoint.
+        :param offset: Number of input values whose results were consumed.
+        :param consumed: Number of input values read, those of the chunk in progress included.
+        :param stage: Index of the next stage to run on the values of the chunk in progress.
+        """
+        state = {"version": VERSION, "stages": [stage.__name__ for stage in stages],
+                 "fingerprint": [_fingerprint(stage) for stage in stages], "offset": offset,
+                 "consumed": consumed, "stage": stage, "values": values}
+        temporary = f"{self.path}.tmp"
+        with open(temporary, "wb") as file:
+            pickle.dump(state, file, protocol=pickle.HIGHEST_PROTOCOL)
+        # A crash while writing leaves the previous checkpoint intact
+        os.replace(temporary, self.path)
+        self.saves += 1
+        self.saved, self.pending = time.monotonic(), 0
+        if core.TRACING:
+            core._trace("%s.save(%s): offset %d, stage %s", self.__class__.__name__, self.path, offset, stage)
+
+    def due(self) -> bool:
+        """Whether enough time passed, or enough values were consumed, since the last save."""
+        return time.monotonic() - self.saved >= self.interval or (self.every is not None and self.pending >= self.every)
+
+    def clear(self):
+        """Remove the checkpoint, the next run starts from the beginning."""
+        try:
+            os.remove(self.path)
+        except FileNotFoundError:
+            pass
+
+    def run(self, stages: list[Functor], source: Iterator, chunksize: int) -> Iterator[list]:
+        """
+        Run the stages over the source one chunk at a time, resuming from and saving to the checkpoint.
+        A chunk counts as done once the consumer asks for the next one.
+        """
+        state = self.load(stages)
+        offset = consumed = start = 0
+        values = None
+        if state is not None:
+            offset, consumed, start, values = state["offset"], state["consumed"], state["stage"], state["values"]
+            # Skip the values done, and those of the chunk in progress which is restored at its stage
+            collections.deque(itertools.islice(source, consumed), maxlen=0)
+            if core.TRACING:
+                core._trace("%s.run(%s): resumed at offset %d, stage %s", self.__class__.__name__, self.path,
+                            offset, start)
+        self.saved, self.pending = time.monotonic(), 0
+        while True:
+            if values is None:
+                values = list(itertools.islice(source, chunksize))
+                if not values:
+                    break
+                consumed, start = offset + len(values), 0
+            for index in range(start, len(stages)):
+                try:
+                    values = _run_batch(stages[index:index + 1], values)
+                except BaseException:
+                    self.save(stages, offset, consumed, index, values)
+                    raise
+                if index + 1 < len(stages) and self.due():
+                    self.save(stages, offset, consumed, index + 1, values)
+            yield values
+            self.pending += consumed - offset
+            offset, values = consumed, None
+            if self.due():
+                self.save(stages, offset, consumed)
+        self.clear()
@@ -0,0 +1,626 @@
+"""
+Core of the pipelines: Monad, Functor and their composition.
+Only this module is imported with the package, the other features are loaded when first used.
+"""
+import copy
+import sys
+import types
+import typing
+from collections import deque
+from typing import Callable, TypeVar, Generic, Union, Any
+
+# Generic types for Functor and Monad
+T = TypeVar('T')
+R = TypeVar('R')
+S = TypeVar('S')
+
+# Tracing of the Monad and Functor internals, off by default.
+# While TRACING is False a trace point costs a single global lookup and its message is never built.
+TRACING = False
+
+
+def _log(msg: str, *args):
+    # logging is only imported once tracing emits its first message
+    import logging
+    logging.getLogger("pyrofunc").debug(msg, *args)
+
+
+_trace = _log
+
+
+def set_tracing(enabled: bool = True, sink: Callable[..., None] = None):
+    """
+    Turn tracing of the pipeline internals on or off.
+    :param enabled: Whether trace points emit messages.
+    :param sink: Callable receiving a %-style message and its arguments, formatted lazily.
+                 Defaults to the debug level of the "pyrofunc" logger.
+    """
+    global TRACING, _trace
+    TRACING = enabled
+    _trace = sink or _log
+
+
+# Profiler collecting the timings of each stage, see Profiler. None when profiling is off.
+PROFILER = None
+
+
+# How often a functor checks the type of its input, see Functor.validate
+VALIDATION_MODES = ("always", "once", "never")
+
+
+class _empty:
+    """Missing annotation, as inspect.Parameter.empty without importing inspect."""
+
+
+def _signature(func: Callable) -> tuple[Any, Any]:
+    """Input and output annotations of an __exec__ function, _empty when missing."""
+    annotations = dict(getattr(func, "__annotations__", {}))
+    codomain = annotations.pop("return", _empty)
+    domain = next(iter(annotations.values()), _empty)
+    return domain, codomain
+
+
+# Flag of the code of coroutine functions, inspect.CO_COROUTINE
+_CO_COROUTINE = 0x80
+
+
+def _is_async(func: Callable) -> bool:
+    """inspect.iscoroutinefunction(inspect.unwrap(func)), without importing inspect."""
+    while hasattr(func, "__wrapped__"):
+        func = func.__wrapped__
+    code = getattr(getattr(func, "__func__", func), "__code__", None)
+    return code is not None and bool(code.co_flags & _CO_COROUTINE)
+
+
+def _runtime_type(annotation: Any) -> type | tuple[type, ...] | None:
+    """
+    Resolve an annotation to the class(es) used in isinstance checks.
+    :return: None when the annotation does not constrain the value (missing, Any, TypeVar...).
+    """
+    origin = typing.get_origin(annotation)
+    if origin in (Union, types.UnionType):
+        resolved = tuple(_runtime_type(arg) for arg in typing.get_args(annotation))
+        return None if None in resolved else resolved
+    if isinstance(origin, type):
+        return origin
+    if annotation is _empty:
+        return None
+    if isinstance(annotation, type):
+        return annotation
+    if annotation is None:
+        return type(None)
+    return None
+
+
+# Strategies used by Monad to snapshot its value into the history before each stage
+HISTORY_STRATEGIES = (None, "none", "ref", "cow", "deepcopy")
+# Values of these types can be shared by the history without ever being copied
+IMMUTABLE_TYPES = frozenset({int, float, complex, bool, str, bytes, tuple, frozenset, type(None)})
+
+
+# Monad implementation
+class Monad(Generic[T]):
+    # Monads are created for every value going through a pipeline, the slots keep them small.
+    # Subclasses declare the slots of their own attributes.
+    __slots__ = ("__value__", "__kwargs__", "__pre__", "__strategy__")
+    __mtype__ = "Monad"
+    # History is off by default, subclasses or instances can turn it on
+    __history__ = None
+    # Number of snapshots kept in the history ring buffer
+    __depth__ = 16
+
+    def __init__(self, value: T, history: str = None, depth: int = None, **kwargs):
+        assert history in HISTORY_STRATEGIES, f"{self.__class__.__name__}.__init__({value}): \n" \
+                                              f"    Unknown history strategy {history!r}, expected one of {HISTORY_STRATEGIES}"
+        self.__value__ = value
+        # Both __kwargs__ and __pre__ are used for logging for now,
+        # but plans are to use them for more advanced features.
+        # Neither holds a container unless keyword arguments are given or the history is on.
+        self.__kwargs__ = kwargs or None
+        # History strategy of this instance, the class default unless overridden
+        strategy = self.__history__ if history is None else None if history == "none" else history
+        self.__strategy__ = strategy
+        if strategy is None:
+            self.__pre__ = ()
+        else:
+            self.__pre__ = deque(maxlen=depth or self.__depth__)
+
+    @property
+    def __dtype__(self) -> str:
+        return type(self.__value__).__name__
+
+    def __snapshot__(self, func: 'Functor') -> 'Monad[T]':
+        """
+        Copy the current value for the history, according to the history strategy.
+          - "ref": keep a reference to the value, later in-place mutations show up in the history.
+          - "cow": share immutable values and values handed to pure functors, copy the others.
+          - "deepcopy": keep a full independent copy of the value.
+        """
+        value = self.__value__
+        if self.__strategy__ == "deepcopy":
+            value = copy.deepcopy(value)
+        elif self.__strategy__ == "cow" and type(value) not in IMMUTABLE_TYPES \
+                and not getattr(func, "__pure__", False):
+            value = copy.copy(value)
+        return Monad(value)
+
+    # Hook run by each layer of a monad stack after a stage, e.g. to record logs. None when there is none.
+    __after__ = None
+
+    def __exec__(self, func: Callable[[T], 'Monad[R]']) -> 'Monad[R]':
+        if isinstance(self.__value__, Monad):
+            return _exec_stack(self, func)
+        # Composite functors call back this method for each of their stages
+        if isinstance(func, CompositeFunctor):
+            return func(self)
+        if self.__strategy__ is not None:
+            self.__pre__.append(self.__snapshot__(func))
+        if TRACING:
+            _trace("%s.__exec__(%s)(value=%r)", self.__class__.__name__, func.__name__, self.__value__)
+        result = func(self)
+        if self.__after__ is not None:
+            self.__after__(func)
+        return result
+
+    def __call__(self, *args, **kwargs):
+        if TRACING:
+            _trace("%s.__call__(%r, %r)", self.__class__.__name__, args, kwargs)
+        # Overload () operator for calling the value
+        return self.__exec__(*args, **kwargs)
+
+    def __rshift__(self, func: 'Functor[[T], R]') -> 'Functor[S, R]':
+        """
+        Compose the monad with a functor using >> operator.
+        :param func: The functor to apply to the monad's value.
+        :return:
+        """
+        assert isinstance(func, Functor), f"{self.__class__.__name__}.__rshift__({func}):" \
+                                          f"Expected Functor, got {type(func)}"
+        self = self.__exec__(func)
+        return self
+
+    def __or__(self, other):
+        if TRACING:
+            _trace("%s.__or__(%r)", self.__class__.__name__, other)
+        # Functors are applied to the monad, types and other callables cast its value, see _pipe_kind
+        kind = _PIPES.get(type(other)) or _pipe_kind(type(other))
+        if kind == "functor":
+            if isinstance(self.__value__, Monad):
+                return self.__exec__(other)
+            return other(self)
+        if kind == "class" and (_CLASS_PIPES.get(other) or _class_pipe_kind(other)) == "functor":
+            return other(self)
+        value = self.__value__
+        if isinstance(value, Monad):
+            return _pipe_nested(value, other)
+        return other(value)
+
+    def __repr__(self):
+        return f'{self.__dtype__}({self.__value__})'
+
+
+# Functor class
+class Functor(Generic[T, R]):
+    __name__ = "Functor"
+    # Pure functors never mutate their input in place
+    __pure__ = False
+    # Input type check mode, and whether the check can be skipped on the next call
+    __validation__ = "always"
+    __validated__ = False
+    #def __init__(self, fn: Callable[[T], R] = None):
+    #    if fn:
+    #        kelf.__exec__ = fn
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        # Resolve the annotations once per functor class rather than on every call
+        cls.__domain__, cls.__codomain__ = _signature(cls.__exec__)
+        cls.__check__ = _runtime_type(cls.__domain__)
+        cls.__async__ = _is_async(cls.__exec__)
+
+    def __exec__(self, monad: Monad[T]) -> Monad[R]:
+        # Apply the functor to the monad's value from the children classes
+        raise NotImplementedError(f"{self.__class__.__name__}.__exec__({monad}):")
+
+    def __call__(self, value, *args, **kwargs) -> R:
+        assert isinstance(value, Monad), f"{self.__class__.__name__}.__call__({value}):" \
+                                         f"Expected Monad, got {type(value)}"
+        if TRACING:
+            _trace("%s.__call__(%r)", self.__class__.__name__, value)
+        if not self.__validated__:
+            self.__validate__(value)
+        if PROFILER is not None:
+            value.__value__ = PROFILER.measure(self, value.__value__)
+        else:
+            value.__value__ = self.__exec__(value.__value__)
+        return value
+
+    def __ror__(self, monad: Monad[T]) -> Monad[R]:
+        if TRACING:
+            _trace("%s.__ror__(%r)", self.__class__.__name__, monad)
+        assert isinstance(monad, Monad), f"Prototype 57: {self.__class__.__name__}.__ror__({monad})" \
+                                         f"Expected Monad, got {type(monad)}"
+        # Overload | operator for chaining with Monads or raw values
+        if isinstance(monad, Monad):
+            monad._value = self(monad._value)
+            return monad
+        raise TypeError(f"{self.__class__.__name__}.__ror__({monad}): \n"
+                        f"    Expected Monad, got {type(monad)}")
+
+    def __validate__(self, value: Monad[T]) -> Monad[T]:
+        """Validate input types of Monad against Functor's type annotations."""
+        assert isinstance(value, Monad), f"{self.__class__.__name__}.__validate__({value}):" \
+                                         f"Expected Monad, got {type(value)}"
+        assert not self.__async__, f"{self.__class__.__name__}.__validate__({value}): \n" \
+                                   f"    Asynchronous functors must be awaited, use AsyncMonad"
+        check = self.__check__
+        if check is not None and self.__validation__ != "never":
+            inner = value.__value__
+            assert type(inner) is check or isinstance(inner, check), \
+                f"Type Mismatch: Expected {getattr(self.__domain__, '__name__', self.__domain__)}, got {value.__dtype__}"
+        if self.__validation__ != "always":
+            self.__validated__ = True
+        return True
+
+    def validate(self, mode: str = "once") -> 'Functor':
+        """
+        Set how often the stages of the pipeline check their input type.
+          - "always": check on every call.
+          - "once": check the first call only.
+          - "never": skip the check, the pipeline is trusted to be fed the right types.
+        Static functors are shared instances, so their mode applies to every pipeline using them.
+        :return: The functor itself.
+        """
+        assert mode in VALIDATION_MODES, f"{self.__class__.__name__}.validate({mode!r}): \n" \
+                                         f"    Expected one of {VALIDATION_MODES}"
+        for stage in [self] + self.__flatten__():
+            stage.__validation__ = mode
+            stage.__validated__ = mode == "never"
+        return self
+
+    @staticmethod
+    def __compose__(first: 'Functor[[T], R]', second: Union['Functor[[R], S]', Callable[[R], S]]) -> 'Functor[[T], S]':
+        # Functors are composed as they are, types become casts and functions become functors, see _compose_handler
+        handler = _COMPOSES.get(type(second)) or _compose_handler(type(second))
+        return handler(first, second)
+
+    def __flatten__(self) -> list['Functor']:
+        """Return the leaf functors of this pipeline, in execution order."""
+        return [self]
+
+    def compile(self) -> 'CompiledFunctor':
+        """
+        Flatten the pipeline into a single linear CompiledFunctor.
+        :return: A functor running every stage of the pipeline in one loop.
+        """
+        return CompiledFunctor(self.__flatten__())
+
+    def optimize(self) -> 'CompiledFunctor':
+        """
+        Compile the pipeline after rewriting its stages: identity casts and lossless cast round trips are removed,
+        the fusion rules of register_fusion are applied, and runs of pure stages are fused into a single stage.
+        :return: A CompiledFunctor whose __rewrites__ lists the rewrites applied.
+        """
+        from .optimize import _optimize
+        stages, rewrites = _optimize(self.__flatten__())
+        compiled = CompiledFunctor(stages)
+        compiled.__rewrites__ = rewrites
+        return compiled
+
+    def jit(self) -> 'JITFunctor':
+        """
+        Compile the pipeline into a single generated Python function, inlining the stages it can.
+        :return: A JITFunctor whose __source__ is the generated source.
+        """
+        from .jit import JITFunctor
+        return JITFunctor(self.__flatten__())
+
+    def cached(self, maxsize: int = 128, ttl: float = None) -> 'CachedFunctor':
+        """
+        Memoize the results of this functor or pipeline, which must be pure.
+        :param maxsize: Maximum number of cached results, the least recently used are evicted first.
+        :param ttl: Time in seconds after which a cached result expires, None to keep results until evicted.
+        """
+        from .cache import CachedFunctor
+        return CachedFunctor(self, maxsize=maxsize, ttl=ttl)
+
+    def __rshift__(self, other: Union['Functor', Callable]) -> 'Functor':
+        if TRACING:
+            _trace("%s.__rshift__(%s)", self.__name__, other.__name__)
+        # Cast function to Functor
+        return self.__compose__(self, other)
+
+    def __rrshift__(self, other):
+        return self.__compose__(other, self)
+
+    def __irshift__(self, other):
+        return self.__compose__(self, other)
+
+    def __reduce_ex__(self, protocol):
+        cls = type(self)
+        # Static functors and functors made from functions are module-level instances, pickle them by name
+        if _global(cls.__module__, cls.__qualname__) is self:
+            return cls.__qualname__
+        if "__cast__" in cls.__dict__:
+            return _cast_type, self.__cast__
+        if "__wrapped__" in cls.__dict__:
+            return functor, (cls.__wrapped__,)
+        return super().__reduce_ex__(protocol)
+
+
+class CompositeFunctor(Functor):
+    def __init__(self, first: 'Functor[[T], R]', second: 'Functor[[R], S]') -> 'Functor[[T], S]':
+        # TODO: Will move eventually to an arbitrary number of functors
+        self.operations = [first, second]
+        self.first = first
+        self.second = second
+        # Validate the composition compatibility with the annotations resolved by the functor classes
+        first_domain, first_codomain = first.__domain__, first.__codomain__
+        second_domain, second_codomain = second.__domain__, second.__codomain__
+
+        assert first_codomain == second_domain, (f"{self.__name__}.__init__({first.__name__}, {second.__name__}):\n" 
+                                                 f"Type Mismatch: Expected {first_codomain}, got {second_domain}")
+        self.__domain__, self.__codomain__ = first_domain, second_codomain
+        self.__check__ = _runtime_type(first_domain)
+        self.__async__ = first.__async__ or second.__async__
+
+        self.__name__ = f"{first.__name__ or first.__class__.__name__}.{second.__name__ or second.__class__.__name__}"
+
+    def __exec__(self, value: T) -> S:
+        intermediate = self.first.__exec__(value)
+        return self.second.__exec__(intermediate)
+
+    def __call__(self, value: 'Monad[T]') -> 'Monad[S]':
+        assert isinstance(value, Monad), f"{self.__class__.__name__}.__call__({value}):" \
+                                         f"Expected Monad, got {type(value)}"
+        # Apply the first functor, then the second
+        value.__exec__(self.first)
+        value.__exec__(self.second)
+        return value
+
+    def __reduce__(self):
+        # Rebuilt from the flat list of stages, so deep trees do not hit the recursion limit of pickle
+        return _recompose, tuple(self.__flatten__())
+
+    def __flatten__(self) -> list['Functor']:
+        # Walk the binary tree iteratively so long chains do not hit the recursion limit
+        stages, stack = [], [self]
+        while stack:
+            node = stack.pop()
+            if isinstance(node, CompositeFunctor):
+                stack.append(node.second)
+                stack.append(node.first)
+            else:
+                stages.extend(node.__flatten__())
+        return stages
+
+
+class CompiledFunctor(Functor):
+    """
+    Linear form of a composed pipeline.
+    The stages are type checked once when the functor is built, then run in a single loop.
+    """
+    def __init__(self, stages: list['Functor']):
+        assert len(stages) > 0, f"{self.__class__.__name__}.__init__({stages}): Expected at least one stage"
+        self.stages = list(stages)
+        for first, second in zip(self.stages, self.stages[1:]):
+            assert first.__codomain__ == second.__domain__, (
+                f"{self.__class__.__name__}.__init__({first.__name__}, {second.__name__}):\n"
+                f"Type Mismatch: Expected {first.__codomain__}, got {second.__domain__}")
+        self.__name__ = ".".join(stage.__name__ for stage in self.stages)
+        domain, codomain = self.stages[0].__domain__, self.stages[-1].__codomain__
+        self.__domain__, self.__codomain__ = domain, codomain
+        self.__check__ = _runtime_type(domain)
+        self.__async__ = any(stage.__async__ for stage in self.stages)
+        # Bind the stage methods once, the loop below only calls them
+        stages = tuple(self.stages)
+        execs = tuple(stage.__exec__ for stage in stages)
+
+        def __exec__(value: T) -> S:
+            if PROFILER is not None:
+                return PROFILER.run(stages, value)
+            for stage in execs:
+                value = stage(value)
+            return value
+        __exec__.__annotations__ = {"value": domain, "return": codomain}
+        self.__exec__ = __exec__
+
+    def __call__(self, value: 'Monad[T]') -> 'Monad[S]':
+        assert isinstance(value, Monad), f"{self.__class__.__name__}.__call__({value}):" \
+                                         f"Expected Monad, got {type(value)}"
+        # Nested monads are unwrapped by Monad.__exec__, which calls back on the innermost one
+        if isinstance(value.__value__, Monad):
+            return value.__exec__(self)
+        return super().__call__(value)
+
+    def __flatten__(self) -> list['Functor']:
+        return list(self.stages)
+
+    def __reduce__(self):
+        # The stage loop is rebuilt from the stages, e.g. when the pipeline is sent to a worker process
+        return self.__class__, (self.stages,)
+
+    def compile(self) -> 'CompiledFunctor':
+        return self
+
+
+_MISSING = object()
+
+
+def _members(cls: type) -> dict:
+    """Members of a decorated class, without the __dict__/__weakref__ descriptors bound to the original class."""
+    return {name: member for name, member in cls.__dict__.items() if name not in ("__dict__", "__weakref__")}
+
+
+# Decorator to dynamically create functor classes
+def functor(cls: type | Callable[[T], R]):
+    match cls:
+        case _ if isinstance(cls, type):
+            return type(cls.__name__, (Functor,), _members(cls) | {"__name__": cls.__name__})
+        case _ if callable(cls):
+            # The functor class of a function is built once and kept on the function
+            functor_class = getattr(cls, "__functor__", None)
+            if functor_class is None:
+                members = {"__exec__": staticmethod(cls), "__name__": cls.__name__, "__wrapped__": cls,
+                           "__module__": cls.__module__, "__qualname__": cls.__qualname__}
+                functor_class = type(cls.__name__, (Functor,), members)
+                try:
+                    cls.__functor__ = functor_class
+                except AttributeError:
+                    # Builtins and bound methods do not take attributes
+                    pass
+            return functor_class()
+    """ Class decorator that dynamically creates a new class inheriting from Functor."""
+    return type(cls.__name__, (Functor,), _members(cls) | {"__name__": cls.__name__})
+
+def staticfunctor(cls):
+    """
+    Class decorator that dynamically creates a new class inheriting from Functor and the target class.
+    """
+    return type(cls.__name__, (Functor,), _members(cls) | {"__name__": cls.__name__})()
+
+# Cast functor classes by (domain, target), built once and instantiated for each composition
+_CASTS: dict[tuple[Any, type], type] = {}
+
+
+def _cast_type(domain: Any, target: type) -> Functor:
+    """Functor casting values of the domain type to the target type, as built by `functor >> int`."""
+    cls = _CASTS.get((domain, target))
+    if cls is None:
+        def cast_type(value: domain) -> target:
+            return target(value)
+        members = {"__exec__": staticmethod(cast_type), "__name__": target.__name__, "__cast__": (domain, target),
+                   "__pure__": True, "__module__": __name__, "__qualname__": cast_type.__qualname__}
+        cls = _CASTS[domain, target] = type(target.__name__, (Functor,), members)
+    return cls()
+
+
+def _recompose(*stages: Functor) -> 'CompositeFunctor':
+    """Compose the stages back into a CompositeFunctor, used when unpickling one."""
+    composite = stages[0]
+    for stage in stages[1:]:
+        composite = CompositeFunctor(composite, stage)
+    return composite
+
+
+def _global(module: str, qualname: str) -> Any:
+    """Object bound to a qualified name in an imported module, None when there is none."""
+    value = sys.modules.get(module)
+    for name in qualname.split("."):
+        value = getattr(value, name, None)
+    return value
+
+
+def _exec_stack(monad: Monad, func: Callable) -> Monad:
+    """
+    Apply func to the innermost of nested monads, e.g. Monad(MonadWithLogs(Monad(5))), in a single loop.
+    The stack is unwrapped once for the whole pipeline. For each stage, the layers keeping a history snapshot
+    their value first, outermost first, and the layers with an __after__ hook run it last, innermost first,
+    as the recursive calls of Monad.__exec__ would. Layers without history nor hook cost nothing per stage.
+    """
+    layers = []
+    # Monads with their own __exec__, such as BatchMonad, run the stages themselves
+    while isinstance(monad.__value__, Monad) and type(monad).__exec__ is Monad.__exec__:
+        layers.append(monad)
+        monad = monad.__value__
+    outer = layers[0] if layers else monad
+    if TRACING:
+        _trace("%s.__exec__(%s): %d nested layers", outer.__class__.__name__, func.__name__, len(layers))
+    parent = layers[-1] if layers else None
+    hooked = [layer for layer in layers if layer.__strategy__ is not None or layer.__after__ is not None]
+    stages = func.__flatten__() if isinstance(func, CompositeFunctor) else (func,)
+    for stage in stages:
+        for layer in hooked:
+            if layer.__strategy__ is not None:
+                layer.__pre__.append(layer.__snapshot__(stage))
+        result = monad.__exec__(stage)
+        if result is not monad and parent is not None:
+            parent.__value__ = monad = result
+        for layer in reversed(hooked):
+            if layer.__after__ is not None:
+                layer.__after__(stage)
+    return outer if layers else result
+
+
+# Dispatch of Monad.__or__ and Functor.__compose__, resolved once per type of right-hand operand.
+# Monad.__or__ applies "functor" operands to the monad and calls "cast" operands on its value,
+# "class" operands are resolved once per class.
+_PIPES: dict[type, str] = {}
+_CLASS_PIPES: dict[type, str] = {}
+_COMPOSES: dict[type, Callable[[Functor, Any], Functor]] = {}
+
+
+def _pipe_kind(kind: type) -> str:
+    """Resolve how Monad.__or__ handles right-hand operands of type kind."""
+    if issubclass(kind, Functor):
+        pipe = "functor"
+    elif issubclass(kind, type):
+        pipe = "class"
+    else:
+        pipe = "cast"
+    _PIPES[kind] = pipe
+    return pipe
+
+
+def _class_pipe_kind(cls: type) -> str:
+    pipe = _CLASS_PIPES[cls] = "functor" if issubclass(cls, Functor) else "cast"
+    return pipe
+
+
+def _pipe_nested(monad: Monad, cast: Callable):
+    """Call cast on the value of the innermost of nested monads."""
+    while True:
+        # Monads overriding | handle it themselves
+        if type(monad).__or__ is not Monad.__or__:
+            return monad | cast
+        value = monad.__value__
+        if not isinstance(value, Monad):
+            return cast(value)
+        monad = value
+
+
+def _compose_functor(first: Functor, second: Functor) -> 'CompositeFunctor':
+    return CompositeFunctor(first, second)
+
+
+def _compose_cast(first: Functor, second: type) -> 'CompositeFunctor':
+    return CompositeFunctor(first, _cast_type(first.__codomain__, second))
+
+
+def _compose_callable(first: Functor, second: Callable) -> 'CompositeFunctor':
+    name = getattr(second, "__name__", type(second).__name__)
+    assert hasattr(second, "__annotations__"), (
+        f"{first.__name__}.__compose__({name}):\n"
+        f"    Cannot include {name} in pipeline: Missing type annotations."
+    )
+    if TRACING:
+        _trace("%s.__compose__(%s): Casting function to Functor", first.__name__, second.__name__)
+    return CompositeFunctor(first, functor(second))
+
+
+def _compose_handler(kind: type) -> Callable[[Functor, Any], Functor]:
+    """Resolve how Functor.__compose__ handles right-hand operands of type kind."""
+    if issubclass(kind, Functor):
+        handler = _compose_functor
+    elif issubclass(kind, type):
+        handler = _compose_cast
+    elif callable(getattr(kind, "__call__", None)):
+        handler = _compose_callable
+    else:
+        handler = _compose_functor
+    _COMPOSES[kind] = handler
+    return handler
+
+
+def _validate_sample(func: 'Functor', sample, container: str) -> bool:
+    """Check one value taken from a batch or stream against the input type of func."""
+    check = func.__check__
+    if check is None or func.__validation__ == "never":
+        return True
+    # NumPy scalars are checked as the Python value they hold
+    if getattr(sample, "ndim", None) == 0:
+        sample = sample.item()
+    assert isinstance(sample, check), \
+        f"Type Mismatch: Expected {getattr(func.__domain__, '__name__', func.__domain__)}, " \
+        f"got {type(sample).__name__} in {container}"
+    return True
@@ -0,0 +1,347 @@
+"""Branching pipelines: fan-out to several branches, joined or merged back, see DAG."""
+import copy
+import functools
+import weakref
+from typing import Any, Callable
+
+from . import core
+from .cache import _params
+from .core import Functor, IMMUTABLE_TYPES, _cast_type, _empty, _signature, functor
+
+
+class JoinFunctor(Functor):
+    """
+    Functor calling a function of n arguments on the n results of the branches of a fan, e.g. for
+        def ratio(total: float, count: int) -> float
+    the input is a tuple[float, int], and each branch is type checked against its argument.
+    """
+    def __init__(self, func: Callable[..., Any]):
+        annotations = dict(getattr(func, "__annotations__", {}))
+        codomain = annotations.pop("return", _empty)
+        self.func = func
+        self.__name__ = getattr(func, "__name__", type(func).__name__)
+        self.__domains__ = tuple(annotations.values())
+        self.__domain__, self.__codomain__ = tuple[self.__domains__], codomain
+        self.__check__ = tuple
+
+    def __inputs__(self, count: int) -> tuple:
+        """Input types of the branches joined by this functor."""
+        assert count == len(self.__domains__), f"{self.__class__.__name__}({self.__name__}).__inputs__({count}): \n" \
+                                               f"    Expected {len(self.__domains__)} branches"
+        return self.__domains__
+
+    def __exec__(self, values: tuple) -> Any:
+        return self.func(*values)
+
+
+class MergeFunctor(JoinFunctor):
+    """
+    Functor reducing the results of any number of branches of the same type with a binary function, e.g.
+        def add(x: int, y: int) -> int
+    """
+    def __init__(self, func: Callable[[Any, Any], Any]):
+        super().__init__(func)
+        assert len(self.__domains__) == 2 and self.__domains__[0] == self.__domains__[1] == self.__codomain__, \
+            f"{self.__class__.__name__}({self.__name__}): \n" \
+            f"    Expected a function of two arguments of the type it returns, got {self.__domains__} -> {self.__codomain__}"
+
+    def __inputs__(self, count: int) -> tuple:
+        assert count >= 2, f"{self.__class__.__name__}({self.__name__}).__inputs__({count}): " \
+                           f"Expected at least two branches"
+        return (self.__codomain__,) * count
+
+    def __exec__(self, values: tuple) -> Any:
+        return functools.reduce(self.func, values)
+
+
+def join(func: Callable[..., Any]) -> JoinFunctor:
+    return func if isinstance(func, JoinFunctor) else JoinFunctor(func)
+
+
+def merge(func: Callable[[Any, Any], Any]) -> MergeFunctor:
+    return func if isinstance(func, MergeFunctor) else MergeFunctor(func)
+
+
+def _stage(stage: Any, domain: Any) -> Functor:
+    """Functor of a stage given to Node >>: functors as they are, types become casts and functions functors."""
+    if isinstance(stage, Functor):
+        return stage
+    if isinstance(stage, type):
+        return _cast_type(domain, stage)
+    assert hasattr(stage, "__annotations__"), f"Node.__rshift__({stage}): \n" \
+                                              f"    Cannot include {stage} in pipeline: Missing type annotations."
+    return functor(stage)
+
+
+def _key(stage: Functor) -> Any:
+    """
+    Structural key of a stage: stages of the same class with the same parameters compute the same values.
+    Parameters are compared with their types, Scale(1), Scale(1.0) and Scale(True) are different stages.
+    """
+    if "__exec__" in vars(stage):
+        return stage
+    key = (type(stage), _params(stage))
+    try:
+        hash(key)
+    except TypeError:
+        # Unhashable parameters, only the stage itself is shared
+        return stage
+    return key
+
+
+class Node:
+    """Value computed by a stage of a DAG from the values of its parent nodes."""
+    __slots__ = ("dag", "stage", "parents", "index", "__name__", "__codomain__")
+
+    def __init__(self, dag: 'DAG', stage: Functor | None, parents: tuple['Node', ...], index: int, codomain: Any):
+        self.dag = dag
+        self.stage = stage
+        self.parents = parents
+        self.index = index
+        self.__name__ = "input" if stage is None else stage.__name__
+        self.__codomain__ = codomain
+
+    def __rshift__(self, other: Functor | Callable | type) -> 'Node':
+        """Apply a functor, pipeline, cast or function to the value of this node, one node per stage."""
+        node = self
+        stages = other.__flatten__() if isinstance(other, Functor) else [other]
+        for stage in stages:
+            node = self.dag.node(_stage(stage, node.__codomain__), node)
+        return node
+
+    def fan(self, *branches: Functor | Callable | type) -> tuple['Node', ...]:
+        """Apply each branch to the value of this node."""
+        return tuple(self >> branch for branch in branches)
+
+    def __repr__(self):
+        return f"Node({self.index}, {self.__name__}, {self.__codomain__})"
+
+
+class DAG:
+    """
+    Builder of a branching pipeline from existing functors. Nodes are chained with >>, fanned out with Node.fan,
+    and brought back together with join (a function of one argument per branch) or merge (a binary reduction):
+
+        dag = DAG(int)
+        base = dag.input >> Add(3)
+        total = dag.join(ratio, base >> Sum(), base >> Count())
+        pipeline = dag.build(total)
+        Monad(5) | pipeline
+
+    Each edge is type checked as in >>. Nodes applying the same stage (same class, same parameters) to the same
+    parents are only created once, so shared sub-pipelines are computed once per input.
+    """
+    def __init__(self, domain: Any, dedup: bool = True):
+        """
+        :param domain: Type of the input of the pipeline.
+        :param dedup: Share the nodes computing the same stage from the same parents.
+        """
+        self.dedup = dedup
+        self.nodes: dict[Any, Node] = {}
+        self.count = 1
+        self.input = Node(self, None, (), 0, domain)
+
+    def node(self, stage: Functor, *parents: Node) -> Node:
+        """Node applying stage to the value of its parent, or to the tuple of values of its parents."""
+        assert not stage.__async__, f"{self.__class__.__name__}.node({stage.__name__}): \n" \
+                                    f"    Asynchronous functors must be awaited, use AsyncMonad"
+        if len(parents) == 1:
+            domains = (stage.__domain__,)
+        else:
+            assert isinstance(stage, JoinFunctor), f"{self.__class__.__name__}.node({stage.__name__}): \n" \
+                                                   f"    Several parents are joined with join or merge"
+            domains = stage.__inputs__(len(parents))
+        for parent, domain in zip(parents, domains):
+            assert parent.dag is self, f"{self.__class__.__name__}.node({stage.__name__}): \n" \
+                                       f"    {parent} belongs to another DAG"
+            assert parent.__codomain__ == domain, (f"{self.__class__.__name__}.node({parent.__name__}, {stage.__name__}):\n"
+                                                   f"Type Mismatch: Expected {parent.__codomain__}, got {domain}")
+        key = (_key(stage), tuple(parent.index for parent in parents)) if self.dedup else None
+        node = self.nodes.get(key) if key is not None else None
+        if node is None:
+            node = Node(self, stage, parents, self.count, stage.__codomain__)
+            self.count += 1
+            if key is not None:
+                self.nodes[key] = node
+        elif core.TRACING:
+            core._trace("%s.node(%s): shared with node %d", self.__class__.__name__, stage.__name__, node.index)
+        return node
+
+    def join(self, func: Callable[..., Any], *nodes: Node) -> Node:
+        return self.node(join(func), *nodes)
+
+    def __getstate__(self):
+        # The keys of the shared nodes hold the types of the stage parameters, which may not pickle (e.g. functions).
+        # Nodes added after unpickling are not shared with the existing ones
+        return {**vars(self), "nodes": {}}
+
+    def merge(self, func: Callable[[Any, Any], Any], *nodes: Node) -> Node:
+        return self.node(merge(func), *nodes)
+
+    def build(self, *outputs: Node, executor: Any = None, workers: int = None) -> 'DAGFunctor':
+        """
+        Functor running the nodes needed by the outputs.
+        :param executor: None to run the nodes in order, "thread" or a concurrent.futures.Executor to run
+                         independent branches concurrently.
+        :param workers: Number of threads of the pool created for executor="thread".
+        :return: A functor returning the value of the output, or the tuple of values of several outputs.
+        """
+        return DAGFunctor(outputs, executor, workers)
+
+
+class DAGFunctor(Functor):
+    """
+    Functor running a DAG. The nodes run in creation order, or by linear segments on a thread pool.
+    A value consumed by several nodes is copied for the consumers that are not pure, unless it is immutable,
+    so that a stage mutating its input does not change the input of the other branches.
+    With executor="thread" the functor owns the pool it creates on its first run, and shuts it down on close(),
+    on leaving a with block, or when it is garbage collected. An Executor passed in stays owned by the caller:
+        with fan(Fetch("a"), Fetch("b"), into=merge(add), executor="thread") as fetch:
+            results = [fetch(url) for url in urls]
+    """
+    def __init__(self, outputs: tuple[Node, ...], executor: Any = None, workers: int = None):
+        assert outputs, f"{self.__class__.__name__}.__init__(): Expected at least one output node"
+        assert executor is None or executor == "thread" or hasattr(executor, "submit"), \
+            f"{self.__class__.__name__}.__init__({executor!r}): Expected None, 'thread' or an Executor"
+        self.outputs = tuple(outputs)
+        self.executor = executor
+        self.workers = workers
+        self.pool = None
+        # Nodes needed by the outputs, parents always come before their children
+        needed, stack = {}, list(outputs)
+        while stack:
+            node = stack.pop()
+            if node.index not in needed:
+                needed[node.index] = node
+                stack.extend(node.parents)
+        self.nodes = [needed[index] for index in sorted(needed)]
+        self.input = self.nodes[0]
+        assert self.input.stage is None, f"{self.__class__.__name__}.__init__(): The outputs do not depend on the input"
+        position = {node.index: index for index, node in enumerate(self.nodes)}
+        consumers = [0] * len(self.nodes)
+        for node in self.nodes:
+            for parent in node.parents:
+                consumers[position[parent.index]] += 1
+        # (position, stage, parent positions, whether the input is copied) of each node after the input
+        self.steps = [(position[node.index], node.stage, tuple(position[parent.index] for parent in node.parents),
+                       not node.stage.__pure__ and any(consumers[position[parent.index]] > 1 for parent in node.parents))
+                      for node in self.nodes[1:]]
+        self.results = tuple(position[node.index] for node in self.outputs)
+        # Linear segments: a node continues the segment of its parent when it is its only parent and only consumer
+        segments, segment_of = [], {0: None}
+        for step in self.steps:
+            index, _, parents, _ = step
+            if len(parents) == 1 and parents[0] != 0 and consumers[parents[0]] == 1:
+                segment_of[index] = segment_of[parents[0]]
+                segments[segment_of[index]].append(step)
+            else:
+                segment_of[index] = len(segments)
+                segments.append([step])
+        self.segments = segments
+        self.depends = [{segment_of[parent] for parent in segment[0][2]} - {None} for segment in segments]
+
+        self.__name__ = f"DAG({', '.join(node.__name__ for node in self.outputs)})"
+        self.__domain__ = self.input.__codomain__
+        self.__codomain__ = outputs[0].__codomain__ if len(outputs) == 1 \
+            else tuple[tuple(node.__codomain__ for node in outputs)]
+        self.__check__ = core._runtime_type(self.__domain__)
+
+    def __exec__(self, value: Any) -> Any:
+        values = [None] * len(self.nodes)
+        values[0] = value
+        if self.executor is None:
+            for step in self.steps:
+                self.__step__(step, values)
+        else:
+            self.__run_concurrently__(values)
+        if len(self.results) == 1:
+            return values[self.results[0]]
+        return tuple(values[index] for index in self.results)
+
+    @staticmethod
+    def __step__(step: tuple, values: list):
+        index, stage, parents, copies = step
+        if len(parents) == 1:
+            value = values[parents[0]]
+            if copies and type(value) not in IMMUTABLE_TYPES:
+                value = copy.copy(value)
+        else:
+            value = tuple(copy.copy(values[parent]) if copies and type(values[parent]) not in IMMUTABLE_TYPES
+                          else values[parent] for parent in parents)
+        if core.PROFILER is not None:
+            values[index] = core.PROFILER.record(stage.__name__, stage.__exec__, value)
+        else:
+            values[index] = stage.__exec__(value)
+
+    def __run_concurrently__(self, values: list):
+        """Run the segments on the pool, each one as soon as the segments it depends on are done."""
+        # concurrent.futures is only needed here, keep it out of the import of the module
+        from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+        pool = self.executor
+        if pool == "thread":
+            if self.pool is None:
+                self.pool = ThreadPoolExecutor(max_workers=self.workers)
+                # Shut down with the functor when it is not closed, the idle threads would otherwise outlive it
+                weakref.finalize(self, self.pool.shutdown, wait=False)
+            pool = self.pool
+        waiting = [len(depends) for depends in self.depends]
+        children = [[] for _ in self.segments]
+        for index, depends in enumerate(self.depends):
+            for parent in depends:
+                children[parent].append(index)
+
+        def run(segment: list):
+            for step in segment:
+                self.__step__(step, values)
+
+        pending = {pool.submit(run, segment): index for index, segment in enumerate(self.segments)
+                   if not waiting[index]}
+        try:
+            while pending:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    index = pending.pop(future)
+                    future.result()
+                    for child in children[index]:
+                        waiting[child] -= 1
+                        if not waiting[child]:
+                            pending[pool.submit(run, self.segments[child])] = child
+        finally:
+            for future in pending:
+                future.cancel()
+
+    def close(self):
+        """Shut down the thread pool created for executor="thread", a later run creates a new one."""
+        if self.pool is not None:
+            self.pool.shutdown()
+            self.pool = None
+
+    def __enter__(self) -> 'DAGFunctor':
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def __reduce__(self):
+        # The pool is not shipped along, e.g. to worker processes
+        return self.__class__, (self.outputs, None if self.executor != "thread" else "thread", self.workers)
+
+
+def fan(*branches: Functor | Callable | type, into: Callable[..., Any] = None, executor: Any = None,
+        workers: int = None) -> DAGFunctor:
+    """
+    Functor applying each branch to its input, usable in >> pipelines:
+        Add(1) >> fan(Add(3) >> Multiply(2), Add(3) >> Add(1), into=merge(add)) >> float
+    The common prefixes of the branches are computed once.
+    :param into: JoinFunctor, MergeFunctor or function of one argument per branch combining the results of the
+                 branches. Without it, the functor returns the tuple of their results.
+    :param executor: None, "thread" or a concurrent.futures.Executor, see DAG.build.
+    """
+    assert branches, "fan(): Expected at least one branch"
+    first = branches[0]
+    domain = first.__domain__ if isinstance(first, Functor) else _signature(first)[0]
+    dag = DAG(domain)
+    outputs = dag.input.fan(*branches)
+    if into is not None:
+        outputs = (dag.node(into if isinstance(into, JoinFunctor) else join(into), *outputs),)
+    return dag.build(*outputs, executor=executor, workers=workers)
@@ -0,0 +1,82 @@
+"""Example functors, also used by the tests and benchmarks."""
+from .core import functor, staticfunctor
+from .optimize import register_fusion
+
+
+@functor
+class Add:
+    __pure__ = True
+
+    def __init__(self, y: int):
+        self.y = y
+
+    def __exec__(self, x: int) -> int:
+        return x + self.y
+
+@functor
+class Multiply:
+    __pure__ = True
+
+    def __init__(self, factor: int):
+        self.factor = factor
+
+    def __exec__(self, x: int) -> int:
+        return x * self.factor
+
+
+register_fusion(Add, Add, lambda first, second: Add(first.y + second.y))
+register_fusion(Multiply, Multiply, lambda first, second: Multiply(first.factor * second.factor))
+
+@staticfunctor
+class AddOne:
+    __pure__ = True
+
+    # def __new__(cls, *args):
+    #    # Create and return a Monad instance instead of an AddOne instance
+    #    return cls.__exec__(*args)
+
+    @staticmethod
+    def __exec__(x: int) -> int:
+        return x + 1
+
+
+def to_string(value: float) -> str:
+    return str(value)
+
+def to_float(value: str) -> float:
+    return float(value)
+
+
+# str(value) is the shortest repr of a float, which float() parses back to the same value
+register_fusion(to_string, to_float, lambda first, second: [])
+
+
+# Usage demonstration, run with python -m pyrofunc.examples
+if __name__ == "__main__":
+    import logging
+    from .core import Monad, set_tracing
+    from .logs import MonadWithLogs, extract_logs
+
+    logging.basicConfig(level=logging.DEBUG)
+    set_tracing(True)
+    to_string = functor(to_string)
+
+
+    monad = Monad(MonadWithLogs(MonadWithLogs(Monad(5))))
+    print("Monad: ", monad)
+    #Monad(5) | Add(3) >> Multiply(20) >> float >> to_string >> to_float | print # | extract_logs
+    # Using Monad in the pipeline
+    monad >>= Add(3) >> Multiply(20) >> float >> to_string >> to_float >> int >> Add(5)
+    print("Monad using >>=: ", monad)
+    result = Monad(5) | Add(3) >> Multiply(20)
+    print(f"Result 1: {result}")
+    composite = Add(3) >> Multiply(25)
+    #print(result)  # Output: 160.0
+    # Using Monad with instantiated functors
+    result = Monad(5) | composite >> Add(3) >> AddOne >> Multiply(2) | float
+    print(f"Result 2: {result}", flush=True)  # Output: 160.0
+    # Let's kick it up a notch
+    # We will now run with logs
+    result = MonadWithLogs(5) | composite >> Add(3) >> AddOne >> Multiply(2)
+    print(f"Result log: {extract_logs(result)}")
+    print(f"Result 3: {result}")
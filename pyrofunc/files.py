@@ -0,0 +1,264 @@
+"""
+Memory-mapped file sources and incremental file sinks for Stream.
+A source is an iterable with a __chunks__(chunksize) method, which Stream uses to hand whole chunks (lists of lines
+or records, slices of a NumPy array) to the stages. A sink consumes the chunks of a stream as they are produced:
+    Stream(LineSource("in.txt", encoding="utf-8"), chunksize=4096) | Parse() >> Score() | LineSink("out.txt")
+Only the chunks in flight are held in memory, whatever the size of the files.
+"""
+import functools
+import itertools
+import mmap
+import os
+import struct
+from typing import Iterable, Iterator
+
+# Number of bytes of a line file decoded at once
+BLOCKSIZE = 1 << 16
+# Largest number of rows an NpySink reserves room for in its header
+MAX_ROWS = 2 ** 63 - 1
+
+
+class _Mapped:
+    """File mapped read-only in memory, for as long as a source iterates over it."""
+    def __init__(self, path: str | os.PathLike):
+        self.path = os.fspath(path)
+
+    def __iter__(self) -> Iterator:
+        for chunk in self.__chunks__(1024):
+            yield from chunk
+
+    def __repr__(self):
+        return f"{self.__class__.__name__}({self.path!r})"
+
+    def __map__(self) -> mmap.mmap | None:
+        with open(self.path, "rb") as file:
+            if os.fstat(file.fileno()).st_size == 0:
+                # Empty files cannot be mapped
+                return None
+            return mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+
+    @staticmethod
+    def __unmap__(mapped: mmap.mmap | None):
+        if mapped is None:
+            return
+        try:
+            mapped.close()
+        except BufferError:
+            # Records still referenced by the consumer keep the mapping open, it is released with them
+            pass
+
+
+class LineSource(_Mapped):
+    """Lines of a text file, without their line ending, as bytes or decoded to str with an encoding."""
+    def __init__(self, path: str | os.PathLike, encoding: str = None, blocksize: int = BLOCKSIZE):
+        assert blocksize >= 1, f"{self.__class__.__name__}.__init__({path}, {blocksize}): \n" \
+                               f"    Expected a positive block size"
+        super().__init__(path)
+        self.encoding = encoding
+        self.blocksize = blocksize
+
+    def __blocks__(self) -> Iterator[list]:
+        """Lines of the file as bytes, split one block of whole lines at a time."""
+        mapped = self.__map__()
+        try:
+            position, size = 0, len(mapped) if mapped is not None else 0
+            while position < size:
+                end = mapped.find(b"\n", position + self.blocksize)
+                end = size if end < 0 else end + 1
+                yield mapped[position:end].splitlines()
+                position = end
+        finally:
+            self.__unmap__(mapped)
+
+    def __chunks__(self, chunksize: int) -> Iterator[list]:
+        lines = itertools.chain.from_iterable(self.__blocks__())
+        if self.encoding is not None:
+            lines = map(functools.partial(bytes.decode, encoding=self.encoding), lines)
+        while chunk := list(itertools.islice(lines, chunksize)):
+            yield chunk
+
+
+class RecordSource(_Mapped):
+    """
+    Fixed-width binary records of a file, as memoryview slices of the mapped file, or as the tuples unpacked with
+    a struct format. The file must hold a whole number of records.
+    """
+    def __init__(self, path: str | os.PathLike, size: int = None, format: str = None):
+        """
+        :param size: Number of bytes of a record, given by the format when there is one.
+        :param format: struct format of a record, e.g. "<if" for a little-endian int and float.
+        """
+        assert (size is None) != (format is None), f"{self.__class__.__name__}.__init__({path}, {size}, {format}): \n" \
+                                                   f"    Expected a record size or a struct format"
+        super().__init__(path)
+        self.format = struct.Struct(format) if format is not None else None
+        self.size = self.format.size if format is not None else size
+        assert self.size >= 1, f"{self.__class__.__name__}.__init__({path}, {size}): \n" \
+                               f"    Expected a positive record size"
+
+    def __len__(self) -> int:
+        return os.path.getsize(self.path) // self.size
+
+    def __chunks__(self, chunksize: int) -> Iterator[list]:
+        mapped = self.__map__()
+        if mapped is None:
+            return
+        view = memoryview(mapped)
+        try:
+            size = len(view)
+            assert size % self.size == 0, f"{self.__class__.__name__}.__chunks__({self.path}): \n" \
+                                          f"    {size} bytes is not a whole number of {self.size} byte records"
+            step = chunksize * self.size
+            for start in range(0, size, step):
+                block = view[start:start + step]
+                if self.format is not None:
+                    yield list(self.format.iter_unpack(block))
+                else:
+                    yield [block[offset:offset + self.size] for offset in range(0, len(block), self.size)]
+                block.release()
+        finally:
+            view.release()
+            self.__unmap__(mapped)
+
+
+class NpySource:
+    """Rows of a NumPy .npy file, in chunks that are slices of the memory-mapped array."""
+    def __init__(self, path: str | os.PathLike):
+        self.path = os.fspath(path)
+
+    def __repr__(self):
+        return f"{self.__class__.__name__}({self.path!r})"
+
+    def load(self):
+        """The array of the file, mapped read-only."""
+        # NumPy is only needed by the .npy files
+        import numpy
+        return numpy.load(self.path, mmap_mode="r")
+
+    def __len__(self) -> int:
+        return len(self.load())
+
+    def __iter__(self) -> Iterator:
+        for chunk in self.__chunks__(1024):
+            yield from chunk
+
+    def __chunks__(self, chunksize: int) -> Iterator:
+        array = self.load()
+        for start in range(0, len(array), chunksize):
+            yield array[start:start + chunksize]
+
+
+class _Sink:
+    """Writes the chunks of a stream to a file as they come. Calling it writes any iterable."""
+    def __init__(self, path: str | os.PathLike, chunksize: int = 1024):
+        self.path = os.fspath(path)
+        self.chunksize = chunksize
+        self.written = 0
+
+    def __repr__(self):
+        return f"{self.__class__.__name__}({self.path!r})"
+
+    def __call__(self, values: Iterable) -> int:
+        """
+        Write the values to the file, replacing it.
+        :return: The number of values written.
+        """
+        source = iter(values)
+        return self.__consume__(iter(lambda: list(itertools.islice(source, self.chunksize)), []))
+
+    def __consume__(self, chunks: Iterable) -> int:
+        self.written = 0
+        with open(self.path, "wb") as file:
+            self.__open__(file)
+            for chunk in chunks:
+                self.__write__(file, chunk)
+                self.written += len(chunk)
+            self.__close__(file)
+        return self.written
+
+    def __open__(self, file):
+        pass
+
+    def __write__(self, file, chunk):
+        raise NotImplementedError
+
+    def __close__(self, file):
+        pass
+
+
+class LineSink(_Sink):
+    """
+    Writes each value on its own line, bytes-like values as they are and other values as their str.
+    The values of a chunk are all of the same kind, as produced by the same pipeline.
+    """
+    def __init__(self, path: str | os.PathLike, encoding: str = "utf-8", chunksize: int = 1024):
+        super().__init__(path, chunksize)
+        self.encoding = encoding
+
+    def __write__(self, file, chunk):
+        if len(chunk) == 0:
+            return
+        if isinstance(chunk[0], (bytes, bytearray, memoryview)):
+            file.write(b"\n".join(chunk) + b"\n")
+        else:
+            file.write(("\n".join(map(str, chunk)) + "\n").encode(self.encoding))
+
+
+class RecordSink(_Sink):
+    """Writes fixed-width binary records: bytes-like values as they are, or tuples packed with a struct format."""
+    def __init__(self, path: str | os.PathLike, format: str = None, chunksize: int = 1024):
+        super().__init__(path, chunksize)
+        self.format = struct.Struct(format) if format is not None else None
+
+    def __write__(self, file, chunk):
+        if self.format is not None:
+            file.write(b"".join(self.format.pack(*record) for record in chunk))
+        else:
+            file.writelines(chunk)
+
+
+class NpySink(_Sink):
+    """
+    Writes the values as the rows of a NumPy .npy file. The header reserves room for any number of rows,
+    and is rewritten with the final shape once the stream is exhausted.
+    """
+    def __init__(self, path: str | os.PathLike, dtype=None, chunksize: int = 1024):
+        """
+        :param dtype: Type of the array, defaults to the type of the first chunk.
+        """
+        super().__init__(path, chunksize)
+        self.dtype = dtype
+        self.header = None
+
+    def __header__(self, rows: int, size: int = None) -> bytes:
+        from numpy.lib import format
+        header = repr({"descr": format.dtype_to_descr(self.header[0]), "fortran_order": False,
+                       "shape": (rows, *self.header[1])})
+        magic = format.magic(1, 0)
+        # Padded to a multiple of 64 bytes, so that the data is aligned
+        size = size or -(-(len(magic) + 2 + len(header) + 1) // 64) * 64
+        header = header.ljust(size - len(magic) - 2 - 1) + "\n"
+        return magic + struct.pack("<H", len(header)) + header.encode("latin1")
+
+    def __open__(self, file):
+        self.header = None
+
+    def __write__(self, file, chunk):
+        import numpy
+        array = numpy.ascontiguousarray(chunk, dtype=self.dtype if self.header is None else self.header[0])
+        if self.header is None:
+            self.header = (array.dtype, array.shape[1:])
+            # Room for the widest row count, the header is rewritten in place at the end
+            file.write(self.__header__(MAX_ROWS))
+        assert array.shape[1:] == self.header[1], f"{self.__class__.__name__}.__write__({self.path}): \n" \
+                                                  f"    Expected rows of shape {self.header[1]}, got {array.shape[1:]}"
+        file.write(array)
+
+    def __close__(self, file):
+        if self.header is None:
+            import numpy
+            self.header = (numpy.dtype(self.dtype), ())
+            file.write(self.__header__(0))
+            return
+        file.seek(0)
+        file.write(self.__header__(self.written, len(self.__header__(MAX_ROWS))))
@@ -0,0 +1,204 @@
+"""Compilation of pipelines into a single generated Python function, see JITFunctor."""
+import ast
+import builtins
+import copy
+import inspect
+import itertools
+import linecache
+import textwrap
+import types
+from collections import deque
+from typing import Any
+
+from . import core
+from .cache import LRUCache
+from .core import CompiledFunctor, Functor
+from .optimize import FusedFunctor
+
+# Constants of these types are written in the generated source, the others are bound to a name
+LITERAL_TYPES = (int, float, str, bytes, bool, type(None))
+# Nodes of an __exec__ body that are never inlined: they create scopes, suspend, or assign
+_UNSAFE_NODES = (ast.Lambda, ast.ListComp, ast.SetComp, ast.DictComp, ast.GeneratorExp, ast.NamedExpr,
+                 ast.Yield, ast.YieldFrom, ast.Await)
+# Templates of the __exec__ methods by functor class, None for the classes that cannot be inlined
+_TEMPLATES: dict[type, 'Template | None'] = {}
+# Numbers of the generated sources, which tracebacks show as <pyrofunc.jit N>
+_SOURCES = itertools.count()
+# File names of the sources registered in linecache, the oldest are dropped as new ones come
+_FILENAMES = deque()
+# Lines of the generated function before and after the lines of the stages
+_HEADER = ("def pipeline(value):", "    if core.PROFILER is not None:", "        return core.PROFILER.run(stages, value)")
+_FOOTER = "    return value"
+
+
+class Template:
+    """Single returned expression of an __exec__ method, with the names it reads."""
+    def __init__(self, func: types.FunctionType, param: str, owner: str | None, expression: ast.expr):
+        self.globals = func.__globals__
+        self.param = param
+        self.owner = owner
+        self.expression = expression
+        names = {node.id for node in ast.walk(expression) if isinstance(node, ast.Name)}
+        # Attributes of the functor read as self.<attribute>, bound as constants
+        self.attributes = sorted({node.attr for node in ast.walk(expression) if isinstance(node, ast.Attribute)
+                                  and isinstance(node.value, ast.Name) and node.value.id == owner})
+        # Globals of the module of the functor, the other names must be builtins
+        self.names = sorted(names - {param, owner} - (set(dir(builtins)) - set(self.globals)))
+
+
+def _template(cls: type) -> Template | None:
+    if cls not in _TEMPLATES:
+        _TEMPLATES[cls] = _parse(cls)
+    return _TEMPLATES[cls]
+
+
+def _parse(cls: type) -> Template | None:
+    """Template of the __exec__ method of a functor class, None when its body is not a single return."""
+    owner = next(klass for klass in cls.__mro__ if "__exec__" in klass.__dict__)
+    raw = owner.__dict__["__exec__"]
+    static = isinstance(raw, staticmethod)
+    func = raw.__func__ if static else raw
+    # Closures, decorated and asynchronous functions keep state the generated function would not see
+    if not isinstance(func, types.FunctionType) or func.__closure__ or hasattr(func, "__wrapped__") \
+            or func.__defaults__ or func.__kwdefaults__ or cls.__async__:
+        return None
+    code = func.__code__
+    if code.co_argcount != (1 if static else 2) or code.co_kwonlyargcount \
+            or code.co_flags & (inspect.CO_VARARGS | inspect.CO_VARKEYWORDS | inspect.CO_GENERATOR):
+        return None
+    try:
+        tree = ast.parse(textwrap.dedent(inspect.getsource(func)))
+    except (OSError, TypeError, SyntaxError):
+        # Functions defined in an interactive session or by exec have no source
+        return None
+    node = tree.body[0] if tree.body else None
+    if not isinstance(node, ast.FunctionDef) or node.name != func.__name__:
+        return None
+    body = node.body
+    if len(body) > 1 and isinstance(body[0], ast.Expr) and isinstance(body[0].value, ast.Constant):
+        # Skip the docstring
+        body = body[1:]
+    if len(body) != 1 or not isinstance(body[0], ast.Return) or body[0].value is None:
+        return None
+    expression = body[0].value
+    if any(isinstance(child, _UNSAFE_NODES) for child in ast.walk(expression)):
+        return None
+    names = [arg.arg for arg in node.args.args]
+    owner, param = (None, names[0]) if static else names
+    if owner is not None:
+        # self may only be used to read its attributes
+        reads = sum(1 for child in ast.walk(expression) if isinstance(child, ast.Attribute)
+                    and isinstance(child.value, ast.Name) and child.value.id == owner)
+        uses = sum(1 for child in ast.walk(expression) if isinstance(child, ast.Name) and child.id == owner)
+        if reads != uses:
+            return None
+    return Template(func, param, owner, expression)
+
+
+class _Inline(ast.NodeTransformer):
+    """Rewrite a template expression for one stage: the input becomes `value`, globals and constants are renamed."""
+    def __init__(self, template: Template, renames: dict[str, str], constants: dict[str, ast.expr]):
+        self.template = template
+        self.renames = renames
+        self.constants = constants
+
+    def visit_Name(self, node: ast.Name) -> ast.expr:
+        if node.id == self.template.param:
+            return ast.Name("value", ast.Load())
+        return ast.Name(self.renames.get(node.id, node.id), ast.Load())
+
+    def visit_Attribute(self, node: ast.Attribute) -> ast.expr:
+        if isinstance(node.value, ast.Name) and node.value.id == self.template.owner:
+            return copy.copy(self.constants[node.attr])
+        return self.generic_visit(node)
+
+
+def _plan(stage: Functor, index: int, namespace: dict[str, Any]) -> tuple[tuple, callable, str]:
+    """
+    Plan the code of one stage.
+    :return: The key of the stage in the code cache, a function writing its line of the generated source without
+             the stage name, and the comment naming the stage on that line.
+    """
+    cast = type(stage).__dict__.get("__cast__")
+    if cast is not None:
+        target = cast[1]
+        name = target.__name__ if getattr(builtins, target.__name__, None) is target else f"t{index}"
+        namespace[name] = target
+        return ("cast", target), lambda: f"    value = {name}(value)", stage.__name__
+    template = _template(type(stage)) if "__exec__" not in vars(stage) else None
+    if template is None or any(attribute not in vars(stage) for attribute in template.attributes) \
+            or any(name not in template.globals for name in template.names):
+        namespace[f"f{index}"] = stage.__exec__
+        return ("call",), lambda: f"    value = f{index}(value)", f"{stage.__name__}, called"
+    renames = {}
+    for name in template.names:
+        renames[name] = f"g{index}_{name}"
+        namespace[renames[name]] = template.globals[name]
+    key, constants = [], {}
+    for attribute in template.attributes:
+        value = getattr(stage, attribute)
+        if type(value) in LITERAL_TYPES and (type(value) is not float or value - value == 0):
+            # Keyed on the type and repr, as True == 1 and 0.0 == -0.0 must not share code
+            constants[attribute] = ast.Constant(value)
+            key.append((type(value), repr(value)))
+        else:
+            name = f"c{index}_{attribute}"
+            namespace[name] = value
+            constants[attribute] = ast.Name(name, ast.Load())
+            key.append(name)
+    if isinstance(template.expression, ast.Name) and template.expression.id == template.param:
+        return ("inline", type(stage), tuple(key)), lambda: "", f"{stage.__name__}, identity"
+
+    def line() -> str:
+        expression = _Inline(template, renames, constants).visit(copy.deepcopy(template.expression))
+        return f"    value = {ast.unparse(expression)}"
+    return ("inline", type(stage), tuple(key)), line, stage.__name__
+
+
+class JITFunctor(CompiledFunctor):
+    """
+    Linear pipeline compiled into a single generated Python function.
+    Stages whose __exec__ is a single return expression, and casts, are inlined into the function,
+    with the attributes of the functor they read (e.g. Add.y) bound as constants. The other stages are called.
+    The globals read by an inlined stage are bound when the pipeline is compiled.
+    The generated source is kept in __source__, and its code is cached by pipeline structure in JITFunctor.__cache__,
+    so compiling a pipeline of the same structure again only binds the stages and names them in its source:
+        print((Add(3) >> Multiply(2) >> float).jit().__source__)
+    """
+    __cache__ = LRUCache(maxsize=256)
+
+    def __init__(self, stages: list['Functor']):
+        # Fused stages of optimize are expanded, so that their stages can be inlined too
+        expanded = []
+        for stage in stages:
+            expanded.extend(stage.stages if isinstance(stage, FusedFunctor) else [stage])
+        super().__init__(expanded)
+        assert not self.__async__, f"{self.__class__.__name__}.__init__({self.__name__}): \n" \
+                                   f"    Asynchronous functors must be awaited, use AsyncMonad"
+        namespace = {"__builtins__": builtins, "core": core, "stages": tuple(self.stages)}
+        planned = [_plan(stage, index, namespace) for index, stage in enumerate(self.stages)]
+        key = tuple(stage_key for stage_key, _, _ in planned)
+        cached = self.__cache__.get(key)
+        if cached is None:
+            # Cached without the stage names, which differ between pipelines of the same structure
+            body = [line() for _, line, _ in planned]
+            module = compile("\n".join([*_HEADER, *body, _FOOTER]) + "\n", "<pyrofunc.jit>", "exec")
+            code = next(const for const in module.co_consts if isinstance(const, types.CodeType))
+            cached = (body, code)
+            self.__cache__.put(key, cached)
+        body, code = cached
+        lines = [f"{line}  # {note}" if line else f"    # {note}" for line, (_, _, note) in zip(body, planned)]
+        self.__source__ = "\n".join([*_HEADER, *lines, _FOOTER]) + "\n"
+        filename = f"<pyrofunc.jit {next(_SOURCES)}>"
+        # Registered so that tracebacks and debuggers show the generated lines, with the names of these stages
+        linecache.cache[filename] = (len(self.__source__), None, self.__source__.splitlines(True), filename)
+        _FILENAMES.append(filename)
+        if len(_FILENAMES) > self.__cache__.maxsize:
+            linecache.cache.pop(_FILENAMES.popleft(), None)
+        code = code.replace(co_filename=filename)
+        __exec__ = types.FunctionType(code, namespace, "pipeline")
+        __exec__.__annotations__ = {"value": self.__domain__, "return": self.__codomain__}
+        self.__exec__ = __exec__
+
+    def jit(self) -> 'JITFunctor':
+        return self
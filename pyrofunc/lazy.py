@@ -0,0 +1,112 @@
+"""Monad recording a plan, run when needed."""
+import copyreg
+
+from . import core
+from .batch import _run_batch
+from .core import CompiledFunctor, Functor, Monad, R, T, _MISSING, _validate_sample
+from .parallel import parallel_map
+
+
+RUN_MODES = ("sync", "batch", "parallel")
+
+
+class LazyMonad(Monad):
+    """
+    Monad recording the functors piped into it as a plan, without running them.
+    The plan is compiled, type checked (and optionally optimized) once, and runs on run() or as soon as the value
+    is read, e.g. by a cast:
+        m = LazyMonad(5) | Add(3) | Multiply(2)
+        m.run()        # 16
+        m.run(7)       # 20, the plan is reused for another input
+    """
+    __slots__ = ("__input__", "__stages__", "__plan__", "__optimize__")
+
+    def __init__(self, value: T, optimize: bool = False, **kwargs):
+        """
+        :param optimize: Build the plan with Functor.optimize rather than Functor.compile.
+        """
+        self.__stages__ = []
+        self.__plan__ = None
+        self.__optimize__ = optimize
+        super().__init__(value, **kwargs)
+
+    @property
+    def __value__(self) -> T:
+        # Reading the value runs the pending stages
+        if self.__stages__:
+            self.run()
+        return self.__input__
+
+    @__value__.setter
+    def __value__(self, value: T):
+        self.__input__ = value
+
+    def __getstate__(self):
+        # The value is kept in __input__, reading the __value__ slot of Monad would run the plan
+        names = [name for name in copyreg._slotnames(type(self)) if name != "__value__" and hasattr(self, name)]
+        return None, {name: getattr(self, name) for name in names}
+
+    def __exec__(self, func: 'Functor[T, R]') -> 'LazyMonad[R]':
+        assert isinstance(func, Functor), f"{self.__class__.__name__}.__exec__({func}):" \
+                                          f"Expected Functor, got {type(func)}"
+        if core.TRACING:
+            core._trace("%s.__exec__(%s)", self.__class__.__name__, func.__name__)
+        self.__stages__.extend(func.__flatten__())
+        self.__plan__ = None
+        return self
+
+    def __or__(self, other):
+        if isinstance(other, Functor):
+            return self.__exec__(other)
+        # Casts read the value, which runs the plan first
+        return super().__or__(other)
+
+    def plan(self) -> 'CompiledFunctor':
+        """
+        The recorded stages as a single compiled functor, built and type checked once.
+        The plan is kept once the value of the monad is computed, to run it on other inputs.
+        """
+        assert self.__stages__ or self.__plan__ is not None, \
+            f"{self.__class__.__name__}.plan(): Nothing to run, pipe functors in first"
+        if self.__plan__ is None:
+            compiled = CompiledFunctor(self.__stages__)
+            self.__plan__ = compiled.optimize() if self.__optimize__ else compiled
+        return self.__plan__
+
+    def run(self, value: T = _MISSING, mode: str = "sync", **options) -> R:
+        """
+        Run the plan.
+        :param value: Input to run the plan on, leaving the monad as it is. Defaults to the value of the monad,
+                      which is then replaced by the result and the recorded stages are cleared, the plan is kept.
+        :param mode: "sync" runs the plan on the value, "batch" on each element of a list of values at once,
+                     and "parallel" on each element with parallel_map, whose options are passed along.
+        :return: The result of the plan.
+        """
+        assert mode in RUN_MODES, f"{self.__class__.__name__}.run({mode!r}): \n" \
+                                  f"    Expected one of {RUN_MODES}"
+        own = value is _MISSING
+        if own and not self.__stages__:
+            return self.__input__
+        plan = self.plan()
+        if own:
+            value = self.__input__
+            if self.__strategy__ is not None:
+                # The snapshot reads the value, which must not run the plan again
+                stages, self.__stages__ = self.__stages__, []
+                self.__pre__.append(self.__snapshot__(plan))
+                self.__stages__ = stages
+        if core.TRACING:
+            core._trace("%s.run(%s, %s)", self.__class__.__name__, plan.__name__, mode)
+        if mode == "sync":
+            _validate_sample(plan, value, type(value).__name__)
+            result = plan.__exec__(value)
+        elif mode == "batch":
+            if len(value) > 0:
+                _validate_sample(plan, value[0], type(value).__name__)
+            result = _run_batch(plan.stages, value)
+        else:
+            result = parallel_map(plan, value, **options)
+        if own:
+            self.__input__ = result
+            self.__stages__ = []
+        return result
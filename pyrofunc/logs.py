@@ -0,0 +1,50 @@
+"""Monad recording a log record per stage."""
+import time
+from collections import deque
+
+from . import core
+from .core import Monad, R, T
+
+
+class LogRecord:
+    """
+    Log entry of one stage. The output value is kept by reference and only formatted when the record is read,
+    so a value mutated in place by a later stage is shown in its latest state.
+    """
+    __slots__ = ("stage", "value", "time")
+
+    def __init__(self, stage: str, value, time: float):
+        self.stage = stage
+        self.value = value
+        self.time = time
+
+    def __str__(self):
+        return f"{self.stage}({self.value})"
+
+    def __repr__(self):
+        return f"LogRecord({self.stage!r}, {self.value!r}, {self.time!r})"
+
+
+class MonadWithLogs(Monad):
+    __slots__ = ("__logs__",)
+
+    def __init__(self, value: T, maxlogs: int = None, **kwargs):
+        """
+        :param maxlogs: Number of most recent records kept, None to keep all of them.
+        """
+        super().__init__(value, **kwargs)
+        self.__logs__ = deque(maxlen=maxlogs)
+
+    def __after__(self, func: 'Functor[T, R]'):
+        value = self.__value__
+        # In a stack of monads the inner monads are updated by the next stages, record the value they hold
+        while isinstance(value, Monad):
+            value = value.__value__
+        self.__logs__.append(LogRecord(func.__name__, value, time.time()))
+
+
+def extract_logs(value: MonadWithLogs) -> list[str]:
+    """Format the log records of a monad, e.g. ["Add(8)", "Multiply(16)"]."""
+    if core.TRACING:
+        core._trace("extract_logs(%r): %s, dtype %s", value.__value__, type(value), value.__dtype__)
+    return [str(record) for record in value.__logs__]
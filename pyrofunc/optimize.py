@@ -0,0 +1,118 @@
+"""Rewrites of Functor.optimize."""
+from typing import Any, Callable
+
+from .core import Functor, functor, _runtime_type
+
+
+# Casts A -> B -> A returning the original value for every value of type A
+LOSSLESS_ROUND_TRIPS = {(int, str), (float, str)}
+# Fusion rules registered with register_fusion, by the kinds of the two adjacent stages
+_FUSIONS = {}
+
+
+def _fusion_kind(stage: Any) -> Any:
+    """Key of a stage in the fusion rules: its wrapped function for functions, else its functor class."""
+    if isinstance(stage, type):
+        return stage
+    if isinstance(stage, Functor):
+        return type(stage).__dict__.get("__wrapped__") or type(stage)
+    return stage
+
+
+def register_fusion(first: Any, second: Any, rule: Callable[['Functor', 'Functor'], Any]):
+    """
+    Register an algebraic rewrite of two adjacent stages, applied by Functor.optimize.
+    :param first: Functor class, or function used as a stage, of the first stage.
+    :param second: Functor class, or function used as a stage, of the second stage.
+    :param rule: Called with both stages, returns the stage or list of stages replacing them,
+                 an empty list to remove both, or None to leave them unchanged.
+    """
+    _FUSIONS[_fusion_kind(first), _fusion_kind(second)] = rule
+
+
+def _optimize(stages: list['Functor']) -> tuple[list['Functor'], list[str]]:
+    """Rewrite a flat list of stages until no rule applies, then fuse the runs of pure stages."""
+    stages, rewrites = list(stages), []
+    domain, codomain = stages[0].__domain__, stages[-1].__codomain__
+    changed = True
+    while changed:
+        changed = False
+        index = 0
+        while index < len(stages):
+            stage = stages[index]
+            cast = getattr(stage, "__cast__", None)
+            if cast is not None and cast[0] == cast[1]:
+                rewrites.append(f"removed identity cast {cast[1].__name__}")
+                del stages[index]
+                changed = True
+                continue
+            if index + 1 < len(stages):
+                after = stages[index + 1]
+                following = getattr(after, "__cast__", None)
+                if cast is not None and following is not None and (cast[0], cast[1]) == (following[1], following[0]) \
+                        and cast in LOSSLESS_ROUND_TRIPS:
+                    rewrites.append(f"removed cast round trip {cast[0].__name__} -> {cast[1].__name__} "
+                                    f"-> {cast[0].__name__}")
+                    del stages[index:index + 2]
+                    changed = True
+                    continue
+                rule = _FUSIONS.get((_fusion_kind(stage), _fusion_kind(after)))
+                fused = None if rule is None else rule(stage, after)
+                if fused is not None:
+                    fused = [fused] if isinstance(fused, Functor) else list(fused)
+                    rewrites.append(f"fused {stage.__name__} >> {after.__name__} into "
+                                    f"[{', '.join(f.__name__ for f in fused)}]")
+                    stages[index:index + 2] = fused
+                    changed = True
+                    continue
+            index += 1
+    if not stages:
+        # Everything cancelled out
+        return [_identity(domain)], rewrites + [f"pipeline reduced to identity on {domain.__name__}"]
+    assert stages[0].__domain__ == domain and stages[-1].__codomain__ == codomain, \
+        f"Functor.optimize(): A rewrite changed the pipeline type from {domain} -> {codomain} " \
+        f"to {stages[0].__domain__} -> {stages[-1].__codomain__}"
+
+    fused, run = [], []
+    for stage in stages + [None]:
+        if stage is not None and stage.__pure__ and not stage.__async__:
+            run.append(stage)
+            continue
+        if len(run) > 1:
+            rewrites.append(f"fused pure stages {', '.join(f.__name__ for f in run)}")
+            fused.append(FusedFunctor(run))
+        else:
+            fused.extend(run)
+        run = []
+        if stage is not None:
+            fused.append(stage)
+    return fused, rewrites
+
+
+def _identity(domain: Any) -> Functor:
+    def identity(value: domain) -> domain:
+        return value
+    stage = functor(identity)
+    stage.__pure__ = True
+    return stage
+
+
+class FusedFunctor(Functor):
+    """
+    Single stage running a run of pure stages as one nested call, built by Functor.optimize.
+    The call f2(f1(f0(value))) is generated once, it saves the loop of CompiledFunctor over the stages.
+    """
+    def __init__(self, stages: list['Functor']):
+        self.stages = list(stages)
+        self.__name__ = ".".join(stage.__name__ for stage in self.stages)
+        self.__domain__, self.__codomain__ = self.stages[0].__domain__, self.stages[-1].__codomain__
+        self.__check__ = _runtime_type(self.__domain__)
+        self.__pure__ = True
+        namespace = {f"f{index}": stage.__exec__ for index, stage in enumerate(self.stages)}
+        call = "value"
+        for index in range(len(self.stages)):
+            call = f"f{index}({call})"
+        self.__exec__ = eval(f"lambda value: {call}", namespace)
+
+    def __reduce__(self):
+        return self.__class__, (self.stages,)
@@ -0,0 +1,80 @@
+"""Pipelines run over many values on a pool of threads or processes."""
+import functools
+import itertools
+from typing import Iterable
+
+from . import core
+from .core import CompiledFunctor, Functor, R, T, _validate_sample
+
+
+class StageError(RuntimeError):
+    """Error raised while running a pipeline, naming the stage it was raised from."""
+    def __init__(self, stage: str, index: int, error: BaseException):
+        super().__init__(stage, index, error)
+        self.stage = stage
+        self.index = index
+        self.error = error
+
+    def __str__(self):
+        return f"Stage {self.index} ({self.stage}) failed: {self.error!r}"
+
+
+def _run_chunk(compiled: 'CompiledFunctor', values: list) -> list:
+    """Run a compiled pipeline over a chunk of values, in the calling thread or worker process."""
+    execs = [stage.__exec__ for stage in compiled.stages]
+    if core.PROFILER is not None:
+        execs = [functools.partial(core.PROFILER.record, stage.__name__, stage.__exec__) for stage in compiled.stages]
+    results = []
+    for value in values:
+        index = 0
+        try:
+            for index, execute in enumerate(execs):
+                value = execute(value)
+        except Exception as error:
+            raise StageError(compiled.stages[index].__name__, index, error) from error
+        results.append(value)
+    return results
+
+
+def parallel_map(pipeline: 'Functor[T, R]', values: Iterable[T], executor: str = "thread", workers: int = None,
+                 chunksize: int = 64, ordered: bool = True) -> list[R]:
+    """
+    Run a pipeline over many values on a pool of threads or processes.
+    The pipeline is compiled once and sent to the workers with chunks of `chunksize` values.
+    :param executor: "thread", "process" or an existing concurrent.futures.Executor.
+                     Process pools scale CPU-bound stages across cores, the stages must then be picklable.
+    :param workers: Number of workers of the pool, defaults to the number of CPUs.
+    :param ordered: Return the results in input order, or in the order chunks complete.
+    :raises StageError: When a stage raises, with the name of the stage.
+    """
+    # concurrent.futures is only needed here, keep it out of the import of the module
+    from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+    assert chunksize >= 1, f"parallel_map({pipeline.__name__}): Expected a positive chunk size, got {chunksize}"
+    compiled = pipeline.compile()
+    assert not compiled.__async__, f"parallel_map({pipeline.__name__}): \n" \
+                                   f"    Asynchronous functors must be awaited, use amap"
+    source = iter(values)
+    chunks = iter(lambda: list(itertools.islice(source, chunksize)), [])
+    match executor:
+        case Executor():
+            pool, owned = executor, False
+        case "thread":
+            pool, owned = ThreadPoolExecutor(max_workers=workers), True
+        case "process":
+            pool, owned = ProcessPoolExecutor(max_workers=workers), True
+        case _:
+            raise ValueError(f"parallel_map({pipeline.__name__}): \n"
+                             f"    Expected 'thread', 'process' or an Executor, got {executor!r}")
+    results = []
+    try:
+        futures = []
+        for chunk in chunks:
+            if not futures:
+                _validate_sample(compiled, chunk[0], type(values).__name__)
+            futures.append(pool.submit(_run_chunk, compiled, chunk))
+        for future in (futures if ordered else as_completed(futures)):
+            results.extend(future.result())
+    finally:
+        if owned:
+            pool.shutdown(wait=True, cancel_futures=True)
+    return results
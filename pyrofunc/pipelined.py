@@ -0,0 +1,225 @@
+"""Pipelines run stage by stage on workers connected by bounded queues, see PipelinedExecutor."""
+import functools
+import itertools
+import threading
+import time
+from typing import Any, Iterable, Iterator
+
+from . import core
+from .core import Functor, R, T, _validate_sample
+from .parallel import StageError
+
+EXECUTORS = ("thread", "process")
+# Indices of the counters of a worker
+PROCESSED, BUSY, BLOCKED, STARVED, MAX_DEPTH = range(5)
+
+
+class _End:
+    """End of the stream of chunks, the same object once unpickled in a worker process."""
+    __slots__ = ()
+
+    def __reduce__(self):
+        return "_END"
+
+
+_END = _End()
+
+
+class _Failure:
+    """Error raised by a stage or by the input, sent downstream in place of a chunk."""
+    __slots__ = ("error",)
+
+    def __init__(self, error: BaseException):
+        self.error = error
+
+    def __reduce__(self):
+        return _Failure, (self.error,)
+
+
+def _depth(queue) -> int:
+    try:
+        return queue.qsize()
+    except NotImplementedError:
+        # multiprocessing queues have no qsize on macOS
+        return 0
+
+
+def _work(stages: list[Functor], offset: int, inbox, outbox, counters, stop):
+    """
+    Loop of a worker: run its stages on each chunk of its inbox and put the results in its outbox.
+    Once stop is set the chunks are dropped, so the workers upstream are never blocked on a full queue.
+    """
+    execs = [stage.__exec__ for stage in stages]
+    if core.PROFILER is not None:
+        execs = [functools.partial(core.PROFILER.record, stage.__name__, stage.__exec__) for stage in stages]
+    clock = time.perf_counter
+    while True:
+        start = clock()
+        chunk = inbox.get()
+        counters[STARVED] += clock() - start
+        if chunk is _END:
+            outbox.put(_END)
+            return
+        if stop.is_set():
+            continue
+        depth = _depth(inbox)
+        if depth > counters[MAX_DEPTH]:
+            counters[MAX_DEPTH] = depth
+        if type(chunk) is not _Failure:
+            start = clock()
+            results = []
+            index = 0
+            try:
+                for value in chunk:
+                    for index, execute in enumerate(execs):
+                        value = execute(value)
+                    results.append(value)
+                chunk = results
+            except Exception as error:
+                chunk = _Failure(StageError(stages[index].__name__, offset + index, error))
+            counters[BUSY] += clock() - start
+            counters[PROCESSED] += len(results)
+        start = clock()
+        outbox.put(chunk)
+        counters[BLOCKED] += clock() - start
+
+
+class PipelinedExecutor:
+    """
+    Runs a pipeline over a stream of values with each stage, or group of stages, on its own worker thread or process.
+    Workers are connected by bounded queues of chunks of values: a slow stage fills its input queue, which blocks the
+    stages before it and the reading of the input, so memory stays bounded however long the stream is.
+    The results keep the input order. metrics() gives the activity of each worker to find the bottleneck:
+
+        executor = PipelinedExecutor(Parse() >> Enrich() >> to_float, executor="process")
+        for result in executor.map(lines):
+            ...
+        print(executor.bottleneck())
+    """
+    def __init__(self, pipeline: Functor, groups: int | list[int] = None, executor: str = "thread",
+                 maxsize: int = 4, chunksize: int = 64):
+        """
+        :param groups: Number of workers the stages are split into, or the number of consecutive stages run by each
+                       worker. Defaults to one worker per stage.
+        :param executor: "thread", or "process" for CPU-bound stages, which must then be picklable.
+        :param maxsize: Number of chunks each queue holds before blocking the stage feeding it.
+        :param chunksize: Number of values sent through the queues at once.
+        """
+        assert executor in EXECUTORS, f"{self.__class__.__name__}.__init__({executor!r}): \n" \
+                                      f"    Expected one of {EXECUTORS}"
+        assert maxsize >= 1 and chunksize >= 1, f"{self.__class__.__name__}.__init__({maxsize}, {chunksize}): \n" \
+                                                f"    Expected a positive queue size and chunk size"
+        self.compiled = pipeline.compile()
+        assert not self.compiled.__async__, f"{self.__class__.__name__}.__init__({pipeline.__name__}): \n" \
+                                            f"    Asynchronous functors must be awaited, use amap"
+        stages = self.compiled.stages
+        if groups is None:
+            groups = [1] * len(stages)
+        elif isinstance(groups, int):
+            assert 1 <= groups <= len(stages), f"{self.__class__.__name__}.__init__({groups}): \n" \
+                                               f"    Expected between 1 and {len(stages)} groups"
+            groups = [len(stages) // groups + (index < len(stages) % groups) for index in range(groups)]
+        assert sum(groups) == len(stages) and all(size >= 1 for size in groups), \
+            f"{self.__class__.__name__}.__init__({groups}): \n" \
+            f"    Expected group sizes covering the {len(stages)} stages"
+        offsets = list(itertools.accumulate(groups, initial=0))
+        self.groups = [stages[start:end] for start, end in zip(offsets, offsets[1:])]
+        self.offsets = offsets[:-1]
+        self.executor = executor
+        self.maxsize = maxsize
+        self.chunksize = chunksize
+        self.queues = []
+        self.counters = []
+        self.elapsed = 0.0
+        self.started = None
+
+    def map(self, values: Iterable[T]) -> Iterator[R]:
+        """Run the pipeline over the values, yielding the results in input order."""
+        source = iter(values)
+        for first in source:
+            _validate_sample(self.compiled, first, type(values).__name__)
+            source = itertools.chain([first], source)
+            break
+        if self.executor == "thread":
+            import queue
+            make_queue, event, counters = queue.Queue, threading.Event, lambda: [0.0] * 5
+            start_worker = lambda *args: threading.Thread(target=_work, args=args, daemon=True)
+        else:
+            import multiprocessing
+            context = multiprocessing.get_context()
+            make_queue, event, counters = context.Queue, context.Event, lambda: context.Array("d", 5, lock=False)
+            start_worker = lambda *args: context.Process(target=_work, args=args, daemon=True)
+        self.queues = [make_queue(self.maxsize) for _ in range(len(self.groups) + 1)]
+        self.counters = [counters() for _ in self.groups]
+        stop = event()
+        workers = [start_worker(group, offset, inbox, outbox, counters, stop) for group, offset, inbox, outbox, counters
+                   in zip(self.groups, self.offsets, self.queues, self.queues[1:], self.counters)]
+        chunks = iter(lambda: list(itertools.islice(source, self.chunksize)), [])
+
+        def feed():
+            # Blocks on the first queue while it is full, the input is only read as fast as the pipeline goes
+            try:
+                for chunk in chunks:
+                    if stop.is_set():
+                        break
+                    self.queues[0].put(chunk)
+            except Exception as error:
+                # Passed through by the workers, and raised by map once the results before it are consumed
+                self.queues[0].put(_Failure(error))
+            finally:
+                self.queues[0].put(_END)
+
+        feeder = threading.Thread(target=feed, daemon=True)
+        self.started, self.elapsed = time.perf_counter(), 0.0
+        for worker in workers:
+            worker.start()
+        feeder.start()
+        if core.TRACING:
+            core._trace("%s.map(%s): %d %s workers", self.__class__.__name__, self.compiled.__name__, len(workers),
+                        self.executor)
+        output, chunk = self.queues[-1], None
+        try:
+            while (chunk := output.get()) is not _END:
+                if type(chunk) is _Failure:
+                    raise chunk.error
+                yield from chunk
+        finally:
+            if chunk is not _END:
+                # Stopped early by an error or by the consumer: drop the chunks in flight until the end comes through
+                stop.set()
+                while output.get() is not _END:
+                    pass
+            feeder.join()
+            for worker in workers:
+                worker.join()
+            self.elapsed = time.perf_counter() - self.started
+
+    def metrics(self) -> list[dict]:
+        """
+        Activity of each worker during the last run, or so far for a running one.
+        Times are in seconds: busy running its stages, blocked on a full output queue (backpressure from the stages
+        after it), and starved waiting for input. depth is the number of chunks waiting in its input queue.
+        throughput is the number of values per second of busy time, the rate the worker can sustain.
+        """
+        elapsed = self.elapsed or (time.perf_counter() - self.started if self.started is not None else 0.0)
+        rows = []
+        for group, inbox, counters in zip(self.groups, self.queues, self.counters):
+            processed, busy = int(counters[PROCESSED]), counters[BUSY]
+            rows.append({"stage": ".".join(stage.__name__ for stage in group), "processed": processed,
+                         "busy": busy, "blocked": counters[BLOCKED], "starved": counters[STARVED],
+                         "utilization": busy / elapsed if elapsed else 0.0, "depth": _depth(inbox),
+                         "max_depth": int(counters[MAX_DEPTH]), "throughput": processed / busy if busy else 0.0})
+        return rows
+
+    def bottleneck(self) -> str | None:
+        """Name of the stages of the busiest worker, the one limiting the throughput of the pipeline."""
+        rows = self.metrics()
+        return max(rows, key=lambda row: row["busy"])["stage"] if rows else None
+
+
+def pipelined_map(pipeline: Functor, values: Iterable[T], **options: Any) -> list[R]:
+    """
+    Run a pipeline over many values with a PipelinedExecutor, whose options are passed along.
+    :return: The results, in the order of the input values.
+    """
+    return list(PipelinedExecutor(pipeline, **options).map(values))
@@ -0,0 +1,155 @@
+"""Monads short-circuiting on failures: Maybe, Either and Result."""
+from typing import Any, Iterable
+
+from . import core
+from .core import Functor, Monad, R, T, _validate_sample
+
+
+class NothingType:
+    """Type of Nothing, the missing value of a Maybe."""
+    __slots__ = ()
+
+    def __repr__(self):
+        return "Nothing"
+
+    def __bool__(self):
+        return False
+
+    def __reduce__(self):
+        return "Nothing"
+
+
+Nothing = NothingType()
+
+
+class Left:
+    """Failed value of an Either or a Result, holding the reason of the failure."""
+    __slots__ = ("error",)
+
+    def __init__(self, error: Any):
+        self.error = error
+
+    def __repr__(self):
+        return f"Left({self.error!r})"
+
+    def __eq__(self, other):
+        return isinstance(other, Left) and self.error == other.error
+
+    def __hash__(self):
+        return hash((Left, self.error))
+
+    def __reduce__(self):
+        return Left, (self.error,)
+
+
+class ShortCircuitMonad(Monad):
+    """
+    Base of the monads skipping the remaining stages of a pipeline once their value is a failure.
+    Pipelines are run stage by stage on the value, compiled ones included, and a failure never raises.
+    """
+    __slots__ = ()
+    # Exceptions raised by a stage and turned into a Left failure, none by default
+    __catch__ = ()
+
+    @staticmethod
+    def __failed__(value) -> bool:
+        raise NotImplementedError
+
+    @staticmethod
+    def __failure__(value):
+        """Normalize a failed value, e.g. None into Nothing."""
+        return value
+
+    @classmethod
+    def __run__(cls, stages: list['Functor'], value):
+        """Run the stages on the value, stopping at the first failure."""
+        failed = cls.__failed__
+        if failed(value):
+            return cls.__failure__(value)
+        try:
+            for stage in stages:
+                if not stage.__validated__:
+                    _validate_sample(stage, value, cls.__name__)
+                value = stage.__exec__(value)
+                if failed(value):
+                    if core.TRACING:
+                        core._trace("%s.__run__(%s): failed with %r", cls.__name__, stage.__name__, value)
+                    return cls.__failure__(value)
+        except cls.__catch__ as error:
+            if core.TRACING:
+                core._trace("%s.__run__(%s): caught %r", cls.__name__, stage.__name__, error)
+            return Left(error)
+        return value
+
+    def __exec__(self, func: 'Functor[T, R]') -> 'ShortCircuitMonad[R]':
+        assert isinstance(func, Functor), f"{self.__class__.__name__}.__exec__({func}):" \
+                                          f"Expected Functor, got {type(func)}"
+        if self.__strategy__ is not None:
+            self.__pre__.append(self.__snapshot__(func))
+        if core.TRACING:
+            core._trace("%s.__exec__(%s)(value=%r)", self.__class__.__name__, func.__name__, self.__value__)
+        self.__value__ = self.__run__(func.__flatten__(), self.__value__)
+        return self
+
+    def __or__(self, other):
+        if isinstance(other, Functor):
+            return self.__exec__(other)
+        # Casts are skipped too, the failure is returned as it is
+        if self.__failed__(self.__value__):
+            return self.__value__
+        return super().__or__(other)
+
+    @property
+    def failed(self) -> bool:
+        return self.__failed__(self.__value__)
+
+    @classmethod
+    def partition(cls, pipeline: 'Functor[T, R]', values: Iterable[T]) -> tuple[list[R], list[tuple[int, Any]]]:
+        """
+        Run a pipeline over many values in one pass, splitting the successes from the failures.
+        :return: The successful results, and the (index, failure) pairs of the values that failed.
+        """
+        stages = pipeline.__flatten__()
+        run, failed = cls.__run__, cls.__failed__
+        successes, failures = [], []
+        for index, value in enumerate(values):
+            value = run(stages, value)
+            if failed(value):
+                failures.append((index, value))
+            else:
+                successes.append(value)
+        return successes, failures
+
+
+class Maybe(ShortCircuitMonad):
+    """
+    Monad whose value may be missing. A stage returning None makes the value Nothing,
+    and the following stages are skipped.
+    """
+    __slots__ = ()
+
+    @staticmethod
+    def __failed__(value) -> bool:
+        return value is None or value is Nothing
+
+    @staticmethod
+    def __failure__(value):
+        return Nothing
+
+
+class Either(ShortCircuitMonad):
+    """
+    Monad holding either a value or a Left failure. A stage returns Left(error) to fail,
+    and the following stages are skipped.
+    """
+    __slots__ = ()
+
+    @staticmethod
+    def __failed__(value) -> bool:
+        return type(value) is Left
+
+
+class Result(Either):
+    """Either that also turns the exceptions raised by a stage into a Left failure holding the exception."""
+    __slots__ = ()
+    __catch__ = (Exception,)
@@ -0,0 +1,121 @@
+import asyncio
+import pytest
+from pyrofunc import Monad, AsyncMonad, amap, functor, staticfunctor
+
+
+@functor
+class Add:
+    def __init__(self, y: int):
+        self.y = y
+
+    def __exec__(self, x: int) -> int:
+        return x + self.y
+
+
+@functor
+class Delay:
+    def __init__(self, seconds: float):
+        self.seconds = seconds
+
+    async def __exec__(self, x: int) -> int:
+        await asyncio.sleep(self.seconds)
+        return x
+
+
+@functor
+async def double(x: int) -> int:
+    await asyncio.sleep(0)
+    return x * 2
+
+
+@staticfunctor
+class Length:
+    def __exec__(self, x: str) -> int:
+        return len(x)
+
+
+def test_async_flags():
+    assert double.__async__
+    assert Delay(0).__async__
+    assert not Add(1).__async__
+    assert (Add(1) >> double).__async__
+    assert (Add(1) >> double >> Add(1)).compile().__async__
+
+
+def test_async_monad_mixes_sync_and_async_stages():
+    async def main():
+        return await (AsyncMonad(5) | Add(3) >> double >> Delay(0) >> Add(1))
+
+    m = asyncio.run(main())
+    assert m.__value__ == 17
+    assert m.__dtype__ == "int"
+
+
+def test_async_monad_chained_pipes_and_cast():
+    async def main():
+        m = await (AsyncMonad("abc") | Length | double)
+        return m | float
+
+    assert asyncio.run(main()) == 6.0
+
+
+def test_async_monad_validates_input():
+    async def main():
+        return await (AsyncMonad("abc") | double)
+
+    with pytest.raises(AssertionError):
+        asyncio.run(main())
+
+
+def test_async_monad_cast_before_await():
+    with pytest.raises(AssertionError):
+        AsyncMonad(1) | double | float
+
+
+def test_sync_monad_rejects_async_functor():
+    with pytest.raises(AssertionError):
+        Monad(1) | double
+
+
+def test_amap_keeps_order():
+    pipeline = Add(1) >> double
+    assert asyncio.run(amap(pipeline, range(20), concurrency=4)) == [2 * (x + 1) for x in range(20)]
+
+
+def test_amap_runs_concurrently():
+    in_flight, peak = 0, 0
+
+    @functor
+    async def track(x: int) -> int:
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.001)
+        in_flight -= 1
+        return x
+
+    assert asyncio.run(amap(track, range(30), concurrency=5)) == list(range(30))
+    assert peak == 5
+
+
+def test_amap_propagates_errors():
+    @functor
+    async def fail(x: int) -> int:
+        raise ValueError(x)
+
+    with pytest.raises(ValueError):
+        asyncio.run(amap(Add(1) >> fail, range(5), concurrency=2))
+
+
+def test_amap_type_checks_once(monkeypatch):
+    from pyrofunc import asynchronous, core
+    checks = []
+    validate = asynchronous._validate_sample
+    monkeypatch.setattr(asynchronous, "_validate_sample", lambda *args: checks.append(args[1]) or validate(*args))
+    compiled = []
+    monkeypatch.setattr(core.CompiledFunctor, "__init__", lambda self, stages, init=core.CompiledFunctor.__init__:
+                        compiled.append(stages) or init(self, stages))
+    assert asyncio.run(amap(Add(1) >> double, range(10), concurrency=3)) == [2 * (x + 1) for x in range(10)]
+    assert checks == [0] and len(compiled) == 1
+    with pytest.raises(AssertionError, match="Type Mismatch"):
+        asyncio.run(amap(Add(1) >> double, ["a", "b"]))
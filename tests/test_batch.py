@@ -0,0 +1,91 @@
+import pytest
+from pyrofunc import Monad, BatchMonad, functor, staticfunctor
+
+
+@functor
+class Add:
+    def __init__(self, y: int):
+        self.y = y
+
+    def __exec__(self, x: int) -> int:
+        return x + self.y
+
+
+@functor
+class Multiply:
+    calls = 0
+
+    def __init__(self, factor: int):
+        self.factor = factor
+
+    def __exec__(self, x: int) -> int:
+        return x * self.factor
+
+    def __exec_batch__(self, xs: list[int]) -> list[int]:
+        Multiply.calls += 1
+        if hasattr(xs, "dtype"):
+            return xs * self.factor
+        return [x * self.factor for x in xs]
+
+
+@staticfunctor
+class AddOne:
+    def __exec__(self, x: int) -> int:
+        return x + 1
+
+
+@functor
+def to_float(x: int) -> float:
+    return float(x)
+
+
+def test_batch_matches_per_element():
+    pipeline = Add(3) >> Multiply(2) >> AddOne
+    values = list(range(10))
+    m = BatchMonad(values) | pipeline
+    assert m.__value__ == [(Monad(x) | pipeline).__value__ for x in values]
+
+
+def test_batch_uses_exec_batch_once():
+    Multiply.calls = 0
+    m = BatchMonad(list(range(1000))) | Add(1) >> Multiply(2) >> Multiply(3)
+    assert Multiply.calls == 2
+    assert m.__value__[:3] == [6, 12, 18]
+
+
+def test_batch_single_functor():
+    assert (BatchMonad([1, 2, 3]) | Add(1)).__value__ == [2, 3, 4]
+    assert (BatchMonad([1, 2, 3]) | AddOne).__value__ == [2, 3, 4]
+
+
+def test_batch_compiled_pipeline_and_casts():
+    m = BatchMonad([1, 2]) | (Add(1) >> float).compile()
+    assert m.__value__ == [2.0, 3.0]
+    assert all(isinstance(value, float) for value in m.__value__)
+
+
+def test_batch_validates_first_element():
+    with pytest.raises(AssertionError):
+        BatchMonad(["a", "b"]) | Add(1) >> Multiply(2)
+
+
+def test_batch_validation_never():
+    pipeline = (Add(1) >> to_float).validate("never")
+    assert (BatchMonad([0.5]) | pipeline).__value__ == [1.5]
+
+
+def test_empty_batch():
+    assert (BatchMonad([]) | Add(1) >> Multiply(2)).__value__ == []
+
+
+def test_batch_cast():
+    assert BatchMonad([3, 1, 2]) | Add(1) | sorted == [2, 3, 4]
+
+
+def test_batch_numpy():
+    numpy = pytest.importorskip("numpy")
+    m = BatchMonad(numpy.arange(5)) | Add(1) >> Multiply(2)
+    assert isinstance(m.__value__, numpy.ndarray)
+    assert m.__value__.tolist() == [2, 4, 6, 8, 10]
+    with pytest.raises(AssertionError):
+        BatchMonad(numpy.arange(5.0)) | Add(1)
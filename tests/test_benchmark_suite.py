@@ -0,0 +1,34 @@
+import json
+from benchmarks import suite
+
+
+def results(**normalized):
+    return {"results": {name.replace("_", "/"): {"seconds": value, "normalized": value}
+                        for name, value in normalized.items()}}
+
+
+def test_compare_statuses():
+    baseline = results(a=1.0, b=1.0, c=1.0)
+    rows = suite.compare(results(a=1.1, b=1.5, c=0.5, d=1.0), baseline, tolerance=0.25)
+    assert [(name, status) for name, _, status in rows] == [("a", "ok"), ("b", "regression"), ("c", "faster"),
+                                                            ("d", "new")]
+    assert rows[1][1] == 1.5
+
+
+def test_run_and_compare(tmp_path, capsys):
+    output = tmp_path / "results.json"
+    assert suite.main(["--filter", "chain/compiled/1", "--scale", "0.001", "--json", str(output)]) == 0
+    measured = json.loads(output.read_text())
+    assert set(measured["results"]) == {"chain/compiled/1", "chain/compiled/10", "chain/compiled/100"}
+    slower = {"results": {name: {"seconds": 0, "normalized": result["normalized"] / 10}
+                          for name, result in measured["results"].items()}}
+    baseline = tmp_path / "baseline.json"
+    baseline.write_text(json.dumps(slower))
+    assert suite.main(["--filter", "chain/compiled/1", "--scale", "0.001", "--compare", str(baseline)]) == 1
+    assert "regression" in capsys.readouterr().out
+
+
+def test_baseline_covers_suite():
+    with open(suite.BASELINE) as file:
+        baseline = json.load(file)
+    assert {name for name, _, _ in suite.cases()} == set(baseline["results"])
@@ -0,0 +1,157 @@
+import pickle
+import time
+import pytest
+from pyrofunc import Monad, CachedFunctor, CompiledFunctor, Functor, functor, staticfunctor, memoized_functor
+
+
+calls = []
+
+
+@memoized_functor(maxsize=4)
+class Add:
+    def __init__(self, y: int):
+        self.y = y
+
+    def __exec__(self, x: int) -> int:
+        calls.append((self.y, x))
+        return x + self.y
+
+
+@functor
+class Multiply:
+    def __init__(self, y: int):
+        self.y = y
+
+    def __exec__(self, x: int) -> int:
+        calls.append(("mul", x))
+        return x * self.y
+
+
+@pytest.fixture(autouse=True)
+def reset():
+    calls.clear()
+    Add.__cache__.clear()
+
+
+def test_memoized_functor_is_functor():
+    assert issubclass(Add, Functor)
+    assert Add.__name__ == "Add"
+    assert Add.__domain__ is int and Add.__codomain__ is int
+    assert Monad(5) | Add(3) | int == 8
+
+
+def test_memoized_functor_hits():
+    add = Add(3)
+    assert (Monad(5) | add | int) == 8
+    assert (Monad(5) | add | int) == 8
+    assert calls == [(3, 5)]
+    stats = Add.__cache__.stats()
+    assert (stats["hits"], stats["misses"], stats["size"]) == (1, 1, 1)
+
+
+def test_memoized_functor_keys_on_parameters():
+    assert (Monad(5) | Add(3) | int) == 8
+    assert (Monad(5) | Add(4) | int) == 9
+    assert (Monad(5) | Add(3) | int) == 8
+    assert calls == [(3, 5), (4, 5)]
+
+
+def test_memoized_functor_lru_eviction():
+    add = Add(1)
+    for x in range(5):
+        Monad(x) | add | int
+    Monad(4) | add | int
+    Monad(0) | add | int
+    stats = Add.__cache__.stats()
+    assert stats["evictions"] == 2 and stats["size"] == 4
+    assert calls == [(1, x) for x in range(5)] + [(1, 0)]
+
+
+def test_unhashable_values_bypass_cache():
+    @memoized_functor()
+    class Append:
+        def __exec__(self, x: list) -> list:
+            return x + [1]
+
+    assert (Monad([0]) | Append() | list) == [0, 1]
+    assert Append.__cache__.stats()["size"] == 0
+
+
+def test_cached_ttl():
+    cached = Multiply(2).cached(ttl=0.01)
+    assert (Monad(3) | cached | int) == 6
+    assert (Monad(3) | cached | int) == 6
+    time.sleep(0.02)
+    assert (Monad(3) | cached | int) == 6
+    assert calls == [("mul", 3), ("mul", 3)]
+    assert cached.__cache__.stats()["evictions"] == 1
+
+
+def test_cached_pipeline_is_compiled():
+    cached = (Multiply(2) >> Multiply(3)).cached()
+    assert isinstance(cached, CachedFunctor)
+    assert isinstance(cached.inner, CompiledFunctor)
+    assert Monad(1) | cached | int == 6
+    assert Monad(1) | cached | int == 6
+    assert calls == [("mul", 1), ("mul", 2)]
+    assert cached.__cache__.stats()["hits"] == 1
+
+
+def test_cached_stage_in_pipeline():
+    pipeline = (Multiply(2).cached() >> Add(1)).compile()
+    assert [(Monad(x) | pipeline | int) for x in (1, 1, 2)] == [3, 3, 5]
+    assert calls == [("mul", 1), (1, 2), ("mul", 2), (1, 4)]
+
+
+def test_cached_validation():
+    cached = Multiply(2).cached()
+    with pytest.raises(AssertionError):
+        cached("a")
+
+
+def test_memoized_static_functor():
+    @memoized_functor()
+    @staticfunctor
+    class AddOne:
+        def __exec__(self, x: int) -> int:
+            calls.append(x)
+            return x + 1
+
+    assert isinstance(AddOne, CachedFunctor)
+    assert (Monad(1) | AddOne | int) == (Monad(1) | AddOne | int) == 2
+    assert calls == [1]
+
+
+def test_cached_pickle():
+    cached = Multiply(2).cached(maxsize=8)
+    Monad(1) | cached | int
+    restored = pickle.loads(pickle.dumps(cached))
+    assert (Monad(4) | restored | int) == 8
+    assert restored.__cache__.stats()["maxsize"] == 8
+    assert Monad(1) | pickle.loads(pickle.dumps(Add(3))) | int == 4
+
+
+def test_mutable_results_are_copied():
+    @functor
+    def box(x: int) -> list:
+        return [x]
+
+    @functor
+    def push(x: list) -> list:
+        x.append(0)
+        return x
+
+    pipeline = box.cached() >> push
+    assert [(Monad(1) | pipeline).__value__ for _ in range(3)] == [[1, 0], [1, 0], [1, 0]]
+
+
+def test_keys_tell_types_apart():
+    @functor
+    def show(x: object) -> str:
+        return repr(x)
+
+    cached = show.cached()
+    assert [(Monad(value) | cached).__value__ for value in (1, 1.0, True, (1,), (1.0,))] == \
+           ["1", "1.0", "True", "(1,)", "(1.0,)"]
+    assert (Monad(5) | Add(1) | int, Monad(5) | Add(1.0) | float, Monad(5) | Add(True) | int) == (6, 6.0, 6)
+    assert len(calls) == 3
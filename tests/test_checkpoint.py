@@ -0,0 +1,137 @@
+import os
+import pickle
+import subprocess
+import sys
+import pytest
+from pyrofunc import Checkpoint, Stream, fan, functor
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+@functor
+class Add:
+    def __init__(self, y: int):
+        self.y = y
+
+    def __exec__(self, x: int) -> int:
+        return x + self.y
+
+
+@functor
+class Multiply:
+    def __init__(self, factor: int):
+        self.factor = factor
+
+    def __exec__(self, x: int) -> int:
+        return x * self.factor
+
+
+@functor
+class Counted:
+    """Identity counting its calls, raising on the value `fail`."""
+    calls = 0
+    fail = None
+
+    def __exec__(self, x: int) -> int:
+        if x == Counted.fail:
+            raise RuntimeError(f"crash on {x}")
+        Counted.calls += 1
+        return x
+
+
+def add(x: int, y: int) -> int:
+    return x + y
+
+
+@pytest.fixture(autouse=True)
+def reset():
+    Counted.calls, Counted.fail = 0, None
+
+
+def test_results_unchanged_and_file_removed(tmp_path):
+    path = tmp_path / "run.ckpt"
+    checkpoint = Checkpoint(path, interval=0)
+    assert list(Stream(range(10), chunksize=3, checkpoint=checkpoint) | Add(1) >> Multiply(2)) == \
+           [(x + 1) * 2 for x in range(10)]
+    assert checkpoint.saves > 0 and not path.exists()
+
+
+def test_path_uses_default_checkpoint(tmp_path):
+    stream = Stream(range(3), checkpoint=tmp_path / "run.ckpt")
+    assert isinstance(stream.__checkpoint__, Checkpoint) and stream.__checkpoint__.interval == 60.0
+    assert list(stream | Add(1)) == [1, 2, 3]
+
+
+def test_resume_skips_consumed_chunks(tmp_path):
+    path = tmp_path / "run.ckpt"
+    results = iter(Stream(range(10), chunksize=2, checkpoint=Checkpoint(path, interval=0)) | Add(1) >> Counted())
+    assert [next(results) for _ in range(5)] == [1, 2, 3, 4, 5]
+    # Crash while the third chunk is consumed: the first two are done
+    results.close()
+    assert pickle.load(open(path, "rb"))["offset"] == 4
+    Counted.calls = 0
+    assert list(Stream(range(10), chunksize=2, checkpoint=Checkpoint(path, interval=0)) | Add(1) >> Counted()) == \
+           [5, 6, 7, 8, 9, 10]
+    assert Counted.calls == 6 and not path.exists()
+
+
+def test_failing_stage_resumes_at_stage(tmp_path):
+    path = tmp_path / "run.ckpt"
+    Counted.fail = 6
+    with pytest.raises(RuntimeError, match="crash on 6"):
+        list(Stream(range(10), chunksize=4, checkpoint=Checkpoint(path, interval=3600)) | Multiply(2) >> Add(1)
+             >> Add(-1) >> Counted())
+    state = pickle.load(open(path, "rb"))
+    assert (state["offset"], state["consumed"], state["stage"], state["values"]) == (0, 4, 3, [0, 2, 4, 6])
+    Counted.fail = None
+    with pytest.raises(AssertionError, match="cannot resume"):
+        list(Stream(range(10), chunksize=4, checkpoint=Checkpoint(path)) | Multiply(10) >> Add(1) >> Add(-1)
+             >> Counted())
+    resumed = Stream(range(10), chunksize=4, checkpoint=Checkpoint(path)) | Multiply(2) >> Add(1) >> Add(-1) \
+        >> Counted()
+    Counted.calls = 0
+    assert list(resumed) == [2 * x for x in range(10)]
+    # The restored chunk only runs the failing stage
+    assert Counted.calls == 10 and not path.exists()
+
+
+def test_every_bounds_saves(tmp_path):
+    checkpoint = Checkpoint(tmp_path / "run.ckpt", interval=3600, every=10)
+    assert len(list(Stream(range(100), chunksize=5, checkpoint=checkpoint) | Add(1))) == 100
+    assert checkpoint.saves == 10
+    checkpoint = Checkpoint(tmp_path / "run.ckpt", interval=3600)
+    assert len(list(Stream(range(100), chunksize=5, checkpoint=checkpoint) | Add(1))) == 100
+    assert checkpoint.saves == 0
+
+
+def test_other_pipeline_is_rejected(tmp_path):
+    path = tmp_path / "run.ckpt"
+    results = iter(Stream(range(10), chunksize=2, checkpoint=Checkpoint(path, interval=0)) | Add(1))
+    next(results), next(results), next(results)
+    results.close()
+    with pytest.raises(AssertionError, match="cannot resume"):
+        list(Stream(range(10), chunksize=2, checkpoint=Checkpoint(path)) | Multiply(2))
+    # Same stages with other parameters
+    with pytest.raises(AssertionError, match="their parameters differ"):
+        list(Stream(range(10), chunksize=2, checkpoint=Checkpoint(path)) | Add(5))
+    assert list(Stream(range(10), chunksize=2, checkpoint=Checkpoint(path)) | Add(1)) == [3, 4, 5, 6, 7, 8, 9, 10]
+
+
+def test_resume_in_another_process(tmp_path):
+    # Each run is a fresh interpreter, where the stages and their parameters live at other addresses
+    run = "import sys\n" \
+          "from pyrofunc import Checkpoint, Stream, fan\n" \
+          "from tests.test_checkpoint import Add, Counted, Multiply, add\n" \
+          "Counted.fail = int(sys.argv[2]) if sys.argv[2] else None\n" \
+          "pipeline = Add(1).cached() >> fan(Multiply(2), Add(3), into=add) >> Counted()\n" \
+          "try:\n" \
+          "    results = list(Stream(range(10), chunksize=2, checkpoint=Checkpoint(sys.argv[1], interval=0)) | pipeline)\n" \
+          "except RuntimeError:\n" \
+          "    results = None\n" \
+          "print(Counted.calls, results)"
+    path = str(tmp_path / "run.ckpt")
+    python = lambda fail: subprocess.run([sys.executable, "-c", run, path, fail], cwd=ROOT, capture_output=True,
+                                         text=True, check=True).stdout
+    assert python("18") == "4 None\n" and os.path.exists(path)
+    # Resumed at the failing stage of the third chunk
+    assert python("") == "6 [18, 21, 24, 27, 30, 33]\n" and not os.path.exists(path)
@@ -0,0 +1,91 @@
+import pytest
+from pyrofunc import Monad, CompositeFunctor, CompiledFunctor, functor, staticfunctor
+
+
+@functor
+class Add:
+    def __init__(self, y: int):
+        self.y = y
+
+    def __exec__(self, x: int) -> int:
+        return x + self.y
+
+
+@functor
+class Multiply:
+    def __init__(self, factor: int):
+        self.factor = factor
+
+    def __exec__(self, x: int) -> int:
+        return x * self.factor
+
+
+@staticfunctor
+class AddOne:
+    def __exec__(self, x: int) -> int:
+        return x + 1
+
+
+@staticfunctor
+class Reverse:
+    def __exec__(self, x: list) -> list:
+        return x[::-1]
+
+
+def test_compile_flattens_composite_tree():
+    composite1 = Add(3) >> Multiply(2)
+    composite2 = AddOne >> Multiply(4)
+    compiled = (composite1 >> Add(10) >> composite2 >> AddOne).compile()
+    assert isinstance(compiled, CompiledFunctor)
+    assert [stage.__name__ for stage in compiled.stages] == ["Add", "Multiply", "Add", "AddOne", "Multiply", "AddOne"]
+    assert compiled.__name__ == "Add.Multiply.Add.AddOne.Multiply.AddOne"
+
+
+def test_compiled_matches_nested_dispatch():
+    pipeline = Add(3) >> Multiply(2) >> Add(10) >> AddOne >> Multiply(4) >> AddOne
+    assert (Monad(5) | pipeline.compile()).__value__ == (Monad(5) | pipeline).__value__ == 109
+
+
+def test_compile_long_chain():
+    pipeline = AddOne
+    for _ in range(1999):
+        pipeline = pipeline >> AddOne
+    compiled = pipeline.compile()
+    assert len(compiled.stages) == 2000
+    assert (Monad(0) | compiled).__value__ == 2000
+
+
+def test_compiled_with_casts():
+    m = Monad(5) | (Add(3) >> int >> int).compile() | int
+    assert isinstance(m, int)
+    assert m == 8
+
+
+def test_compiled_composes_further():
+    compiled = (Add(2) >> Multiply(3)).compile()
+    assert isinstance(compiled >> AddOne, CompositeFunctor)
+    assert (Monad(4) | compiled >> AddOne).__value__ == 19
+    assert (Monad(4) | AddOne >> compiled).__value__ == 21
+
+
+def test_compiled_nested_monad():
+    m = Monad(Monad(5)) | (Add(3) >> Multiply(2)).compile()
+    assert m.__value__.__value__ == 16
+
+
+def test_compile_single_functor():
+    assert Add(3).compile().stages[0].y == 3
+    compiled = (Add(3) >> Multiply(2)).compile()
+    assert compiled.compile() is compiled
+
+
+def test_compiled_validates_input_type():
+    with pytest.raises(AssertionError):
+        Monad("hello") | (Add(3) >> Multiply(2)).compile()
+
+
+def test_compiled_checks_stage_types():
+    with pytest.raises(AssertionError):
+        CompiledFunctor([Add(3), Reverse])
+    with pytest.raises(AssertionError):
+        CompiledFunctor([])
@@ -0,0 +1,233 @@
+import gc
+import pickle
+import time
+import pytest
+from pyrofunc import Monad, DAG, DAGFunctor, Profiler, Add, Multiply, fan, functor, join, merge
+
+
+calls = []
+
+
+@functor
+class Count:
+    """Add(y) recording its calls."""
+    __pure__ = True
+
+    def __init__(self, y: int):
+        self.y = y
+
+    def __exec__(self, x: int) -> int:
+        calls.append(self.y)
+        return x + self.y
+
+
+@functor
+class Append:
+    def __init__(self, item: int):
+        self.item = item
+
+    def __exec__(self, x: list) -> list:
+        x.append(self.item)
+        return x
+
+
+@functor
+class Sleep:
+    def __init__(self, seconds: float):
+        self.seconds = seconds
+
+    def __exec__(self, x: int) -> int:
+        time.sleep(self.seconds)
+        return x
+
+
+@functor
+class Fail:
+    def __exec__(self, x: int) -> int:
+        raise ValueError(x)
+
+
+def add(x: int, y: int) -> int:
+    return x + y
+
+
+def ratio(total: int, count: int) -> float:
+    return total / count
+
+
+def describe(value: float, label: str) -> str:
+    return f"{label}={value}"
+
+
+@pytest.fixture(autouse=True)
+def reset_calls():
+    calls.clear()
+
+
+def test_fan_and_join():
+    dag = DAG(int)
+    base = dag.input >> Add(1)
+    result = dag.join(ratio, base >> Multiply(10), base >> Add(1))
+    pipeline = dag.build(result)
+    assert isinstance(pipeline, DAGFunctor)
+    assert pipeline.__domain__ is int and pipeline.__codomain__ is float
+    assert (Monad(4) | pipeline).__value__ == 50 / 6
+
+
+def test_several_outputs_return_a_tuple():
+    dag = DAG(int)
+    first, second = dag.input.fan(Add(1), Multiply(2) >> float)
+    pipeline = dag.build(first, second)
+    assert pipeline.__codomain__ == tuple[int, float]
+    assert (Monad(3) | pipeline).__value__ == (4, 6.0)
+
+
+def test_merge_reduces_branches():
+    dag = DAG(int)
+    pipeline = dag.build(dag.merge(add, *dag.input.fan(Add(1), Add(2), Multiply(3))))
+    assert (Monad(2) | pipeline).__value__ == 3 + 4 + 6
+
+
+def test_fan_in_linear_pipeline():
+    pipeline = Add(1) >> fan(Add(3) >> Multiply(2), Add(3) >> Add(1), into=merge(add)) >> float
+    assert (Monad(1) | pipeline).__value__ == (5 * 2 + 5 + 1) * 1.0
+    tupled = Add(1) >> fan(Multiply(2) >> float, str) >> join(describe)
+    assert (Monad(1) | tupled).__value__ == "2=4.0"
+
+
+def test_shared_prefix_computed_once():
+    dag = DAG(int)
+    left = dag.input >> Count(1) >> Count(2) >> Multiply(2)
+    right = dag.input >> Count(1) >> Count(2) >> Add(5)
+    pipeline = dag.build(dag.merge(add, left, right))
+    assert len(pipeline.nodes) == 6
+    assert (Monad(0) | pipeline).__value__ == 6 + 8
+    assert calls == [1, 2]
+
+
+def test_identical_branches_in_fan_computed_once():
+    pipeline = fan(Count(1) >> Multiply(2), Count(1) >> Add(3), into=add)
+    assert (Monad(1) | pipeline).__value__ == 4 + 5
+    assert calls == [1]
+
+
+def test_dedup_off():
+    dag = DAG(int, dedup=False)
+    pipeline = dag.build(dag.merge(add, dag.input >> Count(1), dag.input >> Count(1)))
+    assert (Monad(0) | pipeline).__value__ == 2
+    assert calls == [1, 1]
+
+
+def test_different_parameters_are_not_shared():
+    pipeline = fan(Count(1), Count(2), into=add)
+    assert (Monad(0) | pipeline).__value__ == 3
+    assert calls == [1, 2]
+
+
+def test_equal_parameters_of_other_types_are_not_shared():
+    @functor
+    class Scale:
+        def __init__(self, factor):
+            self.factor = factor
+
+        def __exec__(self, x: int) -> object:
+            return x * self.factor
+
+    dag = DAG(int)
+    nodes = [dag.input >> Scale(factor) for factor in (1, 1.0, True)]
+    assert len({node.index for node in nodes}) == 3
+    results = (Monad(2) | dag.build(*nodes)).__value__
+    assert results == (2, 2.0, 2) and [type(result) for result in results] == [int, float, int]
+
+
+def test_edges_type_checked():
+    dag = DAG(int)
+    with pytest.raises(AssertionError, match="Type Mismatch"):
+        dag.input >> float >> Add(1)
+    with pytest.raises(AssertionError, match="Type Mismatch"):
+        dag.join(ratio, dag.input >> float, dag.input)
+    with pytest.raises(AssertionError, match="Expected 2 branches"):
+        dag.join(ratio, dag.input, dag.input, dag.input)
+    with pytest.raises(AssertionError, match="join or merge"):
+        dag.node(Add(1), dag.input, dag.input)
+    with pytest.raises(AssertionError, match="Type Mismatch"):
+        Add(1) >> fan(Add(1), float) >> join(ratio)
+    with pytest.raises(AssertionError, match="Expected a function of two arguments"):
+        merge(ratio)
+    with pytest.raises(AssertionError, match="another DAG"):
+        DAG(int).join(ratio, dag.input, DAG(int).input)
+
+
+def test_input_type_checked():
+    with pytest.raises(AssertionError, match="Type Mismatch"):
+        Monad("1") | fan(Add(1), Add(2))
+
+
+def test_shared_mutable_value_copied_for_impure_stages():
+    dag = DAG(list)
+    left, right = dag.input.fan(Append(1), Append(2))
+    pipeline = dag.build(left, right)
+    value = [0]
+    assert (Monad(value) | pipeline).__value__ == ([0, 1], [0, 2])
+    assert value == [0]
+
+
+def test_threaded_branches_run_concurrently():
+    dag = DAG(int)
+    branches = dag.input.fan(*(Add(index) >> Sleep(0.1) for index in range(4)))
+    pipeline = dag.build(*branches, executor="thread", workers=4)
+    start = time.perf_counter()
+    assert (Monad(1) | pipeline).__value__ == (1, 2, 3, 4)
+    assert time.perf_counter() - start < 0.3
+    assert (Monad(2) | pipeline).__value__ == (2, 3, 4, 5)
+
+
+def test_threaded_matches_sequential():
+    def build(executor):
+        dag = DAG(int)
+        base = dag.input >> Add(1) >> Multiply(3)
+        left = base >> Add(2) >> Multiply(2)
+        right = dag.merge(add, base >> Add(7), left >> Add(1))
+        return dag.build(dag.join(ratio, left, right), right, executor=executor)
+    for value in range(5):
+        assert (Monad(value) | build("thread")).__value__ == (Monad(value) | build(None)).__value__
+
+
+def test_threaded_errors_are_raised():
+    dag = DAG(int)
+    pipeline = dag.build(*dag.input.fan(Fail(), Add(1)), executor="thread")
+    with pytest.raises(ValueError):
+        Monad(1) | pipeline
+
+
+def test_profiler_records_each_node():
+    pipeline = fan(Add(1) >> Multiply(2), Add(1) >> Add(3), into=add)
+    with Profiler() as profiler:
+        Monad(1) | pipeline
+    assert {row["stage"]: row["calls"] for row in profiler.report()} == {"DAG(add)": 1, "Add": 2, "Multiply": 1, "add": 1}
+
+
+def test_pickle():
+    pipeline = pickle.loads(pickle.dumps(fan(Add(1) >> Multiply(2), Add(3), into=add, executor="thread")))
+    assert pipeline.executor == "thread"
+    assert (Monad(1) | pipeline).__value__ == 4 + 4
+
+
+def test_thread_pool_shut_down_on_close():
+    with fan(Add(1), Add(2), executor="thread") as pipeline:
+        assert (Monad(1) | pipeline).__value__ == (2, 3)
+        pool = pipeline.pool
+    assert pipeline.pool is None
+    assert pool._shutdown and not any(thread.is_alive() for thread in pool._threads)
+    # A later run creates a new pool
+    assert (Monad(2) | pipeline).__value__ == (3, 4)
+    pipeline.close()
+
+
+def test_thread_pool_shut_down_with_functor():
+    pipeline = fan(Add(1), Add(2), executor="thread")
+    Monad(1) | pipeline
+    pool = pipeline.pool
+    del pipeline
+    gc.collect()
+    assert pool._shutdown
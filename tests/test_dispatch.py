@@ -0,0 +1,86 @@
+import pickle
+import pytest
+from pyrofunc import Monad, MonadWithLogs, Stream, CompositeFunctor, functor, staticfunctor
+
+
+@functor
+class Add:
+    def __init__(self, y: int):
+        self.y = y
+
+    def __exec__(self, x: int) -> int:
+        return x + self.y
+
+
+@staticfunctor
+class AddOne:
+    def __exec__(self, x: int) -> int:
+        return x + 1
+
+
+def to_text(value: int) -> str:
+    return f"<{value}>"
+
+
+class Callable:
+    def __call__(self, value):
+        return value * 2
+
+
+def test_pipe_kinds():
+    assert (Monad(5) | Add(3)).__value__ == 8
+    assert (Monad(5) | AddOne).__value__ == 6
+    assert Monad(5) | float == 5.0
+    assert Monad(5) | to_text == "<5>"
+    assert Monad(5) | (lambda value: value - 1) == 4
+    assert Monad(5) | Callable() == 10
+
+
+def test_pipe_repeated():
+    m = Monad(1)
+    for _ in range(3):
+        m = m | Add(1)
+    assert m | int == 4
+
+
+def test_pipe_nested():
+    nested = Monad(MonadWithLogs(MonadWithLogs(Monad(5))))
+    assert nested | float == 5.0
+    assert nested | to_text == "<5>"
+
+
+def test_pipe_nested_delegates_to_overriding_monad():
+    nested = Monad(Stream([1, 2]))
+    nested.__value__ | Add(1)
+    assert nested | list == [2, 3]
+
+
+def test_compose_kinds():
+    assert isinstance(Add(1) >> AddOne, CompositeFunctor)
+    assert (Monad(5) | Add(1) >> float).__value__ == 6.0
+    assert (Monad(5) | Add(1) >> to_text).__value__ == "<6>"
+
+
+def test_cast_classes_reused():
+    first, second = (Add(1) >> float).second, (AddOne >> float).second
+    assert type(first) is type(second)
+    assert first is not second
+    assert first.__name__ == "float" and first.__cast__ == (int, float)
+    assert type((Add(1) >> str).second) is not type(first)
+
+
+def test_function_functor_classes_reused():
+    first, second = functor(to_text), functor(to_text)
+    assert type(first) is type(second) and first is not second
+    assert to_text.__functor__ is type(first)
+    assert functor(len).__name__ == "len"
+
+
+def test_cached_casts_pickle():
+    pipeline = pickle.loads(pickle.dumps(Add(1) >> float >> str))
+    assert (Monad(1) | pipeline).__value__ == "2.0"
+
+
+def test_missing_annotations():
+    with pytest.raises(AssertionError):
+        Add(1) >> Callable()
@@ -0,0 +1,135 @@
+import struct
+import tracemalloc
+import pytest
+from pyrofunc import LineSink, LineSource, NpySink, NpySource, RecordSink, RecordSource, Stream, functor
+
+
+@functor
+class Upper:
+    def __exec__(self, line: str) -> str:
+        return line.upper()
+
+
+@functor
+class Length:
+    def __exec__(self, line: bytes) -> int:
+        return len(line)
+
+
+@functor
+class Swap:
+    def __exec__(self, record: tuple) -> tuple:
+        return record[1], record[0]
+
+
+@functor
+class Double:
+    """Doubles a float, whole chunks at once with __exec_batch__."""
+    chunks = []
+
+    def __exec__(self, x: float) -> float:
+        return x * 2
+
+    def __exec_batch__(self, values):
+        Double.chunks.append(values)
+        return values * 2
+
+
+@pytest.fixture
+def lines(tmp_path):
+    path = tmp_path / "lines.txt"
+    path.write_text("alpha\nbeta\r\n\ngamma")
+    return path
+
+
+def test_line_source(lines):
+    assert list(LineSource(lines)) == [b"alpha", b"beta", b"", b"gamma"]
+    assert list(LineSource(lines, encoding="utf-8", blocksize=1)) == ["alpha", "beta", "", "gamma"]
+    assert list(Stream(LineSource(lines), chunksize=3) | Length()) == [5, 4, 0, 5]
+
+
+def test_empty_files(tmp_path):
+    path = tmp_path / "empty"
+    path.write_bytes(b"")
+    assert list(LineSource(path)) == [] and list(RecordSource(path, size=4)) == []
+    assert list(Stream(LineSource(path), chunksize=4) | Length()) == []
+
+
+def test_line_sink(lines, tmp_path):
+    out = tmp_path / "out.txt"
+    sink = LineSink(out)
+    assert Stream(LineSource(lines, encoding="utf-8"), chunksize=2) | Upper() | sink == 4
+    assert out.read_text() == "ALPHA\nBETA\n\nGAMMA\n" and sink.written == 4
+    assert LineSink(out, chunksize=2)([1, 2.5, b"raw", b"bytes"]) == 4
+    assert out.read_bytes() == b"1\n2.5\nraw\nbytes\n"
+
+
+def test_record_source_views(tmp_path):
+    path = tmp_path / "records.bin"
+    path.write_bytes(b"aaaabbbbcccc")
+    records = list(RecordSource(path, size=4))
+    assert all(isinstance(record, memoryview) for record in records)
+    assert [bytes(record) for record in records] == [b"aaaa", b"bbbb", b"cccc"]
+    assert len(RecordSource(path, size=4)) == 3
+    with pytest.raises(AssertionError, match="whole number of 5 byte records"):
+        list(RecordSource(path, size=5))
+
+
+def test_record_round_trip(tmp_path):
+    path, out = tmp_path / "records.bin", tmp_path / "swapped.bin"
+    assert RecordSink(path, format="<if")([(index, index / 2) for index in range(10)]) == 10
+    assert list(RecordSource(path, format="<if"))[:2] == [(0, 0.0), (1, 0.5)]
+    assert Stream(RecordSource(path, format="<if"), chunksize=4) | Swap() | RecordSink(out, format="<fi") == 10
+    assert list(struct.iter_unpack("<fi", out.read_bytes()))[3] == (1.5, 3)
+
+
+def test_npy_round_trip(tmp_path):
+    numpy = pytest.importorskip("numpy")
+    path, out = tmp_path / "values.npy", tmp_path / "doubled.npy"
+    numpy.save(path, numpy.arange(10, dtype=numpy.float64))
+    Double.chunks = []
+    assert Stream(NpySource(path), chunksize=4) | Double() | NpySink(out) == 10
+    # The stage gets slices of the mapped file, not copies
+    assert [len(chunk) for chunk in Double.chunks] == [4, 4, 2]
+    assert all(isinstance(chunk, numpy.memmap) for chunk in Double.chunks)
+    assert numpy.array_equal(numpy.load(out), numpy.arange(10) * 2.0)
+
+
+def test_npy_sink_rows(tmp_path):
+    numpy = pytest.importorskip("numpy")
+    path = tmp_path / "rows.npy"
+    NpySink(path, dtype=numpy.int32, chunksize=3)([[index, -index] for index in range(7)])
+    loaded = numpy.load(path)
+    assert loaded.dtype == numpy.int32 and loaded.shape == (7, 2) and loaded[6].tolist() == [6, -6]
+    assert list(NpySource(path))[1].tolist() == [1, -1]
+    NpySink(path, dtype=numpy.float32)([])
+    assert numpy.load(path).shape == (0,)
+    with pytest.raises(AssertionError, match="Expected rows of shape"):
+        NpySink(path, chunksize=1)([[1, 2], [1, 2, 3]])
+
+
+def test_type_mismatch(lines):
+    with pytest.raises(AssertionError, match="Type Mismatch"):
+        list(Stream(LineSource(lines), chunksize=2) | Upper())
+
+
+def peak_memory(tmp_path, count: int) -> int:
+    path, out = tmp_path / f"{count}.txt", tmp_path / "out.txt"
+    with open(path, "w") as file:
+        for index in range(count):
+            file.write(f"line {index:08}\n")
+    tracemalloc.start()
+    try:
+        written = Stream(LineSource(path, encoding="ascii", blocksize=1 << 16), chunksize=1000) | Upper() \
+            | LineSink(out)
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    assert written == count and out.stat().st_size == path.stat().st_size
+    return peak
+
+
+def test_memory_does_not_grow_with_file(tmp_path):
+    small, large = peak_memory(tmp_path, 50_000), peak_memory(tmp_path, 200_000)
+    # A block of lines and a chunk, whatever the size of the file
+    assert large < small * 1.2 and large < 200_000 * len("line 00000000\n") / 2
@@ -0,0 +1,96 @@
+import pytest
+from pyrofunc import Monad, MonadWithLogs, functor, staticfunctor
+
+
+@functor
+class Add:
+    def __init__(self, y: int):
+        self.y = y
+
+    def __exec__(self, x: int) -> int:
+        return x + self.y
+
+
+@functor
+class MultiplyFirst:
+    def __init__(self, factor: int):
+        self.factor = factor
+
+    def __exec__(self, x: list) -> list:
+        x[0] *= self.factor
+        return x
+
+
+@staticfunctor
+class FirstPlusOne:
+    __pure__ = True
+
+    def __exec__(self, x: list) -> list:
+        return [x[0] + 1] + x[1:]
+
+
+def test_history_off_by_default():
+    m = Monad(5) | Add(3) >> Add(2)
+    assert m.__value__ == 10
+    assert len(m.__pre__) == 0
+
+
+def test_history_ring_buffer_depth():
+    pipeline = Add(1)
+    for _ in range(99):
+        pipeline = pipeline >> Add(1)
+    m = Monad(0, history="ref", depth=5) | pipeline
+    assert m.__value__ == 100
+    assert [snapshot.__value__ for snapshot in m.__pre__] == [95, 96, 97, 98, 99]
+
+
+def test_history_default_depth():
+    pipeline = Add(1)
+    for _ in range(99):
+        pipeline = pipeline >> Add(1)
+    m = Monad(0, history="ref") | pipeline
+    assert len(m.__pre__) == Monad.__depth__
+
+
+def test_history_snapshots_hold_no_history():
+    m = Monad(0, history="deepcopy") | Add(1) >> Add(1) >> Add(1)
+    assert all(len(snapshot.__pre__) == 0 for snapshot in m.__pre__)
+
+
+def test_history_ref_shares_mutable_values():
+    m = Monad([1, 2], history="ref") | MultiplyFirst(3) >> MultiplyFirst(2)
+    assert [snapshot.__value__ for snapshot in m.__pre__] == [[6, 2], [6, 2]]
+
+
+@pytest.mark.parametrize("history", ["cow", "deepcopy"])
+def test_history_copies_mutable_values(history):
+    m = Monad([1, 2], history=history) | MultiplyFirst(3) >> MultiplyFirst(2)
+    assert m.__value__ == [6, 2]
+    assert [snapshot.__value__ for snapshot in m.__pre__] == [[1, 2], [3, 2]]
+
+
+def test_history_cow_shares_values_for_pure_functors():
+    value = [1, 2]
+    m = Monad(value, history="cow") | FirstPlusOne >> FirstPlusOne
+    assert m.__value__ == [3, 2]
+    assert m.__pre__[0].__value__ is value
+
+
+def test_history_class_default():
+    class MonadWithHistory(Monad):
+        __history__ = "deepcopy"
+        __depth__ = 2
+
+    m = MonadWithHistory(1) | Add(1) >> Add(1) >> Add(1)
+    assert [snapshot.__value__ for snapshot in m.__pre__] == [2, 3]
+    assert len((MonadWithHistory(1, history="none") | Add(1)).__pre__) == 0
+
+
+def test_history_with_logs():
+    m = MonadWithLogs(5, history="ref") | Add(3) >> Add(2)
+    assert [snapshot.__value__ for snapshot in m.__pre__] == [5, 8]
+
+
+def test_unknown_history_strategy():
+    with pytest.raises(AssertionError):
+        Monad(5, history="snapshot")
@@ -0,0 +1,69 @@
+import os
+import subprocess
+import sys
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+# Modules the features load on first use, none of them is needed by the core
+DEFERRED = ["pyrofunc.logs", "pyrofunc.examples", "pyrofunc.profiler", "pyrofunc.cache", "pyrofunc.parallel",
+            "inspect", "logging", "threading", "asyncio", "concurrent.futures"]
+
+
+def python(code: str, *flags: str) -> subprocess.CompletedProcess:
+    # A fresh interpreter, the modules imported by the test session do not count
+    return subprocess.run([sys.executable, *flags, "-c", code], cwd=ROOT, capture_output=True, text=True, check=True)
+
+
+def test_import_has_no_output():
+    result = python("import pyrofunc")
+    assert result.stdout == "" and result.stderr == ""
+
+
+def test_import_only_loads_the_core():
+    result = python("import sys, pyrofunc; print(' '.join(sys.modules))")
+    loaded = set(result.stdout.split())
+    assert "pyrofunc.core" in loaded
+    assert [name for name in DEFERRED if name in loaded] == []
+
+
+@pytest.mark.parametrize("name, module", [("MonadWithLogs", "pyrofunc.logs"), ("Add", "pyrofunc.examples"),
+                                          ("Profiler", "pyrofunc.profiler"), ("Maybe", "pyrofunc.shortcircuit")])
+def test_names_load_their_module_on_first_use(name, module):
+    result = python(f"import sys, pyrofunc; print({module!r} in sys.modules); pyrofunc.{name}; "
+                    f"print({module!r} in sys.modules)")
+    assert result.stdout.split() == ["False", "True"]
+
+
+def test_from_import_and_star_import():
+    result = python("from pyrofunc import *; from pyrofunc import Add, extract_logs; "
+                    "print(extract_logs(MonadWithLogs(5) | Add(3) >> Multiply(2)))")
+    assert result.stdout.strip() == "['Add(8)', 'Multiply(16)']"
+
+
+def test_unknown_name():
+    import pyrofunc
+    with pytest.raises(AttributeError, match="no attribute 'missing'"):
+        pyrofunc.missing
+
+
+def test_core_globals_are_read_at_run_time():
+    import pyrofunc
+    from pyrofunc import Monad, Profiler
+    assert pyrofunc.PROFILER is None
+    with Profiler() as profiler:
+        assert pyrofunc.PROFILER is profiler
+    pyrofunc.set_tracing(True)
+    try:
+        assert pyrofunc.TRACING
+    finally:
+        pyrofunc.set_tracing(False)
+    assert (Monad(5) | pyrofunc.Add(3)).__value__ == 8
+
+
+def test_import_time():
+    # The import must stay a small fraction of the start of a short-lived process,
+    # the bound is loose so that slow machines do not fail it, see benchmarks/bench_import.py
+    result = python("import pyrofunc", "-X", "importtime")
+    times = {line.split("|")[2].strip(): int(line.split("|")[1]) for line in result.stderr.splitlines()
+             if line.startswith("import time:") and line.split("|")[1].strip().isdigit()}
+    assert times["pyrofunc"] < 100_000, f"import pyrofunc took {times['pyrofunc'] / 1000:.1f} ms"
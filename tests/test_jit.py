@@ -0,0 +1,195 @@
+import linecache
+import math
+import pickle
+import traceback
+import pytest
+from pyrofunc import Monad, CompiledFunctor, JITFunctor, Profiler, Add, Multiply, AddOne, functor, staticfunctor, \
+    memoized_functor, to_string, to_float
+
+
+@functor
+class Root:
+    def __exec__(self, x: float) -> float:
+        return math.sqrt(x)
+
+
+@functor
+class Flag:
+    def __init__(self, flag: int):
+        self.flag = flag
+
+    def __exec__(self, x: int) -> str:
+        return str(self.flag) + str(x)
+
+
+@functor
+class Lookup:
+    def __init__(self, table: list):
+        self.table = table
+
+    def __exec__(self, x: int) -> int:
+        return self.table[x]
+
+
+@functor
+class Clamp:
+    def __init__(self, low: int):
+        self.low = low
+
+    def __exec__(self, x: int) -> int:
+        if x < self.low:
+            return self.low
+        return x
+
+
+@functor
+class Helper:
+    def helper(self, x: int) -> int:
+        return x - 1
+
+    def __exec__(self, x: int) -> int:
+        return self.helper(x)
+
+
+@staticfunctor
+class Square:
+    @staticmethod
+    def __exec__(x: int) -> int:
+        """Square of the input."""
+        return x * x
+
+
+@functor
+class Explode:
+    def __exec__(self, x: int) -> int:
+        return 1 // (x - x)
+
+
+def offset(y: int):
+    def shift(x: int) -> int:
+        return x + y
+    return functor(shift)
+
+
+@memoized_functor(maxsize=8)
+class Memo:
+    def __exec__(self, x: int) -> int:
+        return x + 100
+
+
+def source_lines(jitted):
+    return [line.strip() for line in jitted.__source__.splitlines()]
+
+
+def test_jit_inlines_stages_and_constants():
+    jitted = (Add(3) >> Multiply(2) >> AddOne >> Square >> float >> to_string >> to_float >> int).jit()
+    assert isinstance(jitted, JITFunctor) and isinstance(jitted, CompiledFunctor)
+    lines = source_lines(jitted)
+    for expected in ["value = value + 3  # Add", "value = value * 2  # Multiply", "value = value + 1  # AddOne",
+                     "value = value * value  # Square", "value = float(value)  # float",
+                     "value = str(value)  # to_string", "value = float(value)  # to_float"]:
+        assert expected in lines
+    assert Monad(5) | jitted | int == 289
+    assert jitted.jit() is jitted and jitted.compile() is jitted
+
+
+def test_jit_matches_compiled():
+    pipeline = Add(3) >> Multiply(2) >> Flag(True)
+    assert (Monad(5) | pipeline.jit()).__value__ == (Monad(5) | pipeline.compile()).__value__ == "True16"
+
+
+def test_literal_constants_keyed_on_type():
+    assert "value = str(True) + str(value)  # Flag" in source_lines((Add(0) >> Flag(True)).jit())
+    assert "value = str(1) + str(value)  # Flag" in source_lines((Add(0) >> Flag(1)).jit())
+
+
+def test_globals_are_renamed():
+    jitted = (Add(3) >> float >> Root()).jit()
+    assert "value = g2_math.sqrt(value)  # Root" in source_lines(jitted)
+    assert (Monad(6) | jitted).__value__ == 3.0
+
+
+def test_other_constants_are_bound_by_name():
+    table = [10, 20, 30]
+    jitted = (Add(1) >> Lookup(table)).jit()
+    assert "value = c1_table[value]  # Lookup" in source_lines(jitted)
+    assert Monad(1) | jitted | int == 30
+
+
+@pytest.mark.parametrize("stage", [Clamp(0), Helper(), Memo(), offset(2)],
+                         ids=["statements", "method", "decorated", "closure"])
+def test_stages_that_cannot_be_inlined_are_called(stage):
+    jitted = (Add(1) >> stage).jit()
+    assert any(line.endswith(", called") and line.startswith("value = f1(value)") for line in source_lines(jitted))
+    assert Monad(5) | jitted | int == (Monad(5) | (Add(1) >> stage).compile() | int)
+
+
+def test_code_is_cached_by_structure():
+    first = (Add(3) >> Multiply(2)).jit()
+    hits = JITFunctor.__cache__.hits
+    second = (Add(3) >> Multiply(2)).jit()
+    assert JITFunctor.__cache__.hits == hits + 1
+    assert second.__source__ == first.__source__
+    assert second.__exec__.__code__.co_code == first.__exec__.__code__.co_code
+    other = (Add(4) >> Multiply(2)).jit()
+    assert "value = value + 4  # Add" in source_lines(other)
+    assert (Monad(1) | first | int, Monad(1) | other | int) == (8, 10)
+
+
+def test_bound_constants_share_code():
+    first = (Add(0) >> Lookup([1, 2])).jit()
+    hits = JITFunctor.__cache__.hits
+    second = (Add(0) >> Lookup([3, 4])).jit()
+    assert JITFunctor.__cache__.hits == hits + 1
+    assert (Monad(1) | first | int, Monad(1) | second | int) == (2, 4)
+
+
+def test_source_names_the_stages_of_each_pipeline():
+    # Both pipelines call their second stage, so they share the cached code
+    first = (Add(1) >> Clamp(0)).jit()
+    hits = JITFunctor.__cache__.hits
+    second = (Add(1) >> Helper()).jit()
+    assert JITFunctor.__cache__.hits == hits + 1
+    assert "value = f1(value)  # Clamp, called" in source_lines(first)
+    assert "value = f1(value)  # Helper, called" in source_lines(second)
+    filenames = [jitted.__exec__.__code__.co_filename for jitted in (first, second)]
+    assert filenames[0] != filenames[1]
+    assert [linecache.getline(filename, 5).strip() for filename in filenames] == \
+           ["value = f1(value)  # Clamp, called", "value = f1(value)  # Helper, called"]
+    assert (Monad(-5) | first | int, Monad(-5) | second | int) == (0, -5)
+
+
+def test_optimized_pipeline_is_expanded():
+    jitted = (Add(3) >> Add(4) >> Multiply(20) >> float).optimize().jit()
+    assert [stage.__name__ for stage in jitted.stages] == ["Add", "Multiply", "float"]
+    assert "value = value + 7  # Add" in source_lines(jitted)
+    assert (Monad(1) | jitted).__value__ == 160.0
+
+
+def test_type_checks():
+    with pytest.raises(AssertionError, match="Type Mismatch"):
+        (Add(3) >> to_float).jit()
+    with pytest.raises(AssertionError, match="Type Mismatch"):
+        Monad("5") | (Add(3) >> Multiply(2)).jit()
+
+
+def test_profiler_records_each_stage():
+    jitted = (Add(3) >> Multiply(2)).jit()
+    with Profiler() as profiler:
+        assert Monad(5) | jitted | int == 16
+    assert {row["stage"]: row["calls"] for row in profiler.report()} == {"Add": 1, "Multiply": 1}
+
+
+def test_traceback_shows_generated_line():
+    jitted = (Add(3) >> Explode()).jit()
+    with pytest.raises(ZeroDivisionError) as error:
+        Monad(5) | jitted
+    frame = [entry for entry in traceback.extract_tb(error.tb) if entry.filename.startswith("<pyrofunc.jit")][0]
+    assert frame.line == "value = 1 // (value - value)  # Explode"
+    assert linecache.getline(frame.filename, frame.lineno).strip() == frame.line
+
+
+def test_pickle():
+    restored = pickle.loads(pickle.dumps((Add(3) >> Multiply(2) >> float).jit()))
+    assert isinstance(restored, JITFunctor)
+    assert (Monad(5) | restored).__value__ == 16.0
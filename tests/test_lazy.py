@@ -0,0 +1,124 @@
+import pickle
+import pytest
+from pyrofunc import LazyMonad, functor
+
+
+calls = []
+
+
+@functor
+class Add:
+    __pure__ = True
+
+    def __init__(self, y: int):
+        self.y = y
+
+    def __exec__(self, x: int) -> int:
+        calls.append(("add", x))
+        return x + self.y
+
+
+@functor
+class Multiply:
+    def __init__(self, y: int):
+        self.y = y
+
+    def __exec__(self, x: int) -> int:
+        calls.append(("multiply", x))
+        return x * self.y
+
+
+@functor
+class Reverse:
+    def __exec__(self, x: list) -> list:
+        return x[::-1]
+
+
+@pytest.fixture(autouse=True)
+def reset():
+    calls.clear()
+
+
+def test_piping_records_plan():
+    m = LazyMonad(5) | Add(3) | Multiply(2)
+    assert calls == []
+    assert [stage.__name__ for stage in m.plan().stages] == ["Add", "Multiply"]
+    assert m.run() == 16
+    assert calls == [("add", 5), ("multiply", 8)]
+
+
+def test_run_replaces_value():
+    m = LazyMonad(5) | Add(3) >> Multiply(2)
+    m.run()
+    assert m.__stages__ == [] and m.run() == 16
+    assert len(calls) == 2
+
+
+def test_value_access_runs_plan():
+    m = LazyMonad(5) | Add(3) | Multiply(2)
+    assert m | float == 16.0
+    assert repr(m) == "int(16)"
+    m = LazyMonad(1) | Add(1)
+    assert m.__value__ == 2
+
+
+def test_plan_reused_for_other_inputs():
+    m = LazyMonad(5) | Add(3) | Multiply(2)
+    plan = m.plan()
+    assert [m.run(value) for value in (1, 2)] == [8, 10]
+    assert m.plan() is plan
+    assert m.run() == 16
+
+
+def test_plan_reused_after_own_run():
+    m = LazyMonad(5) | Add(3) | Multiply(2)
+    assert m.run() == 16
+    assert m.run(7) == 20
+    assert m.__value__ == 16
+
+
+def test_plan_rebuilt_after_new_stages():
+    m = LazyMonad(5) | Add(3)
+    plan = m.plan()
+    m | Multiply(2)
+    assert m.plan() is not plan
+    assert m.run() == 16
+
+
+def test_plan_type_checked_once():
+    m = LazyMonad(5) | Add(3) | Reverse()
+    with pytest.raises(AssertionError):
+        m.plan()
+    with pytest.raises(AssertionError):
+        (LazyMonad("a") | Add(3)).run()
+    assert calls == []
+
+
+def test_optimized_plan():
+    m = LazyMonad(5, optimize=True) | Add(3) | Add(4)
+    plan = m.plan()
+    assert plan.__rewrites__ and len(plan.stages) == 1
+    assert m.run() == 12
+
+
+def test_batch_and_parallel_modes():
+    m = LazyMonad(None) | Add(1) | Multiply(2)
+    assert m.run([1, 2, 3], mode="batch") == [4, 6, 8]
+    assert m.run(range(10), mode="parallel", workers=2, chunksize=3) == [(x + 1) * 2 for x in range(10)]
+    with pytest.raises(AssertionError):
+        m.run([1], mode="gpu")
+
+
+def test_batch_on_own_value():
+    assert (LazyMonad([1, 2]) | Add(1)).run(mode="batch") == [2, 3]
+
+
+def test_history_keeps_input():
+    m = LazyMonad(5, history="ref") | Add(3)
+    m.run()
+    assert [snapshot.__value__ for snapshot in m.__pre__] == [5]
+
+
+def test_pickle():
+    m = LazyMonad(5) | Add(3)
+    assert pickle.loads(pickle.dumps(m)).__value__ == 8
@@ -0,0 +1,79 @@
+import pytest
+from pyrofunc import Monad, MonadWithLogs, LogRecord, extract_logs, functor
+
+
+@functor
+class Add:
+    def __init__(self, y: int):
+        self.y = y
+
+    def __exec__(self, x: int) -> int:
+        return x + self.y
+
+
+@functor
+class Append:
+    def __init__(self, y: int):
+        self.y = y
+
+    def __exec__(self, x: list) -> list:
+        x.append(self.y)
+        return x
+
+
+class Payload(int):
+    reprs = 0
+
+    def __str__(self):
+        Payload.reprs += 1
+        return super().__str__()
+
+
+@functor
+class Wrap:
+    def __exec__(self, x: int) -> int:
+        return Payload(x)
+
+
+def test_records():
+    m = MonadWithLogs(5) | Add(3) >> Add(2)
+    first, second = m.__logs__
+    assert isinstance(first, LogRecord)
+    assert (first.stage, first.value, second.stage, second.value) == ("Add", 8, "Add", 10)
+    assert first.time <= second.time
+    assert extract_logs(m) == ["Add(8)", "Add(10)"]
+
+
+def test_records_are_slotted():
+    record = LogRecord("Add", 8, 0.0)
+    assert not hasattr(record, "__dict__")
+    with pytest.raises(AttributeError):
+        record.extra = 1
+
+
+def test_formatting_deferred_until_read():
+    Payload.reprs = 0
+    m = MonadWithLogs(5) | Wrap() >> Add(1) >> Wrap()
+    assert Payload.reprs == 0
+    assert extract_logs(m) == ["Wrap(5)", "Add(6)", "Wrap(6)"]
+    assert Payload.reprs == 2
+
+
+def test_values_kept_by_reference():
+    m = MonadWithLogs([]) | Append(1) >> Append(2)
+    assert extract_logs(m) == ["Append([1, 2])", "Append([1, 2])"]
+
+
+def test_nested_monads_record_each_stage_value():
+    m = MonadWithLogs(MonadWithLogs(Monad(5))) | Add(3) >> Add(2) >> Add(1)
+    assert extract_logs(m) == ["Add(8)", "Add(10)", "Add(11)"]
+    assert extract_logs(m.__value__) == ["Add(8)", "Add(10)", "Add(11)"]
+
+
+def test_maxlogs():
+    pipeline = Add(1)
+    for _ in range(9):
+        pipeline = pipeline >> Add(1)
+    m = MonadWithLogs(0, maxlogs=3) | pipeline
+    assert m.__value__ == 10
+    assert extract_logs(m) == ["Add(8)", "Add(9)", "Add(10)"]
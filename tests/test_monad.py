@@ -0,0 +1,58 @@
+import copy
+import pickle
+import pytest
+from pyrofunc import Monad, MonadWithLogs, BatchMonad, Stream, AsyncMonad, functor
+
+
+@functor
+class ToFloat:
+    def __exec__(self, x: int) -> float:
+        return float(x)
+
+
+@pytest.mark.parametrize("cls", [Monad, MonadWithLogs, BatchMonad, Stream, AsyncMonad])
+def test_monads_have_no_dict(cls):
+    m = cls([1, 2])
+    assert not hasattr(m, "__dict__")
+    with pytest.raises(AttributeError):
+        m.extra = 1
+
+
+def test_no_containers_by_default():
+    m = Monad(5)
+    assert m.__kwargs__ is None
+    assert m.__pre__ == ()
+    assert Monad(5, tag="x").__kwargs__ == {"tag": "x"}
+
+
+def test_dtype_follows_value():
+    m = Monad(5)
+    assert m.__dtype__ == "int"
+    m | ToFloat()
+    assert m.__dtype__ == "float"
+    assert repr(m) == "float(5.0)"
+
+
+def test_history_override_per_instance():
+    assert Monad(5, history="ref").__strategy__ == "ref"
+    assert Monad(5).__strategy__ is None
+
+
+def test_subclass_without_slots():
+    class Tagged(Monad):
+        __history__ = "ref"
+
+        def __init__(self, value, tag):
+            super().__init__(value)
+            self.tag = tag
+
+    m = Tagged(5, "x").__exec__(ToFloat())
+    assert (m.tag, m.__value__, len(m.__pre__)) == ("x", 5.0, 1)
+
+
+def test_copy_and_pickle():
+    m = Monad([1, 2], history="cow", tag="x")
+    for restored in (copy.copy(m), copy.deepcopy(m), pickle.loads(pickle.dumps(m))):
+        assert restored.__value__ == [1, 2]
+        assert restored.__kwargs__ == {"tag": "x"}
+        assert restored.__strategy__ == "cow"
@@ -0,0 +1,109 @@
+import pickle
+import pytest
+from pyrofunc import optimize
+from pyrofunc import Monad, CompiledFunctor, FusedFunctor, Add, Multiply, AddOne, functor, register_fusion, \
+    to_string, to_float
+
+
+@functor
+class Scale:
+    def __init__(self, factor: float):
+        self.factor = factor
+
+    def __exec__(self, x: float) -> float:
+        return x * self.factor
+
+
+@functor
+class Offset:
+    __pure__ = True
+
+    def __init__(self, y: float):
+        self.y = y
+
+    def __exec__(self, x: float) -> float:
+        return x + self.y
+
+
+def names(compiled):
+    return [stage.__name__ for stage in compiled.stages]
+
+
+def test_optimize_returns_compiled():
+    optimized = (Add(3) >> Multiply(2)).optimize()
+    assert isinstance(optimized, CompiledFunctor)
+    assert Monad(5) | optimized | int == 16
+
+
+def test_fuse_add_and_multiply():
+    optimized = (Add(1) >> Add(2) >> Add(3) >> Multiply(2) >> Multiply(5)).optimize()
+    fused, = optimized.stages
+    assert [(type(stage).__name__, vars(stage)) for stage in fused.stages] == [("Add", {"y": 6}),
+                                                                              ("Multiply", {"factor": 10})]
+    assert optimized.__rewrites__[:3] == ["fused Add >> Add into [Add]", "fused Add >> Add into [Add]",
+                                          "fused Multiply >> Multiply into [Multiply]"]
+    assert Monad(1) | optimized | int == 70
+
+
+def test_identity_cast_removed():
+    optimized = (Add(3) >> int >> Multiply(2)).optimize()
+    assert "removed identity cast int" in optimized.__rewrites__
+    assert len(optimized.stages[0].stages) == 2
+
+
+def test_lossless_round_trip_removed():
+    optimized = (Add(3) >> str >> int >> Multiply(2)).optimize()
+    assert "removed cast round trip int -> str -> int" in optimized.__rewrites__
+    assert Monad(5) | optimized | int == 16
+
+
+def test_lossy_casts_kept():
+    optimized = (Add(3) >> float >> int).optimize()
+    assert [stage.__name__ for stage in optimized.stages[0].stages] == ["Add", "float", "int"]
+    assert Monad(2 ** 60) | optimized | int == 2 ** 60
+
+
+def test_registered_round_trip():
+    optimized = (Add(3) >> Multiply(20) >> float >> functor(to_string) >> functor(to_float)).optimize()
+    assert "fused to_string >> to_float into []" in optimized.__rewrites__
+    assert Monad(5) | optimized | float == 160.0
+
+
+def test_everything_cancels():
+    optimized = (functor(to_string) >> functor(to_float)).optimize()
+    assert optimized.__rewrites__[-1] == "pipeline reduced to identity on float"
+    assert Monad(2.5) | optimized | float == 2.5
+
+
+def test_impure_stages_not_fused():
+    optimized = (Offset(1.0) >> Offset(2.0) >> Scale(2.0) >> Offset(1.0)).optimize()
+    assert names(optimized) == ["Offset.Offset", "Scale", "Offset"]
+    assert isinstance(optimized.stages[0], FusedFunctor)
+    assert Monad(1.0) | optimized | float == 9.0
+
+
+def test_custom_rule(monkeypatch):
+    monkeypatch.setattr(optimize, "_FUSIONS", {})
+    register_fusion(Offset, Offset, lambda first, second: Offset(first.y + second.y))
+    optimized = (Offset(1.0) >> Offset(2.0)).optimize()
+    assert optimized.__rewrites__ == ["fused Offset >> Offset into [Offset]"]
+    assert optimized.stages[0].y == 3.0
+
+
+def test_rule_can_decline(monkeypatch):
+    monkeypatch.setattr(optimize, "_FUSIONS", {})
+    register_fusion(Offset, Offset, lambda first, second: None if first.y < 0 else Offset(first.y + second.y))
+    assert len((Offset(-1.0) >> Offset(2.0) >> Scale(1.0)).optimize().stages) == 2
+
+
+def test_rule_changing_types_rejected(monkeypatch):
+    monkeypatch.setattr(optimize, "_FUSIONS", {})
+    register_fusion(Add, Add, lambda first, second: [Add(first.y), functor(to_string)])
+    with pytest.raises(AssertionError):
+        (Add(1) >> Add(2)).optimize()
+
+
+def test_optimized_pickle():
+    optimized = (Add(1) >> Add(2) >> AddOne >> float).optimize()
+    restored = pickle.loads(pickle.dumps(optimized))
+    assert Monad(1) | restored | float == 5.0
@@ -0,0 +1,80 @@
+import pickle
+from concurrent.futures import ThreadPoolExecutor
+import pytest
+from pyrofunc import Monad, StageError, functor, parallel_map
+
+
+@functor
+class Add:
+    def __init__(self, y: int):
+        self.y = y
+
+    def __exec__(self, x: int) -> int:
+        return x + self.y
+
+
+@functor
+class Multiply:
+    def __init__(self, factor: int):
+        self.factor = factor
+
+    def __exec__(self, x: int) -> int:
+        return x * self.factor
+
+
+@functor
+class Inverse:
+    def __init__(self, numerator: int):
+        self.numerator = numerator
+
+    def __exec__(self, x: int) -> float:
+        return self.numerator / x
+
+
+def test_compiled_pipeline_pickles():
+    compiled = (Add(3) >> Multiply(2)).compile()
+    restored = pickle.loads(pickle.dumps(compiled))
+    assert [stage.__name__ for stage in restored.stages] == ["Add", "Multiply"]
+    assert (Monad(5) | restored).__value__ == 16
+
+
+@pytest.mark.parametrize("executor", ["thread", "process"])
+def test_parallel_map_keeps_order(executor):
+    results = parallel_map(Add(3) >> Multiply(2), range(100), executor=executor, workers=2, chunksize=7)
+    assert results == [(x + 3) * 2 for x in range(100)]
+
+
+@pytest.mark.parametrize("executor", ["thread", "process"])
+def test_parallel_map_unordered(executor):
+    results = parallel_map(Add(3) >> Multiply(2), range(100), executor=executor, workers=3, chunksize=5,
+                           ordered=False)
+    assert sorted(results) == [(x + 3) * 2 for x in range(100)]
+
+
+def test_parallel_map_existing_executor():
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        assert parallel_map(Add(1), [1, 2, 3], executor=pool) == [2, 3, 4]
+        assert parallel_map(Multiply(2), [1, 2, 3], executor=pool) == [2, 4, 6]
+
+
+@pytest.mark.parametrize("executor", ["thread", "process"])
+def test_parallel_map_stage_errors(executor):
+    with pytest.raises(StageError) as info:
+        parallel_map(Add(-3) >> Inverse(6), range(10), executor=executor, workers=2, chunksize=2)
+    assert info.value.stage == "Inverse"
+    assert info.value.index == 1
+    assert isinstance(info.value.error, ZeroDivisionError)
+    assert "Inverse" in str(info.value)
+
+
+def test_parallel_map_validates_input():
+    with pytest.raises(AssertionError):
+        parallel_map(Add(1), ["a", "b"])
+
+
+def test_parallel_map_empty_and_invalid_arguments():
+    assert parallel_map(Add(1), []) == []
+    with pytest.raises(ValueError):
+        parallel_map(Add(1), [1], executor="fiber")
+    with pytest.raises(AssertionError):
+        parallel_map(Add(1), [1], chunksize=0)
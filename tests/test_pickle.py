@@ -0,0 +1,95 @@
+import copy
+import pickle
+from pyrofunc import Monad, CompositeFunctor, CompiledFunctor, functor, staticfunctor, parallel_map
+
+
+@functor
+class Add:
+    def __init__(self, y: int):
+        self.y = y
+
+    def __exec__(self, x: int) -> int:
+        return x + self.y
+
+
+@staticfunctor
+class AddOne:
+    def __exec__(self, x: int) -> int:
+        return x + 1
+
+
+@functor
+def to_float(x: int) -> float:
+    return float(x)
+
+
+def to_int(x: float) -> int:
+    return int(x)
+
+
+def roundtrip(value):
+    return pickle.loads(pickle.dumps(value))
+
+
+def test_pickle_functor_instance():
+    restored = roundtrip(Add(3))
+    assert type(restored) is Add
+    assert restored.y == 3
+
+
+def test_pickle_static_functor_by_reference():
+    assert roundtrip(AddOne) is AddOne
+
+
+def test_pickle_function_functor_by_reference():
+    assert roundtrip(to_float) is to_float
+
+
+def test_pickle_function_cast_in_composition():
+    pipeline = roundtrip(Add(3) >> to_float >> to_int)
+    assert (Monad(5) | pipeline).__value__ == 8
+    assert isinstance((Monad(5) | pipeline).__value__, int)
+
+
+def test_pickle_type_cast_in_composition():
+    pipeline = roundtrip(Add(3) >> float >> str)
+    assert (Monad(5) | pipeline).__value__ == "8.0"
+    assert pipeline.second.__cast__ == (float, str)
+
+
+def test_pickle_composite():
+    pipeline = (Add(3) >> AddOne) >> (Add(2) >> AddOne)
+    restored = roundtrip(pipeline)
+    assert isinstance(restored, CompositeFunctor)
+    assert restored.__name__ == pipeline.__name__ == "Add.AddOne.Add.AddOne"
+    assert restored.__domain__ is int and restored.__codomain__ is int
+    assert (Monad(1) | restored).__value__ == 8
+
+
+def test_pickle_long_composite():
+    pipeline = AddOne
+    for _ in range(2999):
+        pipeline = pipeline >> AddOne
+    restored = roundtrip(pipeline)
+    assert (Monad(0) | restored.compile()).__value__ == 3000
+
+
+def test_pickle_compiled():
+    restored = roundtrip((Add(3) >> AddOne >> to_float).compile())
+    assert isinstance(restored, CompiledFunctor)
+    assert (Monad(1) | restored).__value__ == 5.0
+
+
+def test_composite_exec_is_callable():
+    assert (Add(3) >> AddOne >> float).__exec__(1) == 5.0
+
+
+def test_deepcopy_pipeline():
+    pipeline = copy.deepcopy(Add(3) >> AddOne)
+    assert pipeline.second is AddOne
+    assert (Monad(1) | pipeline).__value__ == 5
+
+
+def test_parallel_map_process_with_static_functors():
+    results = parallel_map(Add(1) >> AddOne >> to_float, range(10), executor="process", workers=2)
+    assert results == [float(x + 2) for x in range(10)]
@@ -0,0 +1,146 @@
+import threading
+import time
+import pytest
+from pyrofunc import Profiler, PipelinedExecutor, StageError, functor, pipelined_map
+
+
+@functor
+class Add:
+    def __init__(self, y: int):
+        self.y = y
+
+    def __exec__(self, x: int) -> int:
+        return x + self.y
+
+
+@functor
+class Multiply:
+    def __init__(self, factor: int):
+        self.factor = factor
+
+    def __exec__(self, x: int) -> int:
+        return x * self.factor
+
+
+@functor
+class Inverse:
+    def __init__(self, numerator: int):
+        self.numerator = numerator
+
+    def __exec__(self, x: int) -> float:
+        return self.numerator / x
+
+
+@functor
+class Slow:
+    def __init__(self, delay: float):
+        self.delay = delay
+
+    def __exec__(self, x: int) -> int:
+        time.sleep(self.delay)
+        return x
+
+
+@pytest.mark.parametrize("executor", ["thread", "process"])
+def test_keeps_order(executor):
+    results = pipelined_map(Add(3) >> Multiply(2) >> Add(1), range(100), executor=executor, chunksize=7)
+    assert results == [(x + 3) * 2 + 1 for x in range(100)]
+
+
+def test_groups():
+    pipeline = Add(1) >> Multiply(2) >> Add(3) >> Multiply(4) >> Add(5)
+    expected = [((x + 1) * 2 + 3) * 4 + 5 for x in range(20)]
+    assert [len(group) for group in PipelinedExecutor(pipeline).groups] == [1, 1, 1, 1, 1]
+    assert [len(group) for group in PipelinedExecutor(pipeline, groups=2).groups] == [3, 2]
+    executor = PipelinedExecutor(pipeline, groups=[1, 4])
+    assert list(executor.map(range(20))) == expected
+    assert [row["stage"] for row in executor.metrics()] == ["Add", "Multiply.Add.Multiply.Add"]
+    with pytest.raises(AssertionError, match="covering the 5 stages"):
+        PipelinedExecutor(pipeline, groups=[1, 1])
+
+
+def test_empty_input():
+    assert pipelined_map(Add(1) >> Multiply(2), []) == []
+
+
+@pytest.mark.parametrize("executor", ["thread", "process"])
+def test_stage_error(executor):
+    with pytest.raises(StageError) as error:
+        pipelined_map(Add(-3) >> Multiply(2) >> Inverse(6), range(10), executor=executor, chunksize=2)
+    assert (error.value.stage, error.value.index) == ("Inverse", 2)
+    assert isinstance(error.value.error, ZeroDivisionError)
+
+
+@pytest.mark.parametrize("executor", ["thread", "process"])
+def test_input_error(executor):
+    def values():
+        yield from range(5)
+        raise OSError("connection reset")
+
+    results = PipelinedExecutor(Add(1) >> Multiply(2), executor=executor, chunksize=1).map(values())
+    assert [next(results) for _ in range(5)] == [2, 4, 6, 8, 10]
+    with pytest.raises(OSError, match="connection reset"):
+        next(results)
+
+
+def test_results_before_error_are_yielded():
+    results = PipelinedExecutor(Add(-5) >> Inverse(10), chunksize=1).map(range(10))
+    assert [next(results) for _ in range(5)] == [10 / (x - 5) for x in range(5)]
+    with pytest.raises(StageError):
+        next(results)
+
+
+def test_type_mismatch():
+    with pytest.raises(AssertionError, match="Type Mismatch"):
+        pipelined_map(Add(1) >> Multiply(2), ["a", "b"])
+
+
+def test_backpressure_bounds_reads():
+    read = []
+
+    def values():
+        for value in range(10_000):
+            read.append(value)
+            yield value
+
+    results = PipelinedExecutor(Add(1) >> Multiply(2), maxsize=2, chunksize=10).map(values())
+    assert next(results) == 2
+    time.sleep(0.05)
+    # Chunks held by the 3 queues, the 2 workers, the feeder and the consumer, the rest of the input is not read
+    assert len(read) <= 10 * (3 * 2 + 2 + 2)
+    assert next(results) == 4
+
+
+def test_early_stop_releases_workers():
+    before = threading.active_count()
+    results = PipelinedExecutor(Add(1) >> Multiply(2), maxsize=1, chunksize=1).map(range(10_000))
+    assert [next(results) for _ in range(3)] == [2, 4, 6]
+    results.close()
+    assert threading.active_count() == before
+
+
+def test_metrics_find_bottleneck():
+    executor = PipelinedExecutor(Add(1) >> Slow(0.002) >> Multiply(2), maxsize=2, chunksize=1)
+    assert list(executor.map(range(50))) == [(x + 1) * 2 for x in range(50)]
+    rows = {row["stage"]: row for row in executor.metrics()}
+    assert [row["processed"] for row in rows.values()] == [50, 50, 50]
+    assert executor.bottleneck() == "Slow"
+    assert rows["Slow"]["busy"] >= 0.1 and rows["Slow"]["throughput"] <= 500
+    # The stage before the slow one waits for room in its queue, the one after waits for input
+    assert rows["Add"]["blocked"] > rows["Add"]["busy"]
+    assert rows["Multiply"]["starved"] > rows["Multiply"]["busy"]
+    assert rows["Slow"]["max_depth"] <= 2 and all(row["depth"] == 0 for row in rows.values())
+
+
+def test_stages_overlap():
+    pipeline = Slow(0.01) >> Slow(0.01) >> Slow(0.01)
+    start = time.perf_counter()
+    pipelined_map(pipeline, range(10), chunksize=1)
+    # 30 stage runs of 10 ms, about 12 steps of 10 ms once the stages overlap
+    assert time.perf_counter() - start < 0.25
+
+
+def test_profiler_records_thread_stages():
+    with Profiler() as profiler:
+        pipelined_map(Add(1) >> Multiply(2), range(10))
+    assert {row["stage"]: row["calls"] for row in profiler.report()} == {"Add": 10, "Multiply": 10}
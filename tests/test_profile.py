@@ -0,0 +1,118 @@
+import json
+import pytest
+import pyrofunc
+from pyrofunc import Monad, BatchMonad, Profiler, functor, parallel_map
+
+
+@functor
+class Add:
+    def __init__(self, y: int):
+        self.y = y
+
+    def __exec__(self, x: int) -> int:
+        return x + self.y
+
+
+@functor
+class Multiply:
+    def __init__(self, y: int):
+        self.y = y
+
+    def __exec__(self, x: int) -> int:
+        return x * self.y
+
+
+@functor
+def to_float(x: int) -> float:
+    return float(x)
+
+
+@functor
+class Grow:
+    def __exec__(self, x: int) -> list:
+        return [0] * x
+
+
+def calls(profiler):
+    return {row["stage"]: row["calls"] for row in profiler.report()}
+
+
+def test_profiler_off_by_default():
+    assert pyrofunc.PROFILER is None
+    with Profiler() as profiler:
+        assert pyrofunc.PROFILER is profiler
+    assert pyrofunc.PROFILER is None
+
+
+def test_profile_composite():
+    with Profiler() as profiler:
+        result = Monad(5) | Add(3) >> Multiply(20) >> to_float
+    assert result.__value__ == 160.0
+    assert calls(profiler) == {"Add": 1, "Multiply": 1, "to_float": 1}
+
+
+def test_profile_compiled():
+    pipeline = (Add(3) >> Multiply(20) >> to_float).compile()
+    with Profiler() as profiler:
+        for x in range(10):
+            assert Monad(x) | pipeline | float == (x + 3) * 20.0
+    assert calls(profiler) == {"Add": 10, "Multiply": 10, "to_float": 10}
+
+
+def test_profile_batch():
+    with Profiler() as profiler:
+        BatchMonad([1, 2, 3]) | Add(3) >> Multiply(2)
+    assert calls(profiler) == {"Add": 1, "Multiply": 1}
+
+
+def test_profile_threads():
+    with Profiler() as profiler:
+        assert parallel_map(Add(3) >> Multiply(2), range(100), workers=4, chunksize=8) == \
+               [(x + 3) * 2 for x in range(100)]
+    assert calls(profiler) == {"Add": 100, "Multiply": 100}
+
+
+def test_profile_not_recorded_outside():
+    with Profiler() as profiler:
+        pass
+    Monad(5) | Add(3)
+    assert profiler.report() == []
+
+
+def test_nested_profilers():
+    with Profiler() as outer:
+        with Profiler() as inner:
+            Monad(5) | Add(3)
+        Monad(5) | Multiply(3)
+    assert calls(inner) == {"Add": 1}
+    assert calls(outer) == {"Multiply": 1}
+
+
+def test_report_statistics():
+    with Profiler() as profiler:
+        for x in range(200):
+            Monad(x) | Add(1)
+    row, = profiler.report()
+    assert row["calls"] == 200
+    assert row["total"] > 0
+    assert row["mean"] == pytest.approx(row["total"] / 200)
+    assert row["p99"] >= row["mean"] * 0.5
+    assert row["allocated"] == 0
+
+
+def test_profile_memory():
+    with Profiler(memory=True) as profiler:
+        Monad(100_000) | Grow()
+    row, = profiler.report()
+    assert row["allocated"] >= 100_000 * 8
+
+
+def test_export():
+    with Profiler() as profiler:
+        Monad(5) | Add(3) >> to_float
+    table = profiler.table()
+    assert table.splitlines()[0].split()[:3] == ["stage", "calls", "total"]
+    assert len(table.splitlines()) == 3
+    rows = json.loads(profiler.to_json())
+    assert {row["stage"] for row in rows} == {"Add", "to_float"}
+    assert set(rows[0]) == {"stage", "calls", "total", "mean", "p99", "allocated"}
@@ -1,6 +1,6 @@
 import pytest
 from typing import List, Any
-from protofunc import Monad, Functor, functor, staticfunctor, MonadWithLogs, extract_logs
+from pyrofunc import Monad, Functor, functor, staticfunctor, MonadWithLogs, extract_logs
 
 
 # Define test Functors
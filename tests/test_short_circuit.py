@@ -0,0 +1,128 @@
+import pickle
+import pytest
+from pyrofunc import Maybe, Either, Result, Left, Nothing, functor
+
+
+calls = []
+
+
+@functor
+class Add:
+    def __init__(self, y: int):
+        self.y = y
+
+    def __exec__(self, x: int) -> int:
+        calls.append(("add", x))
+        return x + self.y
+
+
+@functor
+class Lookup:
+    def __init__(self, table: dict):
+        self.table = table
+
+    def __exec__(self, x: int) -> int:
+        calls.append(("lookup", x))
+        return self.table.get(x)
+
+
+@functor
+class Positive:
+    def __exec__(self, x: int) -> int:
+        calls.append(("positive", x))
+        return x if x > 0 else Left(f"{x} is not positive")
+
+
+@functor
+class Invert:
+    def __exec__(self, x: int) -> float:
+        calls.append(("invert", x))
+        return 1 / x
+
+
+@pytest.fixture(autouse=True)
+def reset():
+    calls.clear()
+
+
+def test_maybe_success():
+    m = Maybe(1) | Add(1) >> Lookup({2: 20})
+    assert m.__value__ == 20 and not m.failed
+
+
+def test_maybe_skips_remaining_stages():
+    m = Maybe(1) | Lookup({}) >> Add(1) >> Add(2)
+    assert m.__value__ is Nothing and m.failed
+    assert calls == [("lookup", 1)]
+
+
+def test_maybe_compiled_pipeline_skipped():
+    pipeline = (Lookup({}) >> Add(1) >> Add(2)).compile()
+    assert (Maybe(1) | pipeline).__value__ is Nothing
+    assert calls == [("lookup", 1)]
+
+
+def test_maybe_nothing_input():
+    assert (Maybe(None) | Add(1)).__value__ is Nothing
+    assert Maybe(Nothing) | Add(1) | int is Nothing
+    assert calls == []
+
+
+def test_maybe_cast():
+    assert Maybe(1) | Add(1) | float == 2.0
+
+
+def test_either():
+    assert (Either(5) | Positive() >> Add(1)).__value__ == 6
+    m = Either(-5) | Positive() >> Add(1)
+    assert m.__value__ == Left("-5 is not positive")
+    assert calls == [("positive", 5), ("add", 5), ("positive", -5)]
+
+
+def test_either_does_not_catch():
+    with pytest.raises(ZeroDivisionError):
+        Either(0) | Invert()
+
+
+def test_result_catches_exceptions():
+    m = Result(0) | Invert() >> float
+    assert isinstance(m.__value__, Left)
+    assert isinstance(m.__value__.error, ZeroDivisionError)
+    assert calls == [("invert", 0)]
+
+
+def test_result_catches_type_mismatch():
+    m = Result("a") | Add(1)
+    assert isinstance(m.__value__.error, AssertionError)
+    assert calls == []
+
+
+def test_history():
+    m = Maybe(1, history="ref") | Add(1) >> Lookup({}) >> Add(1)
+    assert [snapshot.__value__ for snapshot in m.__pre__] == [1]
+
+
+def test_partition_maybe():
+    successes, failures = Maybe.partition(Lookup({1: 10, 3: 30}) >> Add(1), [1, 2, 3])
+    assert successes == [11, 31]
+    assert failures == [(1, Nothing)]
+    assert calls.count(("add", 10)) == 1 and len(calls) == 5
+
+
+def test_partition_either():
+    successes, failures = Either.partition(Positive() >> Add(1), [1, -1, 3])
+    assert successes == [2, 4]
+    assert failures == [(1, Left("-1 is not positive"))]
+
+
+def test_partition_result():
+    successes, failures = Result.partition(Add(-1) >> Invert(), [1, 2, 5])
+    assert successes == [1.0, 0.25]
+    (index, failure), = failures
+    assert index == 0 and isinstance(failure.error, ZeroDivisionError)
+
+
+def test_pickle():
+    assert pickle.loads(pickle.dumps(Nothing)) is Nothing
+    assert pickle.loads(pickle.dumps(Left("error"))) == Left("error")
+    assert pickle.loads(pickle.dumps(Maybe(Nothing))).__value__ is Nothing
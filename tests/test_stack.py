@@ -0,0 +1,69 @@
+import sys
+from pyrofunc import Monad, MonadWithLogs, BatchMonad, extract_logs, functor
+
+
+@functor
+class Add:
+    def __init__(self, y: int):
+        self.y = y
+
+    def __exec__(self, x: int) -> int:
+        return x + self.y
+
+
+@functor
+class Multiply:
+    def __init__(self, y: int):
+        self.y = y
+
+    def __exec__(self, x: int) -> int:
+        return x * self.y
+
+
+def nest(value, depth: int, cls=Monad):
+    for _ in range(depth):
+        value = cls(value)
+    return value
+
+
+def innermost(monad):
+    while isinstance(monad.__value__, Monad):
+        monad = monad.__value__
+    return monad
+
+
+def test_leaf_functor_on_nested_monad():
+    m = Monad(Monad(5)) | Add(3)
+    assert m.__value__.__value__ == 8
+
+
+def test_composite_on_nested_monad():
+    m = Monad(MonadWithLogs(Monad(5))) | Add(3) >> Multiply(2)
+    assert isinstance(m, Monad) and innermost(m).__value__ == 16
+    # Outer layers record the value held by the inner monad after each stage
+    assert extract_logs(m.__value__) == ["Add(8)", "Multiply(16)"]
+
+
+def test_every_layer_logs():
+    m = MonadWithLogs(MonadWithLogs(5)) | Add(3) >> Multiply(2)
+    assert extract_logs(m.__value__) == ["Add(8)", "Multiply(16)"]
+    assert len(m.__logs__) == 2
+
+
+def test_every_layer_keeps_history():
+    m = Monad(Monad(5, history="ref"), history="ref") | Add(3) >> Multiply(2)
+    assert [snapshot.__value__ for snapshot in m.__value__.__pre__] == [5, 8]
+    assert len(m.__pre__) == 2
+
+
+def test_deep_stack_does_not_recurse():
+    depth = sys.getrecursionlimit() * 2
+    m = nest(5, depth) | Add(3) >> Multiply(2)
+    assert innermost(m).__value__ == 16
+    assert nest(5, depth) | (Add(3) >> Multiply(2)).compile() | int == 16
+    assert nest(5, depth) | float == 5.0
+
+
+def test_stack_stops_at_monads_with_their_own_exec():
+    m = Monad(BatchMonad([1, 2])) | Add(1) >> Multiply(3)
+    assert m.__value__.__value__ == [6, 9]
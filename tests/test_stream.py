@@ -0,0 +1,93 @@
+import itertools
+import pytest
+from pyrofunc import Stream, functor, staticfunctor
+
+
+@functor
+class Add:
+    def __init__(self, y: int):
+        self.y = y
+
+    def __exec__(self, x: int) -> int:
+        return x + self.y
+
+
+@functor
+class Multiply:
+    batches = []
+
+    def __init__(self, factor: int):
+        self.factor = factor
+
+    def __exec__(self, x: int) -> int:
+        return x * self.factor
+
+    def __exec_batch__(self, xs: list[int]) -> list[int]:
+        Multiply.batches.append(len(xs))
+        return [x * self.factor for x in xs]
+
+
+@staticfunctor
+class Length:
+    def __exec__(self, x: str) -> int:
+        return len(x)
+
+
+def test_stream_applies_pipeline():
+    assert Stream(range(5)) | Add(3) >> Multiply(2) | list == [6, 8, 10, 12, 14]
+
+
+def test_stream_is_lazy():
+    pulled = []
+
+    def source():
+        for i in itertools.count():
+            pulled.append(i)
+            yield i
+
+    stream = Stream(source()) | Add(1) >> Multiply(2)
+    assert pulled == []
+    assert list(itertools.islice(stream, 3)) == [2, 4, 6]
+    assert pulled == [0, 1, 2]
+
+
+def test_stream_chained_pipes():
+    stream = Stream(["a", "bb", "ccc"]) | Length | Add(1) >> Multiply(3)
+    assert list(stream) == [6, 9, 12]
+
+
+@pytest.mark.parametrize("chunksize", [1, 2, 4, 100])
+def test_stream_chunk_sizes(chunksize):
+    Multiply.batches = []
+    stream = Stream(range(10), chunksize=chunksize) | Add(1) >> Multiply(2)
+    assert list(stream) == [2 * (x + 1) for x in range(10)]
+    if chunksize > 1:
+        assert sum(Multiply.batches) == 10
+        assert max(Multiply.batches) == min(chunksize, 10)
+
+
+def test_stream_chunks():
+    stream = Stream(range(5), chunksize=2) | Add(1)
+    assert list(stream.chunks()) == [[1, 2], [3, 4], [5]]
+
+
+def test_stream_validates_first_item_on_start():
+    stream = Stream(["a", "b"]) | Add(1)
+    with pytest.raises(AssertionError):
+        next(iter(stream))
+
+
+def test_stream_checks_stage_types_on_start():
+    stream = Stream([1, 2]) | Add(1) | Length
+    with pytest.raises(AssertionError):
+        list(stream)
+
+
+def test_stream_without_stages():
+    assert list(Stream(iter([1, 2]))) == [1, 2]
+    assert list(Stream([]) | Add(1)) == []
+
+
+def test_stream_invalid_chunk_size():
+    with pytest.raises(AssertionError):
+        Stream([1], chunksize=0)
@@ -0,0 +1,74 @@
+import logging
+import pytest
+import pyrofunc
+from pyrofunc import Monad, MonadWithLogs, functor, set_tracing
+
+
+@functor
+class Add:
+    def __init__(self, y: int):
+        self.y = y
+
+    def __exec__(self, x: int) -> int:
+        return x + self.y
+
+
+class Payload(list):
+    reprs = 0
+
+    def __repr__(self):
+        Payload.reprs += 1
+        return super().__repr__()
+
+
+@functor
+class Append:
+    def __init__(self, item: int):
+        self.item = item
+
+    def __exec__(self, x: Payload) -> Payload:
+        x.append(self.item)
+        return x
+
+
+@pytest.fixture(autouse=True)
+def reset_tracing():
+    yield
+    set_tracing(False)
+
+
+def test_no_output_when_tracing_off(capsys, caplog):
+    caplog.set_level(logging.DEBUG, logger="pyrofunc")
+    m = MonadWithLogs(5) | Add(3) >> Add(2)
+    assert m.__value__ == 10
+    assert capsys.readouterr().out == ""
+    assert caplog.records == []
+
+
+def test_messages_not_formatted_when_tracing_off():
+    Payload.reprs = 0
+    Monad(Payload()) | Append(1) >> Append(2)
+    assert Payload.reprs == 0
+
+
+def test_tracing_to_logger(caplog):
+    caplog.set_level(logging.DEBUG, logger="pyrofunc")
+    set_tracing(True)
+    Monad(5) | Add(3) >> Add(2)
+    calls = [(record.msg, record.args[0]) for record in caplog.records]
+    assert ("%s.__call__(%r)", "Add") in calls
+    assert ("%s.__rshift__(%s)", "Add") in calls
+
+
+def test_tracing_to_sink():
+    calls = []
+    set_tracing(True, sink=lambda msg, *args: calls.append((msg, args)))
+    Monad(5) | Add(3)
+    assert any(msg == "%s.__call__(%r)" and args[0] == "Add" for msg, args in calls)
+
+
+def test_set_tracing_off_restores_switch():
+    set_tracing(True)
+    assert pyrofunc.TRACING
+    set_tracing(False)
+    assert not pyrofunc.TRACING
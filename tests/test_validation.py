@@ -0,0 +1,123 @@
+import pytest
+from typing import Any, List, Optional
+from pyrofunc import Monad, functor, staticfunctor
+
+
+@functor
+class Add:
+    def __init__(self, y: int):
+        self.y = y
+
+    def __exec__(self, x: int) -> int:
+        return x + self.y
+
+
+@staticfunctor
+class Reverse:
+    def __exec__(self, x: List[Any]) -> List[Any]:
+        return x[::-1]
+
+
+@staticfunctor
+class Length:
+    def __exec__(self, x: List[Any]) -> int:
+        return len(x)
+
+
+@staticfunctor
+class Total:
+    def __exec__(self, x: list[int]) -> int:
+        return sum(x)
+
+
+@functor
+def default(x: Optional[int]) -> int:
+    return 0 if x is None else x
+
+
+@functor
+def identity(x):
+    return x
+
+
+def test_annotations_resolved_once_per_class():
+    assert type(Add(3)).__domain__ is int
+    assert type(Add(3)).__codomain__ is int
+    assert type(Add(3)).__check__ is int
+    assert type(Reverse).__check__ is list
+    assert type(Length).__check__ is list
+    assert type(Length).__codomain__ is int
+    assert type(default).__check__ == (int, type(None))
+    assert type(identity).__check__ is None
+
+
+def test_composite_annotations():
+    composite = Reverse >> Length >> Add(1)
+    assert composite.__domain__ == List[Any]
+    assert composite.__codomain__ is int
+    assert composite.compile().__check__ is list
+
+
+def test_generic_annotations_validate_against_origin():
+    assert (Monad([1, 2, 3]) | Reverse).__value__ == [3, 2, 1]
+    assert (Monad([1, 2, 3]) | Length).__value__ == 3
+    assert (Monad([1, 2, 3]) | Total).__value__ == 6
+    with pytest.raises(AssertionError):
+        Monad((1, 2, 3)) | Total
+
+
+def test_optional_annotation():
+    assert (Monad(None) | default).__value__ == 0
+    assert (Monad(4) | default).__value__ == 4
+    with pytest.raises(AssertionError):
+        Monad("4") | default
+
+
+def test_unannotated_functor_skips_check():
+    assert (Monad("anything") | identity).__value__ == "anything"
+
+
+def test_validate_always_is_default():
+    add = Add(1)
+    Monad(1) | add
+    with pytest.raises(AssertionError):
+        Monad("1") | add
+
+
+def test_validate_once():
+    add = Add(1).validate("once")
+    assert (Monad(1) | add).__value__ == 2
+    assert add.__validated__
+    with pytest.raises(TypeError):
+        Monad("1") | add
+
+
+def test_validate_once_does_not_trust_failed_input():
+    add = Add(1).validate("once")
+    with pytest.raises(AssertionError):
+        Monad("1") | add
+    assert not add.__validated__
+
+
+def test_validate_never():
+    pipeline = (Add(1) >> Add(2)).validate("never")
+    assert all(stage.__validated__ for stage in pipeline.__flatten__())
+    assert (Monad(1) | pipeline).__value__ == 4
+    assert (Monad(1.5) | pipeline).__value__ == 4.5
+
+
+def test_validate_back_to_always():
+    pipeline = (Add(1) >> Add(2)).validate("never").validate("always")
+    with pytest.raises(AssertionError):
+        Monad(1.5) | pipeline
+
+
+def test_validate_compiled_pipeline():
+    compiled = (Add(1) >> Add(2)).compile().validate("once")
+    assert (Monad(1) | compiled).__value__ == 4
+    assert compiled.__validated__
+
+
+def test_validate_unknown_mode():
+    with pytest.raises(AssertionError):
+        Add(1).validate("sometimes")